@@ -0,0 +1,42 @@
+"""
+Measures the cold start of `import nanga_ad_library` (each import runs in a new interpreter) and lists the optional
+  dependencies loaded by the import (they should only be loaded when used).
+    Usage:
+        python benchmarks/import_time.py [number of runs]
+"""
+
+import sys
+import json
+import statistics
+import subprocess
+
+# Dependencies only needed by some features (downloads, verbose mode, async API, columnar export, date parsing)
+OPTIONAL_MODULES = ["playwright", "curlify", "httpx", "pyarrow", "pandas", "dateutil"]
+
+SCRIPT = f"""
+import sys, json, time
+start_time = time.perf_counter()
+import nanga_ad_library
+duration = time.perf_counter() - start_time
+print(json.dumps({{"duration": duration, "loaded": [m for m in {OPTIONAL_MODULES} if m in sys.modules]}}))
+"""
+
+
+def measure(num_runs):
+    """Returns the import durations (in seconds) and the optional modules loaded by the import."""
+    durations, loaded = [], []
+    for _ in range(num_runs):
+        output = subprocess.run([sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True).stdout
+        result = json.loads(output)
+        durations.append(result["duration"])
+        loaded = result["loaded"]
+
+    return durations, loaded
+
+
+if __name__ == "__main__":
+    num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    durations, loaded = measure(num_runs)
+    print(f"import nanga_ad_library ({num_runs} runs): median {statistics.median(durations) * 1000:.0f} ms, "
+          f"min {min(durations) * 1000:.0f} ms")
+    print(f"Optional modules loaded: {', '.join(loaded) or 'none'}")
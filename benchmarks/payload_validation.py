@@ -0,0 +1,41 @@
+"""
+Measures how many Meta Ad Library payloads are validated per second (MetaAdLibrary.init, without any request).
+
+Payloads look like the ones of a template generator: several countries and languages, ISO dates and a few fields.
+    Usage:
+        python benchmarks/payload_validation.py [number of payloads]
+"""
+
+import sys
+import copy
+import time
+
+from nanga_ad_library.ad_libraries import MetaAdLibrary
+
+PAYLOAD = {
+    "ad_reached_countries": ["FR", "DE", "ES", "IT", "BE", "NL"],
+    "ad_delivery_date_min": "2025-01-01",
+    "ad_delivery_date_max": "2025-05-06",
+    "ad_active_status": "ALL",
+    "languages": ["fr", "de"],
+    "search_terms": "shoes",
+    "publisher_platforms": ["FACEBOOK", "INSTAGRAM"],
+    "media_type": "ALL",
+    "limit": 100,
+    "fields": ["id", "ad_creation_time", "page_name", "spend", "currency", "demographic_distribution", "languages"],
+}
+
+
+def measure(num_payloads):
+    """Returns the number of payloads validated per second."""
+    payloads = [copy.deepcopy(PAYLOAD) for _ in range(num_payloads)]
+    start_time = time.perf_counter()
+    for payload in payloads:
+        MetaAdLibrary.init(payload=payload)
+
+    return num_payloads / (time.perf_counter() - start_time)
+
+
+if __name__ == "__main__":
+    num_payloads = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"{num_payloads} payloads: {measure(num_payloads):,.0f} payloads per second")
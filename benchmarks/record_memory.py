@@ -0,0 +1,78 @@
+"""
+Measures the memory used by the records of a cursor (bytes per record) with ObjectParser and CompactObjectParser.
+
+Rows are generated like Meta Ad Library rows (with demographic and regional distributions) and parsed from json pages,
+  as the cursors do.
+    Usage:
+        python benchmarks/record_memory.py [number of records]
+"""
+
+import sys
+import json
+import random
+import tracemalloc
+
+from nanga_ad_library.utils import ObjectParser, CompactObjectParser
+
+FIELDS = [
+    "id", "ad_creation_time", "ad_creative_bodies", "ad_delivery_start_time", "ad_delivery_stop_time",
+    "ad_snapshot_url", "bylines", "currency", "demographic_distribution", "delivery_by_region", "impressions",
+    "languages", "page_id", "page_name", "publisher_platforms", "spend",
+]
+PAGE_SIZE = 100
+
+
+def generate_row(k):
+    """Returns a row looking like a row of the Meta Ad Library API."""
+    rng = random.Random(k)
+    page = rng.randrange(50)
+    day = f"2025-0{rng.randrange(1, 10)}-1{rng.randrange(10)}"
+    return {
+        "id": str(10 ** 15 + k),
+        "ad_creation_time": day,
+        "ad_creative_bodies": [f"Discover the new collection of brand {page}, free delivery until Sunday! (ad {k})"],
+        "ad_delivery_start_time": day,
+        "ad_delivery_stop_time": day,
+        "ad_snapshot_url": f"https://www.facebook.com/ads/archive/render_ad/?id={10 ** 15 + k}",
+        "bylines": f"Brand {page} SAS",
+        "currency": rng.choice(["EUR", "USD", "GBP"]),
+        "demographic_distribution": [
+            {"percentage": f"0.{rng.randrange(1000):03d}", "age": age, "gender": gender}
+            for age in ["18-24", "25-34", "35-44", "45-54", "55-64", "65+"] for gender in ["female", "male", "unknown"]
+        ],
+        "delivery_by_region": [
+            {"percentage": f"0.{rng.randrange(1000):03d}", "region": region}
+            for region in ["Ile-de-France", "Bretagne", "Normandie", "Occitanie", "Grand Est"]
+        ],
+        "impressions": {"lower_bound": "1000", "upper_bound": "4999"},
+        "languages": ["fr"],
+        "page_id": str(10 ** 14 + page),
+        "page_name": f"Brand {page}",
+        "publisher_platforms": ["facebook", "instagram"],
+        "spend": {"lower_bound": "100", "upper_bound": "199"},
+    }
+
+
+def measure(record_parser, num_records):
+    """Returns the number of bytes allocated per record to parse num_records rows into records."""
+    pages = [
+        json.dumps({"data": [generate_row(k) for k in range(start, min(start + PAGE_SIZE, num_records))]})
+        for start in range(0, num_records, PAGE_SIZE)
+    ]
+    tracemalloc.start()
+    records = []
+    for page in pages:
+        records.extend(record_parser(**row) for row in json.loads(page)["data"])
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return size / len(records)
+
+
+if __name__ == "__main__":
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    dict_size = measure(ObjectParser, num_records)
+    compact_size = measure(CompactObjectParser.for_fields(FIELDS), num_records)
+    print(f"{num_records} records")
+    print(f"ObjectParser:        {dict_size:,.0f} bytes per record")
+    print(f"CompactObjectParser: {compact_size:,.0f} bytes per record ({dict_size / compact_size:.1f}x smaller)")
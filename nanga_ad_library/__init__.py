@@ -1,10 +1,10 @@
 # nanga_ad_library/__init__.py
 # import classes and methods from the package as a whole
 
-from .sdk import NangaAdLibrary
+# Store package version (before importing the modules using it)
+__version__ = "1.2.0"
 
-# Export only the main class
-__all__ = ["NangaAdLibrary"]
+from .sdk import NangaAdLibrary, AsyncNangaAdLibrary
 
-# Store package version
-__version__ = "1.2.0"
+# Export only the main classes
+__all__ = ["NangaAdLibrary", "AsyncNangaAdLibrary"]
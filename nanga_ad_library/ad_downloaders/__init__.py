@@ -1,4 +1,5 @@
 # nanga_ad_library/ad_downloader/__init__.py
 # import classes and methods from the package as a whole
 
+from .playwright_runtime import PlaywrightRuntime
 from .meta_ad_downloader import MetaAdDownloader
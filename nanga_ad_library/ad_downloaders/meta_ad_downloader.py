@@ -1,14 +1,14 @@
 import asyncio
 import warnings
-import time
 import re
 
 from urllib.parse import unquote
 from datetime import datetime
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 
 from nanga_ad_library.utils import *
+from nanga_ad_library.ad_downloaders.playwright_runtime import PlaywrightRuntime
 
 """
 Define MetaAdDownloader class to retrieve ad elements using Playwright.
@@ -66,6 +66,13 @@ class MetaAdDownloader:
     A class instancing a scraper to retrieve elements from Meta Ad Library previews:
       Body, Title*, Image*, Video*, Description*, Landing page*, CTA caption*
       - "*" tagged elements are retrieved for each creative visual (1 for statics, several for carousels)
+
+    The Playwright driver and browser are kept alive between batches (cf PlaywrightRuntime): they are shared by the
+      downloaders of the process unless a runtime is provided. close() releases the shared runtime, which is closed
+      once all its downloaders released it (or at exit); a provided runtime is closed by its owner.
+    The ads of a batch are split between browser contexts (pages_per_context ads each, with up to contexts_per_browser
+      contexts open at once), and the ads of a context are scraped concurrently (one page each). Ads are handed back
+      in the order of the batch, and an ad whose scraping failed gets empty ad elements.
     """
 
     # Store the fields used to store (1) the Meta Ad Library preview url and (2) the ad delivery start date
@@ -78,13 +85,26 @@ class MetaAdDownloader:
     # Store the maximum number of pages that can be open simultaneously in a browser's context
     MAX_BATCH_SIZE = 5
 
-    def __init__(self, start_date=None, end_date=None, verbose=False, proxy=None):
+    # Store the maximum number of contexts that can be open simultaneously by a batch
+    MAX_CONTEXTS = 1
+
+    # Pause (in seconds) after closing a context, before the next one is opened
+    CONTEXT_DELAY = 1
+
+    def __init__(
+        self, start_date=None, end_date=None, verbose=False, proxy=None, runtime=None,
+        pages_per_context=None, contexts_per_browser=None
+    ):
         """
 
         Args:
             start_date: If not empty: download only ads created after this date,
             end_date: If not empty: download only ads created before this date,
             verbose: Whether to display intermediate logs.
+            proxy: The proxy used by the browser (dict with server, username and password).
+            runtime: The PlaywrightRuntime running the browser (default: the runtime shared by the process).
+            pages_per_context: Number of ads scraped concurrently in each browser context (default: MAX_BATCH_SIZE).
+            contexts_per_browser: Number of contexts open simultaneously by a batch (default: MAX_CONTEXTS).
         """
 
         # Verbose
@@ -122,6 +142,22 @@ class MetaAdDownloader:
         # Whether Meta has spotted our webdriver and blocked it.
         self.__spotted = False
 
+        # Playwright driver and browser kept alive between batches (a reference is held on the shared runtime)
+        self.__runtime = runtime or PlaywrightRuntime.get_shared()
+        self.__holds_runtime = runtime is None
+        if self.__holds_runtime:
+            self.__runtime.acquire()
+
+        # Concurrent scraping
+        self.__pages_per_context = pages_per_context or self.MAX_BATCH_SIZE
+        self.__contexts_per_browser = contexts_per_browser or self.MAX_CONTEXTS
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @classmethod
     def init(cls, **kwargs):
         """
@@ -136,14 +172,42 @@ class MetaAdDownloader:
             start_date=kwargs.get("download_start_date"),
             end_date=kwargs.get("download_end_date"),
             verbose=kwargs.get("verbose"),
-            proxy=kwargs.get("proxy")
+            proxy=kwargs.get("proxy"),
+            pages_per_context=kwargs.get("download_pages_per_context"),
+            contexts_per_browser=kwargs.get("download_contexts_per_browser")
         )
 
         return ad_downloader
 
+    def get_state(self):
+        """
+        Returns the state of the downloader to store in a cursor checkpoint.
+        """
+        return {"spotted": self.__spotted}
+
+    def load_state(self, state):
+        """
+        Restores the state of the downloader saved in a cursor checkpoint.
+        """
+        if state:
+            self.__spotted = state.get("spotted", self.__spotted)
+
+    def get_runtime(self):
+        return self.__runtime
+
+    def close(self):
+        """
+        Releases the shared runtime (cf PlaywrightRuntime.release): its browser and driver are closed once no other
+          downloader of the process uses them. A runtime provided to the downloader is left open.
+        """
+        if self.__holds_runtime:
+            self.__holds_runtime = False
+            self.__runtime.release()
+
     async def download_from_new_batch(self, ad_library_batch):
         """
-        Use parallelized calls to download ad elements for each row of a batch
+        Use parallelized calls to download ad elements for each row of a batch (in the loop of the Playwright runtime,
+          whatever the running event loop).
 
         Args:
             ad_library_batch: A list of records from a ResponseCursor object.
@@ -151,41 +215,81 @@ class MetaAdDownloader:
         Returns:
              The updated batch with new key "ad_elements".
         """
+        return await self.__runtime.run_async(self.__download_batch(ad_library_batch))
+
+    def download_batch(self, ad_library_batch):
+        """
+        Blocking counterpart of download_from_new_batch (used by the synchronous cursors).
+
+        Returns:
+             The updated batch with new key "ad_elements".
+        """
+        return self.__runtime.run(self.__download_batch(ad_library_batch))
+
+    async def __download_batch(self, ad_library_batch):
+        """ [Hidden method]
+        Downloads the ad elements of a batch with the browser of the runtime (in the loop of the runtime): the batch
+          is split into context batches downloaded concurrently (up to contexts_per_browser at once).
+        """
+        if not ad_library_batch:
+            return []
+
+        # Reuse the browser of the runtime (launched by the first batch)
+        browser = await self.__runtime.get_browser(self.__proxy)
 
-        # Initiate playwright context for this batch
-        async with async_playwright() as p:
-            # Initiate playwright browser and use it for the whole batch
-            if self.__proxy:
-                browser = await p.chromium.launch(headless=True, proxy=self.__proxy)
-            else:
-                browser = await p.chromium.launch(headless=True)
+        # Download ad_elements using smaller batches, each one in its own context
+        contexts = asyncio.Semaphore(self.__contexts_per_browser)
+        context_batches = await asyncio.gather(*[
+            self.__download_context_batch(browser, contexts, ad_library_batch[k:k + self.__pages_per_context])
+            for k in range(0, len(ad_library_batch), self.__pages_per_context)
+        ])
+
+        return [ad_payload for context_batch in context_batches for ad_payload in context_batch]
+
+    async def __download_context_batch(self, browser, contexts, ad_downloader_batch):
+        """ [Hidden method]
+        Scrapes the ads of a context batch concurrently (one page each) in a new browser context.
+
+        Args:
+            browser: The playwright browser.
+            contexts: The semaphore limiting the number of contexts open simultaneously.
+            ad_downloader_batch: The ad payloads (at most pages_per_context).
+
+        Returns:
+            The updated ad payloads, in the same order.
+        """
+        async with contexts:
+            # Initiate new context with a randomly generated User Agent
+            user_agent = UserAgent().pick()
+            context = await browser.new_context(user_agent=user_agent)
 
             try:
-                # Download ad_elements using smaller batches
-                updated_batches = []
-                while ad_library_batch:
-                    ad_downloader_batch = ad_library_batch[:self.MAX_BATCH_SIZE]
-                    ad_library_batch = ad_library_batch[self.MAX_BATCH_SIZE:]
-
-                    # Initiate new context with a randomly generated User Agent
-                    user_agent = UserAgent().pick()
-                    context = await browser.new_context(user_agent=user_agent)
-
-                    try:
-                        for ad_payload in ad_downloader_batch:
-                            # Download ad elements 1 by 1
-                            updated_batch = await self.__download_ad_elements_from_public(context, ad_payload)
-                            updated_batches.append(updated_batch)
-
-                    finally:
-                        # Close driver context and wait 1 second before next batch
-                        await context.close()
-                        time.sleep(1)
+                # Download ad elements concurrently: a failure only affects its own ad
+                results = await asyncio.gather(*[
+                    self.__download_ad_elements_from_public(context, ad_payload) for ad_payload in ad_downloader_batch
+                ], return_exceptions=True)
 
             finally:
-                await browser.close()
-
-        return updated_batches
+                # Close driver context and wait before opening the next one (without blocking the other downloads)
+                await context.close()
+                await asyncio.sleep(self.CONTEXT_DELAY)
+
+        updated_batch = []
+        for ad_payload, result in zip(ad_downloader_batch, results):
+            if isinstance(result, Exception):
+                print(f"[ERROR] Scrapping ad '{ad_payload.get('id')}' failed with error: {result}")
+                ad_payload.update({"ad_elements": {
+                    "body": None,
+                    "type": None,
+                    "carousel": [],
+                    "spotted": self.__spotted
+                }})
+                result = ad_payload
+            elif isinstance(result, BaseException):
+                raise result
+            updated_batch.append(result)
+
+        return updated_batch
 
     async def __download_ad_elements_from_private(self, context, ad_payload, previous_page=None):
         """ [Hidden method]
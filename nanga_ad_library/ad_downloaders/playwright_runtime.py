@@ -0,0 +1,172 @@
+import json
+import atexit
+import asyncio
+import threading
+
+from playwright.async_api import async_playwright
+
+from nanga_ad_library.utils import BackgroundEventLoop
+
+"""
+Keep a Playwright driver and its browsers alive between the downloads of the process.
+"""
+
+
+class PlaywrightRuntime:
+    """
+    A Playwright driver and its Chromium browsers living in a background event loop, reused by all the downloads:
+        - the driver and the browser (one per proxy) are started by the first download (and the browser launched again
+          if it was disconnected),
+        - downloads run in the loop of the runtime (cf submit), whatever the thread or event loop of the caller: the
+          pages of all the cursors share the browser, each batch opening its own context,
+        - close() closes the browsers and stops the driver and the loop (they are started again by the next download).
+        Usage example:
+            >>> runtime = PlaywrightRuntime()
+            >>> result = runtime.run(download(runtime))  # download() awaits runtime.get_browser()
+            >>> runtime.close()
+
+    The shared runtime (cf get_shared) is used by the downloaders of the process unless they are given their own. Its
+      users hold a reference on it (cf acquire and release): it is closed once the last one is released, or when the
+      interpreter exits.
+    """
+
+    LOOP_NAME = "nanga-playwright-runtime"
+
+    # Runtime shared by the downloaders of the process (cf get_shared)
+    __shared = None
+    __shared_lock = threading.Lock()
+
+    def __init__(self):
+        self.__loop = None
+        self.__loop_lock = threading.Lock()
+        self.__playwright = None
+        self.__browsers = {}
+        self.__launch_lock = None
+        self.__num_users = 0
+
+    @classmethod
+    def get_shared(cls):
+        """Returns the runtime shared by the downloaders of the process (created on first call)."""
+        with cls.__shared_lock:
+            if cls.__shared is None:
+                cls.__shared = cls()
+                atexit.register(cls.__shared.close)
+
+            return cls.__shared
+
+    def acquire(self):
+        """Registers a user of the runtime (cf release)."""
+        with self.__loop_lock:
+            self.__num_users += 1
+
+    def release(self):
+        """
+        Unregisters a user of the runtime (cf acquire): the runtime is closed once it has no user left (the downloads
+          still running in it belong to a user that has not released it yet).
+        """
+        with self.__loop_lock:
+            self.__num_users = max(self.__num_users - 1, 0)
+            if self.__num_users:
+                return
+            state = self.__detach()
+        self.__stop(*state)
+
+    def get_num_users(self):
+        return self.__num_users
+
+    def is_running(self):
+        """Whether the loop of the runtime is running (the browsers may not be launched yet)."""
+        loop = self.__loop
+        return bool(loop and loop.is_running())
+
+    def submit(self, coroutine):
+        """
+        Schedules a coroutine in the loop of the runtime (started if needed).
+
+        Returns:
+            A concurrent.futures.Future object holding the result of the coroutine.
+        """
+        with self.__loop_lock:
+            if not self.is_running():
+                self.__loop = BackgroundEventLoop(name=self.LOOP_NAME)
+                self.__launch_lock = None
+
+            return self.__loop.submit(coroutine)
+
+    def run(self, coroutine):
+        """Runs a coroutine in the loop of the runtime and waits for its result (blocking)."""
+        return self.submit(coroutine).result()
+
+    async def run_async(self, coroutine):
+        """Runs a coroutine in the loop of the runtime and awaits its result (from any event loop)."""
+        return await asyncio.wrap_future(self.submit(coroutine))
+
+    async def get_browser(self, proxy=None):
+        """
+        Returns the Chromium browser using the proxy, starting the driver and launching the browser if needed.
+        Must be awaited in the loop of the runtime (cf submit).
+
+        Args:
+            proxy: The Playwright proxy settings (dict with server, username and password) or None.
+        """
+        if self.__launch_lock is None:
+            self.__launch_lock = asyncio.Lock()
+
+        # Concurrent downloads wait for the same browser to be launched
+        async with self.__launch_lock:
+            if self.__playwright is None:
+                self.__playwright = await async_playwright().start()
+            key = json.dumps(proxy, sort_keys=True) if proxy else None
+            browser = self.__browsers.get(key)
+            if browser is None or not browser.is_connected():
+                if proxy:
+                    browser = await self.__playwright.chromium.launch(headless=True, proxy=proxy)
+                else:
+                    browser = await self.__playwright.chromium.launch(headless=True)
+                self.__browsers[key] = browser
+
+        return browser
+
+    def close(self):
+        """
+        Closes the browsers and stops the driver and the loop of the runtime (the downloads still running fail).
+        """
+        with self.__loop_lock:
+            state = self.__detach()
+        self.__stop(*state)
+
+    def __detach(self):
+        """ [Hidden method]
+        Returns the loop, browsers and driver of the runtime and forgets them (the next download starts new ones).
+        Must be called holding the loop lock.
+        """
+        loop, self.__loop = self.__loop, None
+        browsers, self.__browsers = list(self.__browsers.values()), {}
+        playwright, self.__playwright = self.__playwright, None
+
+        return loop, browsers, playwright
+
+    def __stop(self, loop, browsers, playwright):
+        """ [Hidden method]
+        Closes the browsers and stops the driver and the loop they were started in.
+        """
+        if not (loop and loop.is_running()):
+            return
+
+        try:
+            loop.run(self.__shutdown(browsers, playwright))
+        finally:
+            loop.stop()
+
+    @staticmethod
+    async def __shutdown(browsers, playwright):
+        """ [Hidden method]
+        Closes the browsers and stops the driver (in the loop they were started in).
+        """
+        try:
+            for browser in browsers:
+                if browser.is_connected():
+                    await browser.close()
+        finally:
+            if playwright:
+                await playwright.stop()
@@ -38,6 +38,8 @@ class MetaAdLibrary:
         self.__method = self.METHOD
         self.__final_url = f"{self.__base_url}/{self.__version}/{self.__endpoint}"
         self.__payload = payload
+        # Payload encoded as request params (cf get_compiled_query), cleared when the payload is updated
+        self.__compiled_queries = {}
 
         # Other useful components:
         self.__target_political_ads = False  # Set to False first, it's then calculated in self.init() (lines 118-131)
@@ -73,13 +75,62 @@ class MetaAdLibrary:
     def get_final_url(self):
         return self.__final_url
 
+    def get_batch_url(self):
+        """
+        Returns the url receiving Graph API batch requests (cf https://developers.facebook.com/docs/graph-api/batch-requests).
+        """
+        return self.__base_url
+
+    def get_relative_url(self):
+        """
+        Returns the url of the endpoint relative to the batch url (to use in a batch request).
+        """
+        return f"{self.__version}/{self.__endpoint}"
+
     def get_payload(self):
         return self.__payload
 
+    def get_heavy_fields(self):
+        return MetaField.list_heavy_fields(self.__payload.get("fields"))
+
+    def get_light_payload(self):
+        """
+        Returns the payload without its heavy fields (cf MetaField).
+        """
+        heavy_fields = self.get_heavy_fields()
+        fields = [field for field in self.__payload.get("fields") or [] if field not in heavy_fields]
+
+        return dict(self.__payload, fields=fields)
+
+    def get_compiled_query(self, light=False):
+        """
+        Returns the payload encoded as request params (a CompiledQuery object), encoded once and reused by the next
+          calls until the payload is updated (cf update_payload).
+
+        Args:
+            light: Whether the heavy fields are left out of the query (cf get_light_payload).
+        """
+        query = self.__compiled_queries.get(light)
+        if query is None:
+            query = self.__compiled_queries[light] = CompiledQuery(
+                self.get_light_payload() if light else self.__payload
+            )
+
+        return query
+
+    def get_nodes_url(self):
+        """
+        Returns the url used to read several archived ads at once (with the 'ids' param).
+        """
+        return f"{self.__base_url}/{self.__version}/"
+
     def update_payload(self, payload: dict):
         """"
         Update the payload or part of it with params dict
         """
+        # The compiled queries are encoded again on their next use
+        self.__compiled_queries = {}
+
         # Check if target_political_ads needs to be updated
         self.__target_political_ads = self.__target_political_ads or self.check_political_ads_targeting(payload)
 
@@ -905,6 +956,19 @@ class MetaParam(Enum):
             "max_len": None
         }
     }
+    LIMIT = {
+        "name": "limit",
+        "class": None,
+        "only_political": False,
+        "mandatory_level": None,
+        "exp_type": {
+            "is_date": False,
+            "date_format": None,
+            "is_list": False,
+            "t_types": tuple([int]),
+            "max_len": None
+        }
+    }
     MEDIA_TYPE = {
         "name": "media_type",
         "class": MediaType,
@@ -1000,66 +1064,7 @@ class MetaParam(Enum):
             Raise a ValueError if the provided value is not compatible with API standards.
         """
 
-        # List available parameters (only_political params are available only if target_political_ads)
-        available_params = {
-            member.value.get("name"): member.value for member in cls
-            if target_political_ads or not member.value.get("only_political")
-        }
-
-        # Check that the provided parameter is of the available ones
-        if param_name in available_params.keys():
-            meta_param = available_params.get(param_name)
-        else:
-            available_params_str = "\n\t- ".join(available_params.keys())
-            # To update
-            raise ValueError(
-                f"""'{param_name}' is not a valid parameter for Meta Ad Library API.\n"""
-                f"""Available parameters are: """
-                f"""(cf https://developers.facebook.com/docs/graph-api/reference/ads_archive/)\n"""
-                f"""\t- {available_params_str}"""
-            )
-
-        # Check that the param value is valid
-        expected_type_dict = meta_param.get("exp_type")
-        # # When limited options, check that provided value is accepted:
-        if meta_param.get("class"):
-            accepted_values = [member.value for member in meta_param.get("class")]
-            check_param_value(
-                param=param_name,
-                value=param_value,
-                accepted_values=accepted_values,
-                is_list=expected_type_dict.get("is_list")
-            )
-        # # When param is expected to be a date check it is and apply format
-        elif expected_type_dict.get("is_date"):
-            param_value = enforce_date_param_format(
-                param=param_name,
-                value=param_value,
-                date_format=expected_type_dict.get("date_format")
-            )
-        # # When types specs are given, check the provided value complies:
-        else:
-            check_param_type(
-                param=param_name,
-                value=param_value,
-                types=expected_type_dict.get("t_types"),
-                is_list=expected_type_dict.get("is_list")
-            )
-            # If param has a maximal size: ensure it's shorter than the limit
-            max_len = expected_type_dict.get("max_len")
-            try:
-                exceed_max_len = isinstance(max_len, int) and len(param_value) > max_len
-            except:
-                exceed_max_len = True
-            if exceed_max_len:
-                # To update
-                raise ValueError(
-                    f"""{param_value} is not a valid value for {param_name} parameter.\n"""
-                    f"""It's size is capped to {max_len}. """
-                    f"""(cf https://developers.facebook.com/docs/graph-api/reference/ads_archive/)"""
-                )
-
-        return param_value
+        return META_PARAM_SCHEMA.validate(param_name, param_value, target_political_ads)
 
     @classmethod
     def check_mandatory_params(cls, params: dict):
@@ -1073,23 +1078,13 @@ class MetaParam(Enum):
             ValueError if at least one parameter is missing.
         """
 
-        # Retrieve mandatory params using "mandatory_level" key
-        mandatory_params = [member.value for member in cls if member.value.get("mandatory_level")]
+        # Mandatory params by "mandatory_level" (compiled once)
+        params_display = META_PARAM_SCHEMA.get_mandatory_params()
 
         # Check which of these mandatory params are provided
-        params_checker = {}
-        params_display = {}
-        for mandatory_param in mandatory_params:
-            name, level, provided = mandatory_param.get("name"), str(mandatory_param.get("mandatory_level")), False
-            # Update params display
-            try:
-                params_display[level].append(name)
-            except:
-                params_display[level] = [name]
-            # Check if the param is provided
-            provided = params.get(name) is not None
-            # Update params checker
-            params_checker[level] = params_checker.get(level) or provided
+        params_checker = {
+            level: any(params.get(name) is not None for name in names) for level, names in params_display.items()
+        }
 
         # Check provided parameters are sufficient
         if not all(params_checker.values()):
@@ -1114,144 +1109,172 @@ class MetaField(Enum):
     Members:
         name: Field's name to provide to Meta GRAPH API.
         mandatory: Whether the field is expected to be provided to Meta GRAPH API.
+        heavy: Whether the field makes the pages much larger and slower to query (it can then be loaded afterwards).
         warning: Warning message to display when the field is provided in the request. (Special behaviours)
     """
     ID = {
         "name": "id",
         "mandatory": True,
+        "heavy": False,
         "warning": None
     }
     AD_CREATION_TIME = {
         "name": "ad_creation_time",
         "mandatory": True,
+        "heavy": False,
         "warning": None
     }
     AD_CREATIVE_LINK_BODIES = {
         "name": "ad_creative_link_bodies",
         "mandatory": False,
+        "heavy": False,
         "warning": None
     }
     AD_CREATIVE_LINK_CAPTIONS = {
         "name": "ad_creative_link_captions",
         "mandatory": False,
+        "heavy": False,
         "warning": None
     }
     AD_CREATIVE_LINK_DESCRIPTIONS = {
         "name": "ad_creative_link_descriptions",
         "mandatory": False,
+        "heavy": False,
         "warning": None
     }
     AD_CREATIVE_LINK_TITLES = {
         "name": "ad_creative_link_titles",
         "mandatory": False,
+        "heavy": False,
         "warning": None
     }
     AD_DELIVERY_START_TIME = {
         "name": "ad_delivery_start_time",
         "mandatory": True,
+        "heavy": False,
         "warning": None
     }
     AD_DELIVERY_STOP_TIME = {
         "name": "ad_delivery_stop_time",
         "mandatory": True,
+        "heavy": False,
         "warning": None
     }
     AD_SNAPSHOT_URL = {
         "name": "ad_snapshot_url",
         "mandatory": True,
+        "heavy": False,
         "warning": None
     }
     AGE_COUNTRY_GENDER_REACH_BREAKDOWN = {
         "name": "age_country_gender_reach_breakdown",
         "mandatory": False,
+        "heavy": True,
         "warning": "The 'age_country_gender_reach_breakdown' field is available only for ads delivered to the EU" +
                    "and POLITICAL_AND_ISSUE_ADS delivered to Brazil."
     }
     BENEFICIARY_PAYERS = {
         "name": "beneficiary_payers",
         "mandatory": False,
+        "heavy": True,
         "warning": "The 'beneficiary_payers' field is available only for ads delivered to the EU."
     }
     BR_TOTAL_REACH = {
         "name": "br_total_reach",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'br_total_reach' field is available for POLITICAL_AND_ISSUE_ADS delivered to Brazil."
     }
     BYLINES = {
         "name": "bylines",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'bylines' field is available only for POLITICAL_AND_ISSUE_ADS."
     }
     CURRENCY = {
         "name": "currency",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'currency' field is available only for POLITICAL_AND_ISSUE_ADS."
     }
     DELIVERY_BY_REGION = {
         "name": "delivery_by_region",
         "mandatory": False,
+        "heavy": True,
         "warning": "The 'delivery_by_region' field is available only for POLITICAL_AND_ISSUE_ADS."
     }
     DEMOGRAPHIC_DISTRIBUTION = {
         "name": "demographic_distribution",
         "mandatory": False,
+        "heavy": True,
         "warning": "The 'demographic_distribution' field is available only for POLITICAL_AND_ISSUE_ADS."
     }
     ESTIMATED_AUDIENCE_SIZE = {
         "name": "estimated_audience_size",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'estimated_audience_size' field is available only for POLITICAL_AND_ISSUE_ADS."
     }
     EU_TOTAL_REACH = {
         "name": "eu_total_reach",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'eu_total_reach' field is available only for ads delivered to the EU."
     }
     IMPRESSIONS = {
         "name": "impressions",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'impressions' field is available only for POLITICAL_AND_ISSUE_ADS."
     }
     LANGUAGES = {
         "name": "languages",
         "mandatory": False,
+        "heavy": False,
         "warning": None
     }
     PAGE_ID = {
         "name": "page_id",
         "mandatory": True,
+        "heavy": False,
         "warning": None
     }
     PAGE_NAME = {
         "name": "page_name",
         "mandatory": True,
+        "heavy": False,
         "warning": None
     }
     PUBLISHER_PLATFORMS = {
         "name": "publisher_platforms",
         "mandatory": False,
+        "heavy": False,
         "warning": None
     }
     SPEND = {
         "name": "spend",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'spend' field is available only for POLITICAL_AND_ISSUE_ADS."
     }
     TARGET_AGES = {
         "name": "target_ages",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'target_ages' field is available only for ads delivered to the EU and " +
                    "POLITICAL_AND_ISSUE_ADS delivered to Brazil."
     }
     TARGET_GENDER = {
         "name": "target_gender",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'target_gender' field is available only for ads delivered to the EU and " +
                    "POLITICAL_AND_ISSUE_ADS delivered to Brazil."
     }
     TARGET_LOCATIONS = {
         "name": "target_locations",
         "mandatory": False,
+        "heavy": False,
         "warning": "The 'target_locations' field is available only for ads delivered to the EU and " +
                    "POLITICAL_AND_ISSUE_ADS delivered to Brazil."
     }
@@ -1271,13 +1294,13 @@ class MetaField(Enum):
             The fields: reviewed and updated (if needed)
         """
 
-        # Store fields in a dict
-        meta_fields = {member.value.get("name"): member.value.get("warning") for member in cls}
+        # Fields and their warnings (compiled once)
+        meta_fields = META_FIELD_WARNINGS
 
         # Add mandatory fields if not provided
-        mandatory_fields = [member.value.get("name") for member in cls if member.value.get("mandatory")]
+        mandatory_fields = META_MANDATORY_FIELDS
 
-        reviewed_fields = mandatory_fields
+        reviewed_fields = list(mandatory_fields)
         # Review each provided field
         fields = fields or []
         for field in fields:
@@ -1299,3 +1322,29 @@ class MetaField(Enum):
 
         return reviewed_fields
 
+    @classmethod
+    def list_heavy_fields(cls, fields: list):
+        """
+        Lists the heavy fields among the provided fields.
+
+        Args:
+            fields: The fields to query from the Meta Ad Library API.
+
+        Returns:
+            The heavy fields (in the order they were provided).
+        """
+        return [field for field in fields or [] if field in META_HEAVY_FIELDS]
+
+
+"""
+Validation data compiled once (at import) from the classes above.
+"""
+
+META_PARAM_SCHEMA = ParamSchema(
+    [member.value for member in MetaParam],
+    api_name="Meta Ad Library API",
+    doc_url="https://developers.facebook.com/docs/graph-api/reference/ads_archive/"
+)
+META_FIELD_WARNINGS = {member.value.get("name"): member.value.get("warning") for member in MetaField}
+META_MANDATORY_FIELDS = tuple(member.value.get("name") for member in MetaField if member.value.get("mandatory"))
+META_HEAVY_FIELDS = frozenset(member.value.get("name") for member in MetaField if member.value.get("heavy"))
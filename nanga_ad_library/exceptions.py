@@ -15,6 +15,20 @@ class PlatformError(Exception):
     pass
 
 
+class PlatformRateLimitError(PlatformError):
+    """
+    Raised before a request when the platform rate limits would make it wait longer than allowed (the request is not
+    made).
+    """
+
+    def __init__(self, message, wait_time):
+        self.__wait_time = wait_time
+        super(PlatformRateLimitError, self).__init__(message)
+
+    def get_wait_time(self):
+        return self.__wait_time
+
+
 class PlatformRequestError(PlatformError):
     """
     Raised when an api request fails. Returned by raise_for_status() method on a
@@ -33,10 +47,13 @@ class PlatformRequestError(PlatformError):
         self.__request_context = request_context
         self.__http_status = http_status
         self.__http_headers = http_headers
-        try:
-            self.__body = json.loads(body)
-        except (TypeError, ValueError):
-            self.__body = body
+        # The body may be provided already parsed (cf PlatformResponse.json)
+        if isinstance(body, (str, bytes, bytearray)):
+            try:
+                body = json.loads(body)
+            except ValueError:
+                body = body.decode("utf-8", errors="replace") if isinstance(body, (bytes, bytearray)) else body
+        self.__body = body
 
         self.__api_error_code = None
         self.__api_error_type = None
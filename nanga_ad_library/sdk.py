@@ -1,21 +1,41 @@
 import json
-import curlify
+import time
 import asyncio
+import warnings
+import threading
+
+from itertools import islice
+from collections import deque
+from functools import partial
+from contextlib import nullcontext
 
 from nanga_ad_library.utils import (
     PlatformResponse,
     ObjectParser,
-    json_encode_top_level_param,
+    LazyObjectParser,
+    CompactObjectParser,
+    PagePrefetcher,
+    BackgroundEventLoop,
+    DownloadPipeline,
+    QueryRunner,
+    AsyncQueryRunner,
+    CursorCheckpoint,
+    CrawlState,
+    AdaptivePageSize,
+    RetryPolicy,
+    JsonPageStream,
+    ArrowBatchBuilder,
+    extract_after_token,
     get_sdk_version
 )
-from nanga_ad_library.sessions import MetaGraphAPISession
+from nanga_ad_library.sessions import MetaGraphAPISession, AsyncMetaGraphAPISession
 from nanga_ad_library.ad_libraries import MetaAdLibrary
-from nanga_ad_library.ad_downloaders import MetaAdDownloader
 
 
 """
 The sdk module contains the main classe NangaAdLibrary which allows you to make requests to the platform Ad Library API
   and extracts/shapes the results using ResultCursor.
+AsyncNangaAdLibrary and AsyncResultCursor are their asyncio counterparts.
 """
 
 
@@ -28,6 +48,13 @@ class NangaAdLibrary:
     Attributes:
         SDK_VERSION (class): indicating sdk version.
         HTTP_DEFAULT_HEADERS (class): Default HTTP headers for requests made by this sdk.
+        SESSION_CLASSES (class): Session class to use for each platform.
+        CURSOR_CLASS (class): Cursor class used to iterate over the results.
+        CURSOR_OPTIONS (class): Arguments of init forwarded to each cursor (cf ResultCursor).
+        NODES_BATCH_SIZE (class): Maximum number of ads whose heavy fields are loaded with a single request.
+        BATCH_SIZE (class): Maximum number of queries packed in a single batch request (cf get_batch_results).
+        AUTH_PARAMS (class): Session params used for authentication (kept by the sessions created by the library).
+        DEFAULT_MAX_CONCURRENCY (class): Default maximum number of concurrent queries and requests of run_many.
     """
 
     SDK_VERSION = get_sdk_version()
@@ -36,7 +63,37 @@ class NangaAdLibrary:
         'User-Agent': "NangaAdLibrary/%s" % SDK_VERSION,
     }
 
-    def __init__(self, sdk_session, ad_library, ad_downloader, verbose=None):
+    SESSION_CLASSES = {
+        "meta": MetaGraphAPISession
+    }
+
+    CURSOR_OPTIONS = [
+        "prefetch_pages",
+        "download_workers",
+        "download_queue_size",
+        "stream_pages",
+    ]
+
+    # Size (in bytes) of the chunks read from the streamed pages
+    STREAM_CHUNK_SIZE = 1 << 16
+
+    NODES_BATCH_SIZE = 50
+
+    BATCH_SIZE = 50
+
+    AUTH_PARAMS = [
+        "access_token",
+        "appsecret_proof",
+    ]
+
+    DEFAULT_MAX_CONCURRENCY = 8
+
+    def __init__(
+        self, sdk_session, ad_library, ad_downloader, verbose=None,
+        checkpoint_path=None, adaptive_page_size=None, lazy_heavy_fields=None, incremental_path=None,
+        retry_policy=None, compact_records=None,
+        **cursor_options
+    ):
         """
         Initiates the sdk instance.
 
@@ -46,15 +103,48 @@ class NangaAdLibrary:
             ad_library: {Platform}AdLibrary object that stores all parameters and useful data to help query the API
             ad_downloader: {Platform}Downloader object that will scrap preview URL and extract
                 ad elements (Title, Body, Image, Video, CTA, ...) 
+            verbose: Whether to display intermediate logs.
+            checkpoint_path: Path of a json file where cursors save their progress (cf CursorCheckpoint).
+                If the file was saved by the same query, get_results() resumes the crawl where it stopped.
+            adaptive_page_size: Whether each cursor adapts the 'limit' param to the weight of its pages
+                (cf AdaptivePageSize).
+            lazy_heavy_fields: Whether the pages are queried without the heavy fields (cf MetaField), which are then
+                loaded in bulk for the records that need them (cf load_heavy_fields).
+            incremental_path: Path of a SQLite database remembering what the previous runs of each query returned
+                (cf CrawlState): get_results() then only asks for the ads delivered since the last run and only
+                hands over the new or changed ads.
+            retry_policy: RetryPolicy object deciding which failed calls are made again, and when (None: no retry).
+            compact_records: Whether records store their fields in slots and share their repeated values, using several
+                times less memory (cf CompactObjectParser).
+            cursor_options: Options given to each cursor (cf CURSOR_OPTIONS and ResultCursor).
         """
+        # Checkpoints need records to be handed over in the API order
+        if checkpoint_path and ad_downloader and cursor_options.get("download_workers"):
+            # To update
+            raise ValueError(
+                """Checkpoints ('checkpoint_path') cannot be used with a download pipeline ('download_workers')."""
+            )
+
         self.__sdk_session = sdk_session
         self.__ad_library = ad_library
         self.__ad_downloader = ad_downloader
+        # The downloader is closed by the library which created it (cf new_library)
+        self.__owns_ad_downloader = True
 
         # Global information
         self.__num_requests_succeeded = 0
         self.__num_requests_attempted = 0
         self.__verbose = verbose or False
+        self.__checkpoint_path = checkpoint_path
+        self.__adaptive_page_size = adaptive_page_size or False
+        self.__lazy_heavy_fields = lazy_heavy_fields or False
+        self.__incremental_path = incremental_path
+        self.__crawl_state = None
+        self.__narrowed_query = None
+        self.__retry_policy = retry_policy
+        self.__compact_records = compact_records or False
+        self.__request_limiter = None
+        self.__cursor_options = cursor_options
 
         # Enforce different sessions for each cursors
         self.__cursor_sessions = []
@@ -88,13 +178,17 @@ class NangaAdLibrary:
         # Initiate instances depending on the chosen platform
         if platform == "meta":
             # Initiate Meta Graph Session
-            sdk_session = MetaGraphAPISession.init(**kwargs)
+            sdk_session = cls.SESSION_CLASSES[platform].init(**kwargs)
 
             # Initiate Meta Ad Library API
             ad_library = MetaAdLibrary.init(**kwargs)
 
             # Initiate Meta Ad Downloader if "download_ads" argument is set to True
-            ad_downloader = MetaAdDownloader.init(**kwargs) if (kwargs.get("download_ads") == True) else None
+            # (imported only then: the downloader stack loads Playwright)
+            ad_downloader = None
+            if kwargs.get("download_ads") == True:
+                from nanga_ad_library.ad_downloaders import MetaAdDownloader
+                ad_downloader = MetaAdDownloader.init(**kwargs)
 
         else:
             # To update
@@ -103,10 +197,156 @@ class NangaAdLibrary:
             )
 
         # Initiate NangaAdLibrary
-        sdk = cls(sdk_session, ad_library, ad_downloader, verbose=kwargs.get("verbose"))
+        sdk = cls(
+            sdk_session, ad_library, ad_downloader,
+            verbose=kwargs.get("verbose"),
+            checkpoint_path=kwargs.get("checkpoint_path"),
+            adaptive_page_size=kwargs.get("adaptive_page_size"),
+            lazy_heavy_fields=kwargs.get("lazy_heavy_fields"),
+            incremental_path=kwargs.get("incremental_path"),
+            retry_policy=RetryPolicy(
+                max_retries=kwargs.get("max_error_retries"),
+                base_delay=kwargs.get("retry_base_delay"),
+                max_delay=kwargs.get("retry_max_delay")
+            ),
+            compact_records=kwargs.get("compact_records"),
+            **{option: kwargs.get(option) for option in cls.CURSOR_OPTIONS}
+        )
 
         return sdk
 
+    @classmethod
+    def run_many(cls, platform, payloads, max_concurrency=None, **kwargs):
+        """
+        Runs several queries concurrently (at most max_concurrency queries and max_concurrency requests at the same
+          time) with a single connection pool, and hands over their pages as soon as they arrive.
+        All the payloads are validated before any request is made.
+            Usage example:
+                >>> for payload, page in NangaAdLibrary.run_many("meta", payloads, max_concurrency=8, **kwargs):
+                >>>     print(payload.get("search_terms"), len(page))
+
+        Args:
+            platform: The platform of the Ad Library.
+            payloads: A list of payloads (same format as the payload given to init).
+            max_concurrency: Maximum number of queries (and requests) running at the same time.
+            **kwargs: The other arguments of init (shared by all the queries, checkpoint_path is ignored).
+
+        Returns:
+            A generator of tuples (payload, list of records), in the order the pages arrive.
+        """
+        libraries = cls.prepare_many(platform, payloads, max_concurrency, **kwargs)
+        runner = QueryRunner(libraries, max_concurrency or cls.DEFAULT_MAX_CONCURRENCY)
+
+        return ((payloads[rank], page) for rank, page in runner.iter_pages())
+
+    @classmethod
+    def prepare_many(cls, platform, payloads, max_concurrency=None, **kwargs):
+        """
+        Creates a library for each payload (cf run_many): all the libraries share the connection pool and the
+          request limiter of the first one. The checkpoint_path argument is ignored (checkpoints are bound to a single
+          query).
+
+        Returns:
+            A list of libraries (in the order of the payloads).
+        """
+        if not payloads:
+            return []
+
+        max_concurrency = max_concurrency or cls.DEFAULT_MAX_CONCURRENCY
+        kwargs.update({"pool_maxsize": kwargs.get("pool_maxsize") or max_concurrency})
+        kwargs.pop("payload", None)
+        kwargs.pop("checkpoint_path", None)
+        library = cls.init(platform, payload=payloads[0], **kwargs)
+        library.set_request_limiter(cls.new_request_limiter(max_concurrency))
+
+        return [library] + [library.new_library(payload) for payload in payloads[1:]]
+
+    @staticmethod
+    def new_request_limiter(max_concurrency):
+        """Returns the object limiting the number of concurrent requests (used as a context manager)."""
+        return threading.BoundedSemaphore(max_concurrency)
+
+    def get_request_limiter(self):
+        return self.__request_limiter
+
+    def set_request_limiter(self, request_limiter):
+        """
+        Limits the requests of the library (and of the libraries it creates) with a semaphore shared with other
+          libraries (None to remove the limit).
+        """
+        self.__request_limiter = request_limiter
+
+    def execute(self, session, request_kwargs):
+        """
+        Makes a request with a session (waiting for the request limiter if any).
+
+        Returns:
+            The http response returned by the session execute method.
+        """
+        with self.__request_limiter or nullcontext():
+            return session.execute(**request_kwargs)
+
+    def execute_stream(self, session, request_kwargs):
+        """
+        Makes a streamed request with a session: its slot of the request limiter (if any) is kept until its body is
+          read, the limiter being released only by the returned callable (cf process_stream).
+
+        Returns:
+            A tuple (http response returned by the session execute method, callable releasing the request limiter).
+        """
+        request_limiter = self.__request_limiter
+        if not request_limiter:
+            return session.execute(**request_kwargs), None
+
+        request_limiter.acquire()
+        try:
+            return session.execute(**request_kwargs), request_limiter.release
+        except BaseException:
+            request_limiter.release()
+            raise
+
+    def get_session(self):
+        return self.__sdk_session
+
+    def get_ad_library(self):
+        return self.__ad_library
+
+    def get_ad_downloader(self):
+        return self.__ad_downloader
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the downloader of the library (if any, and unless it belongs to the library this one was created from):
+          the Playwright runtime it uses is closed once no downloader of the process uses it anymore (cf
+          MetaAdDownloader.close).
+        """
+        if self.__ad_downloader and self.__owns_ad_downloader:
+            self.__ad_downloader.close()
+
+    def get_headroom(self):
+        """
+        Returns the percentage of the platform rate limits still available (cf UsageRateLimiter.get_headroom), None
+          if the session has no rate limiter.
+        """
+        rate_limiter = self.__sdk_session.get_rate_limiter()
+
+        return rate_limiter.get_headroom() if rate_limiter else None
+
+    def get_cache_stats(self):
+        """
+        Returns the hits, misses and number of entries of the response cache (cf ResponseCache.get_stats), None if the
+          session has no response cache.
+        """
+        response_cache = self.__sdk_session.get_response_cache()
+
+        return response_cache.get_stats() if response_cache else None
+
     def get_api_version(self):
         return self.__ad_library.get_api_version()
 
@@ -131,20 +371,101 @@ class NangaAdLibrary:
             method=self.__ad_library.get_method()
         )
 
+    def get_auth_params(self):
+        """Returns the authentication params of the main session."""
+        params = self.__sdk_session.get_params()
+        return {param: params[param] for param in self.AUTH_PARAMS if param in params}
+
+    def new_session(self):
+        """
+        Returns a new session with the authentication params of the main session only (no payload params).
+        """
+        session = self.__sdk_session.duplicate()
+        session.clean_params()
+        session.update_headers(self.HTTP_DEFAULT_HEADERS)
+        session.update_params(self.get_auth_params())
+
+        return session
+
+    def new_library(self, payload: dict):
+        """
+        Creates a library querying another payload with the same settings (version, method, downloader, cursor
+          options, incremental database, retry policy and request limiter) and a new session sharing the same connection pool
+          (checkpoints are not shared).
+
+        Returns:
+            A new object of the same class.
+        """
+        ad_library = self.__ad_library.init(
+            payload=payload,
+            version=self.__ad_library.get_api_version(),
+            method=self.__ad_library.get_method()
+        )
+
+        library = type(self)(
+            self.new_session(), ad_library, self.__ad_downloader,
+            verbose=self.__verbose,
+            adaptive_page_size=self.__adaptive_page_size,
+            lazy_heavy_fields=self.__lazy_heavy_fields,
+            incremental_path=self.__incremental_path,
+            retry_policy=self.__retry_policy,
+            compact_records=self.__compact_records,
+            **self.__cursor_options
+        )
+        library.set_request_limiter(self.__request_limiter)
+        # The downloader stays in use by this library: closing the new one leaves it open
+        library.__owns_ad_downloader = False
+
+        return library
+
     def get_cursor_session(self, rank):
         if isinstance(rank, int) and (0 <= rank < len(self.__cursor_sessions)):
             return self.__cursor_sessions[rank]
 
-    def call(self, session=None):
+    def __prepare_main_session(self):
+        """ [Hidden method]
+        Updates the main session with the API headers and the AdLibrary payload.
         """
-        Makes an API call using a session and an ad_library object
+        # Include API headers in http request
+        self.__sdk_session.update_headers(self.HTTP_DEFAULT_HEADERS)
 
-        Returns:
-            A PlatformResponse object containing the response body, headers,
-            http status, and summary of the call that was made.
+        # Include AdLibrary Payload (encoded once) to session params
+        if self.__ad_library.get_payload:
+            self.__sdk_session.update_params(self.get_compiled_query().get_params())
 
-        Raises:
-            PlatformResponse.raise_for_status() to check if the request failed.
+    def get_compiled_query(self):
+        """
+        Returns the AdLibrary payload encoded as request params (a CompiledQuery object encoded once by the AdLibrary):
+          without the heavy fields if they are loaded afterwards, and with the 'ad_delivery_date_min' param narrowed by
+          the crawl state if any.
+        """
+        query = self.__ad_library.get_compiled_query(light=self.__lazy_heavy_fields)
+        if self.__crawl_state:
+            date_min = self.__crawl_state.get_date_min(self.__ad_library.get_payload().get("ad_delivery_date_min"))
+            if date_min:
+                # Only the narrowed date is encoded (the query is built again when the date or the payload changes)
+                if self.__narrowed_query is None or self.__narrowed_query[:2] != (query, date_min):
+                    self.__narrowed_query = (query, date_min, query.with_params({"ad_delivery_date_min": date_min}))
+                query = self.__narrowed_query[2]
+
+        return query
+
+    def get_encoded_payload(self):
+        """
+        Returns the AdLibrary payload encoded as request params (a new dict, cf get_compiled_query).
+        """
+        return dict(self.get_compiled_query().get_params())
+
+    def prepare_call(self, session=None):
+        """
+        Prepares an API call: if no session is provided, the main session is updated with the API headers and the
+          AdLibrary payload.
+
+        Args:
+            session: The session to use (a cursor session for instance).
+
+        Returns:
+            The session to use and the request arguments (method and url) to give to its execute method.
         """
 
         # Increment _num_requests_attempted as soon as Call method is triggered
@@ -152,29 +473,39 @@ class NangaAdLibrary:
 
         # When a session is provided, do not affect if
         if not session:
-            # Include API headers in http request
-            self.__sdk_session.update_headers(self.HTTP_DEFAULT_HEADERS)
+            self.__prepare_main_session()
+            session = self.__sdk_session
 
-            # Include AdLibrary Payload to session params
-            if self.__ad_library.get_payload:
-                encoded_payload = json_encode_top_level_param(self.__ad_library.get_payload())
-                self.__sdk_session.update_params(encoded_payload)
+        request_kwargs = {
+            "method": self.__ad_library.get_method(),
+            "url": self.__ad_library.get_final_url()
+        }
 
-            session = self.__sdk_session
+        return session, request_kwargs
 
-        # Get request response and encapsulate it in a PlatformResponse
-        response = session.execute(
-            method=self.__ad_library.get_method(),
-            url=self.__ad_library.get_final_url()
-        )
+    def process_response(self, response):
+        """
+        Encapsulates the http response of a call in a PlatformResponse (and updates the calls counters).
+
+        Args:
+            response: The http response returned by the session execute method.
+
+        Returns:
+            A PlatformResponse object.
+        """
 
-        # If debug logger enabled, print the request as CURL
+        # If debug logger enabled, print the request as CURL (when possible)
         if self.__verbose:
-            print(f"New HTTP request made:\n\t{curlify.to_curl(response.request)}\n")
+            try:
+                import curlify
+                request_str = curlify.to_curl(response.request)
+            except Exception:
+                request_str = f"{response.request.method} {response.request.url}"
+            print(f"New HTTP request made:\n\t{request_str}\n")
 
         # Prepare response
         platform_response = PlatformResponse(
-            body=response.text,
+            body=response.content,
             headers=response.headers,
             http_status=response.status_code,
             call={
@@ -191,41 +522,548 @@ class NangaAdLibrary:
 
         return platform_response
 
-    def get_results(self):
+    def process_stream(self, response, release=None):
+        """
+        Encapsulates the successful http response of a streamed call in a JsonPageStream (and updates the calls
+          counters): its rows are parsed while its body is received.
+
+        Args:
+            response: The http response returned by the session execute method (with stream=True).
+            release: A callable releasing the request limiter (cf execute_stream), called once the stream has read
+              the whole body or was closed.
+
+        Returns:
+            A JsonPageStream object.
+        """
+        if self.__verbose:
+            print(f"New HTTP request made (streamed):\n\t{response.request.method} {response.request.url}\n")
+        self.__num_requests_succeeded += 1
+
+        def close():
+            try:
+                response.close()
+            finally:
+                if release:
+                    release()
+
+        return JsonPageStream(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE), close=close)
+
+    def get_retry_delay(self, response, retries, previous_delay=None):
+        """
+        Uses the retry policy (if any) to decide whether a failed call is made again (cf RetryPolicy.get_delay).
+
+        Args:
+            response: The PlatformResponse of the failed call.
+            retries: The number of retries already made for this call.
+            previous_delay: The delay waited before the previous retry (if any).
+
+        Returns:
+            The delay (in seconds) to wait before making the call again, None if it should not be made again.
+        """
+        delay = self.__retry_policy.get_delay(response, retries, previous_delay) if self.__retry_policy else None
+        if delay is not None:
+            self.__num_requests_attempted += 1
+            if self.__verbose:
+                print(f"Call failed with a transient error: retrying in {delay:.1f}s")
+
+        return delay
+
+    def reduce_page_size(self, session, page_size, response, latency):
+        """
+        Updates the page size with the last response (cf AdaptivePageSize.update) and lowers the 'limit' param of the
+          session when the API asks to reduce the amount of data.
+
+        Args:
+            session: The session of the call.
+            page_size: The AdaptivePageSize object of the call (if any).
+            response: The PlatformResponse of the call.
+            latency: Duration of the call (in seconds).
+
+        Returns:
+            Whether the call has to be made again (with the lower limit).
+
+        Raises:
+            PlatformRequestError if the API still asks to reduce the amount of data at the minimum limit.
+        """
+        if not (page_size and page_size.update(response, latency)):
+            return False
+
+        self.__num_requests_attempted += 1
+        session.update_params({"limit": page_size.get_limit()})
+        if self.__verbose:
+            print(f"Too much data requested: retrying with limit={page_size.get_limit()}")
+
+        return True
+
+    def call(self, session=None, page_size=None, stream=False):
+        """
+        Makes an API call using a session and an ad_library object
+
+        Args:
+            session: The session to use (if empty: the main session).
+            page_size: An AdaptivePageSize object setting the 'limit' param of the request (if any).
+                When the API asks to reduce the amount of data, the request is made again with a lower limit (cf
+                reduce_page_size).
+                Calls failing with a transient error are made again with the same params (cf get_retry_delay).
+            stream: Whether to parse the body of a successful response while it is received (the page size is then
+                only lowered on errors, the weight of streamed pages being unknown). The request keeps its slot of the
+                request limiter (if any) until the JsonPageStream has read the whole body or is closed.
+
+        Returns:
+            A PlatformResponse object containing the response body, headers,
+            http status, and summary of the call that was made.
+            With stream=True, successful responses are returned as a JsonPageStream object.
+
+        Raises:
+            PlatformRequestError if the API still asks to reduce the amount of data at the minimum limit (cf
+              reduce_page_size). Otherwise, use PlatformResponse.raise_for_status() to check if the request failed.
+        """
+
+        # Get request response and encapsulate it in a PlatformResponse
+        session, request_kwargs = self.prepare_call(session)
+        if page_size:
+            session.update_params({"limit": page_size.get_limit()})
+        if stream:
+            request_kwargs["stream"] = True
+        retries, delay = 0, None
+        while True:
+            start_time = time.monotonic()
+            if stream:
+                http_response, release = self.execute_stream(session, request_kwargs)
+                if http_response.ok:
+                    return self.process_stream(http_response, release)
+                try:
+                    response = self.process_response(http_response)
+                finally:
+                    if release:
+                        release()
+            else:
+                response = self.process_response(self.execute(session, request_kwargs))
+
+            # Request the same page again with a lower limit if needed
+            if self.reduce_page_size(session, page_size, response, time.monotonic() - start_time):
+                continue
+
+            # Request the same page again after a transient error
+            delay = self.get_retry_delay(response, retries, delay)
+            if delay is None:
+                return response
+            retries += 1
+            time.sleep(delay)
+
+    def get_checkpoint(self):
+        """
+        Returns the CursorCheckpoint of the current query (None if no checkpoint_path was provided).
+        """
+        if self.__checkpoint_path:
+            fingerprint = CursorCheckpoint.fingerprint(
+                self.__ad_library.get_method(),
+                self.__ad_library.get_final_url(),
+                self.__ad_library.get_payload()
+            )
+            return CursorCheckpoint(self.__checkpoint_path, fingerprint)
+
+    def load_crawl_state(self):
+        """
+        Loads the CrawlState of the current query from the incremental database (used by the next calls and cursors
+          of the library).
+
+        Returns:
+            The CrawlState object (None if no incremental_path was provided).
+        """
+        self.__crawl_state = None
+        if self.__incremental_path:
+            fingerprint = CrawlState.fingerprint(
+                self.__ad_library.get_method(),
+                self.__ad_library.get_final_url(),
+                self.__ad_library.get_payload()
+            )
+            self.__crawl_state = CrawlState(self.__incremental_path, fingerprint)
+
+        return self.__crawl_state
+
+    def get_page_size(self):
+        """
+        Returns a new AdaptivePageSize object for a cursor (None if adaptive_page_size is not activated).
+        """
+        if self.__adaptive_page_size:
+            return AdaptivePageSize(initial_limit=self.__ad_library.get_payload().get("limit"))
+
+    def get_first_page_session(self, checkpoint=None):
+        """
+        Returns the session to use to query the first page of a new cursor:
+            - None (the main session is used) to start from the first page,
+            - a session querying the page stored in the checkpoint when resuming a crawl.
+        """
+        resume_token = checkpoint.get_resume_token() if checkpoint else None
+        if resume_token:
+            self.__prepare_main_session()
+            session = self.__sdk_session.duplicate()
+            session.update_params({"after": resume_token})
+            return session
+
+    def get_heavy_fields(self):
+        """
+        Returns the heavy fields to load afterwards (empty list if lazy_heavy_fields is not activated).
+        """
+        return self.__ad_library.get_heavy_fields() if self.__lazy_heavy_fields else []
+
+    def get_object_parser(self):
+        """
+        Returns the record class used when all the fields are queried with the pages:
+            - a CompactObjectParser class storing the fields of the payload if compact_records is activated,
+            - ObjectParser otherwise.
+        """
+        if self.__compact_records:
+            return CompactObjectParser.for_fields(self.__ad_library.get_payload().get("fields"))
+
+        return ObjectParser
+
+    def get_record_parser(self):
+        """
+        Returns the callable used by the cursors to turn each row of the API into a record:
+            - ObjectParser (or CompactObjectParser, cf get_object_parser) when all the fields are queried with the pages,
+            - LazyObjectParser (loading its heavy fields the first time they are accessed) otherwise (compact_records
+              is then not used).
+        """
+        heavy_fields = self.get_heavy_fields()
+        if heavy_fields:
+            if self.__compact_records:
+                warnings.warn(
+                    """Compact records ('compact_records') cannot load their heavy fields lazily: records are """
+                    """LazyObjectParser objects ('lazy_heavy_fields')."""
+                )
+            return partial(LazyObjectParser, heavy_fields, self.load_heavy_fields)
+
+        return self.get_object_parser()
+
+    def __new_graph_session(self, params):
+        """ [Hidden method]
+        Returns a new session for a request that is not paginated (heavy fields, batch requests): its params are the
+          authentication params and the given params only (the params of the other requests do not leak into it).
+        """
+        session = self.new_session()
+        session.update_params(params)
+
+        return session
+
+    def prepare_heavy_fields_calls(self, records):
+        """
+        Prepares the API calls loading the heavy fields of the records that do not have them yet, by batches of
+          NODES_BATCH_SIZE ads (cf Graph API 'ids' param).
+
+        Yields:
+            Tuples (batch of records, session, request arguments to give to the session execute method).
+        """
+        heavy_fields = self.get_heavy_fields()
+        pending_records = [
+            record for record in records
+            if any(field not in record.keys() for field in heavy_fields)
+        ]
+        for k in range(0, len(pending_records), self.NODES_BATCH_SIZE):
+            batch = pending_records[k:k + self.NODES_BATCH_SIZE]
+            self.__num_requests_attempted += 1
+            session = self.__new_graph_session({
+                "ids": ",".join(str(record.get("id")) for record in batch),
+                "fields": ",".join(heavy_fields),
+            })
+            yield batch, session, {"method": "GET", "url": self.__ad_library.get_nodes_url()}
+
+    def merge_heavy_fields(self, batch, response):
+        """
+        Adds the heavy fields returned by the API to the records of the batch (None for the fields not returned).
+
+        Raises:
+            PlatformRequestError if the request failed.
+        """
+        response.raise_for_status()
+        nodes = response.json()
+        heavy_fields = self.get_heavy_fields()
+        for record in batch:
+            node = nodes.get(str(record.get("id"))) or {}
+            record.update({field: node.get(field) for field in heavy_fields})
+
+    def load_heavy_fields(self, records):
+        """
+        Loads in bulk the heavy fields of the records (only those that do not have them yet).
+
+        Args:
+            records: A list of records (typically the records kept after filtering a page on its light fields).
+
+        Returns:
+            The records (updated in place).
+        """
+        for batch, session, request_kwargs in self.prepare_heavy_fields_calls(records):
+            self.merge_heavy_fields(batch, self.process_response(self.execute(session, request_kwargs)))
+
+        return records
+
+    def new_cursor(self, response, checkpoint=None, page_size=None):
         """
-        Make an API call and iterate a cursor with the response.
+        Creates a new cursor (with its own session) from the response of a first API call.
+
+        Args:
+            response: The PlatformResponse of the first call.
+            checkpoint: The CursorCheckpoint used to save the progress of the cursor (if any).
+            page_size: The AdaptivePageSize object used by the cursor (if any).
+            (The cursor also uses the CrawlState loaded by load_crawl_state, if any.)
+
+        Returns:
+            A new cursor object (of class CURSOR_CLASS).
+
+        Raises:
+            PlatformRequestError if the first call failed (the checkpoint and the crawl state are left untouched).
         """
+        response.raise_for_status()
 
-        response = self.call()
         self.__cursor_sessions.append(self.__sdk_session.duplicate())
-        results = ResultCursor(
+        results = self.CURSOR_CLASS(
             api=self,
             ad_downloader=self.__ad_downloader,
             cursor_num=len(self.__cursor_sessions)-1,
-            response=response.json()
+            response=response.json(),
+            checkpoint=checkpoint,
+            page_size=page_size,
+            record_parser=self.get_record_parser(),
+            crawl_state=self.__crawl_state,
+            **self.__cursor_options
         )
 
         return results
 
+    def prepare_batch_calls(self, payloads):
+        """
+        Prepares Graph API batch requests querying the first page of each payload (BATCH_SIZE queries per request).
+        Payloads are all validated (by creating their library, cf new_library) before any request is made.
+
+        Returns:
+            A generator of tuples (libraries, page sizes, session, request arguments), one for each batch request
+              (each batch request has its own session).
+        """
+        libraries = [self.new_library(payload) for payload in payloads]
+        return self.__iter_batch_calls(libraries)
+
+    def __iter_batch_calls(self, libraries):
+        """ [Hidden method]
+        Yields the batch requests prepared for the libraries (cf prepare_batch_calls).
+        """
+        for k in range(0, len(libraries), self.BATCH_SIZE):
+            batch_libraries = libraries[k:k + self.BATCH_SIZE]
+            page_sizes = [library.get_page_size() for library in batch_libraries]
+            batch_requests = []
+            for library, page_size in zip(batch_libraries, page_sizes):
+                # Prepare the library main session: its cursor will go on with the pagination
+                library.load_crawl_state()
+                library.prepare_call()
+                query_string = library.get_compiled_query().get_query_string(
+                    {"limit": page_size.get_limit()} if page_size else None
+                )
+                batch_requests.append({
+                    "method": library.get_http_method(),
+                    "relative_url": f"{self.__ad_library.get_relative_url()}?{query_string}",
+                })
+            self.__num_requests_attempted += 1
+            session = self.__new_graph_session({
+                "batch": json.dumps(batch_requests, separators=(",", ":")),
+                "include_headers": "false",
+            })
+            request_kwargs = {"method": "POST", "url": self.__ad_library.get_batch_url()}
+            yield batch_libraries, page_sizes, session, request_kwargs
+
+    @staticmethod
+    def split_batch_response(libraries, response):
+        """
+        Splits the response of a batch request into a PlatformResponse for each library.
+
+        Returns:
+            A list of PlatformResponse objects (None for the queries that Meta did not process, which must be queried
+              again on their own).
+
+        Raises:
+            PlatformRequestError if the batch request itself failed.
+        """
+        response.raise_for_status()
+        items = response.json()
+        responses = []
+        for library, item in zip(libraries, items):
+            if not item:
+                responses.append(None)
+                continue
+            responses.append(PlatformResponse(
+                body=item.get("body"),
+                headers={header.get("name"): header.get("value") for header in item.get("headers") or []},
+                http_status=item.get("code"),
+                call={
+                    'method': library.get_http_method(),
+                    'path': library.get_ad_library().get_final_url(),
+                    'params': library.get_session().get_params(),
+                    'headers': library.get_session().get_headers(),
+                }
+            ))
+
+        return responses
+
+    def get_batch_item_delay(self, response, page_size=None):
+        """
+        Decides whether the query of a batch item that failed is made again on its own (cf get_batch_results): after a
+          transient error (cf get_retry_delay), or with a lower limit when the API asks to reduce the amount of data
+          (cf AdaptivePageSize).
+
+        Args:
+            response: The PlatformResponse of the batch item.
+            page_size: The AdaptivePageSize object of the query (if any).
+
+        Returns:
+            The delay (in seconds) to wait before making the query again, None if its error is permanent.
+
+        Raises:
+            PlatformRequestError if the API still asks to reduce the amount of data at the minimum limit.
+        """
+        if page_size and page_size.update(response, 0):
+            return 0
+
+        return self.get_retry_delay(response, 0)
+
+    def get_batch_results(self, payloads):
+        """
+        Queries the first page of several payloads with Graph API batch requests (instead of one request per payload)
+          and creates a cursor for each of them: each cursor then queries its next pages on its own.
+        The queries that Meta did not process, or that failed with a transient error, are made again on their own
+          (cf get_batch_item_delay).
+
+        Args:
+            payloads: A list of payloads (same format as the payload given to init).
+
+        Returns:
+            A list of cursors (in the order of the payloads).
+
+        Raises:
+            PlatformRequestError if the query of a payload failed with a permanent error.
+        """
+        cursors = []
+        for libraries, page_sizes, session, request_kwargs in self.prepare_batch_calls(payloads):
+            responses = self.split_batch_response(libraries, self.process_response(self.execute(session, request_kwargs)))
+            for library, page_size, response in zip(libraries, page_sizes, responses):
+                if response is not None and response.is_failure():
+                    delay = library.get_batch_item_delay(response, page_size)
+                    if delay is not None:
+                        time.sleep(delay)
+                        response = None
+                if response is None:
+                    response = library.call(page_size=page_size)
+                cursors.append(library.new_cursor(response, page_size=page_size))
+
+        return cursors
+
+    def get_results(self):
+        """
+        Make an API call and iterate a cursor with the response (resuming from the checkpoint if any).
+        """
+
+        checkpoint = self.get_checkpoint()
+        page_size = self.get_page_size()
+        self.load_crawl_state()
+        response = self.call(self.get_first_page_session(checkpoint), page_size)
+
+        return self.new_cursor(response, checkpoint, page_size)
+
 
 class ResultCursor:
     """
     Cursor is a cursor over an object's connections.
+
+    Records can be consumed one by one (iterating the cursor or using iter_records()) or page by page (iter_pages()).
+    In both cases the next page is requested only once the previous one has been handed over, so that the memory
+      used by the cursor stays bounded by the size of a page whatever the size of the result set.
+
+    With prefetch_pages > 0, the next pages are fetched in a background thread while the current one is consumed
+      (at most prefetch_pages pages are stored in advance).
+
+    With download_workers > 0 (and an ad_downloader), API pages and ad elements downloads are decoupled by a
+      DownloadPipeline running in a background event loop: records are handed over as soon as their ad elements are
+      downloaded (not in the API order) and at most download_queue_size batches wait for download.
+
+    With a checkpoint, the progress of the cursor is saved at page boundaries, while records are handed over (cf
+      CursorCheckpoint.SAVE_EVERY and SAVE_INTERVAL) and when the cursor is closed. When the checkpoint was resumed,
+      the response is the page stored in the checkpoint and its records already handed over are skipped.
+      A page whose call failed raises a PlatformRequestError (the checkpoint is kept to resume from that page).
+
+    With a page_size (AdaptivePageSize object), the 'limit' param of each request is adapted to the weight of the
+      pages (cf get_page_sizes()).
+
+    With a record_parser, each row of the API is turned into a record by record_parser(**row) (default: ObjectParser).
+      When the library loads heavy fields lazily, records are LazyObjectParser objects: filter them on their light
+      fields and call load_heavy_fields() on those kept to load their heavy fields in bulk.
+
+    With a crawl_state (CrawlState object), only the new or changed ads are handed over and the state is saved once
+      the last page was read (never after an error: the next run then hands over the ads of this one again).
+
+    With stream_pages, the next pages (after the first one) are parsed while they are received (cf JsonPageStream):
+      iter_records() hands over each record as soon as its row is parsed and the body of a page is never held as a
+      whole. Pages are not streamed when they are prefetched or handed over by a download pipeline. A streamed page
+      keeps its slot of the request limiter (cf NangaAdLibrary.execute_stream) until it is read or the cursor closed.
     """
 
-    def __init__(self, api, cursor_num, ad_downloader=None, response=None):
+    def __init__(
+        self, api, cursor_num, ad_downloader=None, response=None,
+        prefetch_pages=None, download_workers=None, download_queue_size=None, checkpoint=None, page_size=None,
+        record_parser=None, crawl_state=None, stream_pages=None
+    ):
         """
         Initializes a cursor with a PlatformResponse
         """
         self.__api = api
         self.__cursor_num = cursor_num
         self.__ad_downloader = ad_downloader
-        self.__queue = []
+        self.__queue = deque()
         self.__after_token = None
-        self.__process_new_response(response)
+        self.__prefetch_pages = prefetch_pages or 0
+        self.__prefetcher = None
+        self.__pipeline = None
+        self.__pipeline_loop = None
+        self.__checkpoint = checkpoint
+        self.__page_size = page_size
+        self.__record_parser = record_parser or ObjectParser
+        self.__crawl_state = crawl_state
+        self.__stream_pages = stream_pages or False
+        # Whether records were lost by an error (the crawl state is then not saved)
+        self.__failed = False
+        self.__page_stream = None
+        # Streamed pages are read as a whole when their records load their heavy fields lazily: the loading request
+        #   would otherwise wait for the request limiter slot kept by the page being streamed (cf execute_stream)
+        self.__read_whole_pages = bool(ad_downloader or api.get_heavy_fields())
+        self.__fetch_next_page = partial(
+            self.__fetch_page, api, api.get_cursor_session(cursor_num), page_size, crawl_state
+        )
+        self.__stream_next_page = partial(
+            self.__stream_page, api, api.get_cursor_session(cursor_num), page_size
+        )
+        if crawl_state:
+            crawl_state.filter_response(response)
+        if self.__ad_downloader and download_workers:
+            self.__pipeline = DownloadPipeline(
+                fetch_page=self.__fetch_next_page,
+                ad_downloader=ad_downloader,
+                first_response=response,
+                workers=download_workers,
+                queue_size=download_queue_size,
+                blocking_fetch=True,
+                record_parser=self.__record_parser
+            )
+            self.__pipeline_loop = BackgroundEventLoop(name="nanga-download-pipeline")
+            self.__pipeline_loop.submit(self.__pipeline.run())
+        elif checkpoint:
+            if ad_downloader:
+                ad_downloader.load_state(checkpoint.get_downloader_state())
+            self.__process_new_response(response, checkpoint.get_resume_token(), checkpoint.get_resume_offset())
+        else:
+            self.__process_new_response(response)
+
+    def __del__(self):
+        self.close()
 
     def __repr__(self):
-        return str(self.__queue)
+        return str(list(self.__queue))
 
     def __len__(self):
         return len(self.__queue)
@@ -237,46 +1075,777 @@ class ResultCursor:
         if not self.__queue and not self.__load_next_page():
             raise StopIteration()
 
-        return self.__queue.pop(0)
+        record = self.__queue.popleft()
+        if self.__checkpoint:
+            self.__checkpoint.records_emitted()
+
+        return record
 
     def __getitem__(self, index):
         return self.__queue[index]
 
-    def __process_new_response(self, response):
+    def get_page_sizes(self):
+        """
+        Returns the page sizes requested by the cursor (cf AdaptivePageSize.get_history), None if not adaptive.
+        """
+        return self.__page_size.get_history() if self.__page_size else None
+
+    def load_heavy_fields(self, records=None):
+        """
+        Loads in bulk the heavy fields of some records (cf NangaAdLibrary.load_heavy_fields).
+
+        Args:
+            records: The records to complete (default: the records currently stored in the cursor).
+
+        Returns:
+            The records (updated in place).
+        """
+        return self.__api.load_heavy_fields(list(self.__queue) if records is None else records)
+
+    def close(self):
+        """
+        Stops prefetching pages, streaming the current page and downloading (if any): the records already in the cursor
+          can still be read. The progress of the cursor is saved in its checkpoint (if any).
+        """
+        if self.__checkpoint:
+            self.__checkpoint.flush()
+        if self.__page_stream:
+            self.__page_stream.close()
+            self.__page_stream = None
+        if self.__prefetcher:
+            self.__prefetcher.stop()
+            self.__prefetcher = None
+        if self.__pipeline_loop:
+            self.__pipeline_loop.stop()
+            self.__pipeline, self.__pipeline_loop = None, None
+
+    def iter_records(self):
+        """
+        Stream the records of the cursor one by one.
+        Each record is dropped from the cursor as soon as it is yielded and new pages are loaded only when needed.
+
+        Yields:
+            The records (ObjectParser objects) of the cursor.
+        """
+        while self.__queue or self.__load_next_page():
+            record = self.__queue.popleft()
+            if self.__checkpoint:
+                self.__checkpoint.records_emitted()
+            yield record
+
+    def iter_pages(self):
+        """
+        Stream the records of the cursor page by page.
+        Each page is removed from the cursor when it is yielded: the cursor never keeps more than one page in memory.
+
+        Yields:
+            Lists of records (ObjectParser objects), one list for each page returned by the API.
+        """
+        while self.__queue or self.__load_next_page(whole_page=True):
+            if self.__page_stream:
+                self.__read_page_stream(whole_page=True)
+            page = list(self.__queue)
+            self.__queue.clear()
+            if self.__checkpoint:
+                self.__checkpoint.records_emitted(len(page))
+            yield page
+
+    def iter_record_batches(self, batch_size=None):
+        """
+        Stream the records of the cursor as columnar batches, built page by page (cf ArrowBatchBuilder).
+
+        Args:
+            batch_size: Number of records of each batch (default: one batch per page).
+
+        Yields:
+            pyarrow.RecordBatch objects.
+        """
+        builder = ArrowBatchBuilder(batch_size)
+        for page in self.iter_pages():
+            yield from builder.add(page)
+        yield from builder.flush()
+
+    def to_arrow(self, batch_size=None):
+        """
+        Returns all the records of the cursor as a pyarrow.Table (cf iter_record_batches).
+        """
+        return ArrowBatchBuilder.concat(list(self.iter_record_batches(batch_size)))
+
+    def to_pandas(self, batch_size=None, **kwargs):
+        """
+        Returns all the records of the cursor as a pandas.DataFrame, converted from to_arrow() (kwargs are given to
+          pyarrow.Table.to_pandas).
+        """
+        return self.to_arrow(batch_size).to_pandas(**kwargs)
+
+    def write_to(self, sink):
+        """
+        Stream the records of the cursor page by page into a sink (NdjsonSink, CsvSink, ParquetSink, ...): the files
+          are written by the background thread of the sink while the next pages are requested.
+        The sink is not closed (several cursors can write into the same sink).
+
+        Returns:
+            The number of records handed over to the sink.
+        """
+        num_records = 0
+        for page in self.iter_pages():
+            sink.write_page(page)
+            num_records += len(page)
+
+        return num_records
+
+    def __process_new_response(self, response, page_token=None, offset=0):
         """ [Hidden method]
         Add new API response to the cursor queue (first download and add to response ad elements if needed).
         Stores the "after_token" (if any) to be able to query the following records from API.
+
+        Args:
+            response: The json response of the API.
+            page_token: The 'after' token used to query this page (saved in the checkpoint).
+            offset: Number of records of the page to skip (already handed over before resuming a checkpoint).
         """
         if "data" in response:
-            new_batch = [ObjectParser(**row) for row in response["data"]]
+            new_batch = [self.__record_parser(**row) for row in response["data"][offset:]]
+            LazyObjectParser.group(new_batch)
             if self.__ad_downloader:
-                new_batch = asyncio.run(self.__ad_downloader.download_from_new_batch(new_batch))
-            self.__queue += new_batch
-        if (
-                'paging' in response and
-                'cursors' in response['paging'] and
-                'after' in response['paging']['cursors'] and
-                'next' in response['paging']
-        ):
-            self.__after_token = response["paging"]["cursors"]["after"]
+                new_batch = self.__ad_downloader.download_batch(new_batch)
+            self.__queue.extend(new_batch)
+        self.__after_token = extract_after_token(response)
+        if self.__checkpoint:
+            downloader_state = self.__ad_downloader.get_state() if self.__ad_downloader else None
+            self.__checkpoint.start_page(page_token, offset, downloader_state)
+
+    @staticmethod
+    def __fetch_page(api, session, page_size, crawl_state, after_token):
+        """ [Hidden method]
+        Queries the page matching after_token using the cursor session (and the AdaptivePageSize object if any).
+
+        Returns:
+            The json response of the API (without the ads that did not change if a CrawlState is provided).
+
+        Raises:
+            PlatformRequestError if the call failed (a failed page is never read as the last one).
+        """
+        session.update_params({"after": after_token})
+        response = api.call(session, page_size)
+        response.raise_for_status()
+        response = response.json()
+
+        return crawl_state.filter_response(response) if crawl_state else response
+
+    @staticmethod
+    def __stream_page(api, session, page_size, after_token):
+        """ [Hidden method]
+        Queries the page matching after_token using the cursor session, parsing its rows while they are received.
+
+        Returns:
+            A JsonPageStream object (or the json response of the API if the page was not streamed).
+
+        Raises:
+            PlatformRequestError if the call failed.
+        """
+        session.update_params({"after": after_token})
+        response = api.call(session, page_size, stream=True)
+        if isinstance(response, JsonPageStream):
+            return response
+        response.raise_for_status()
+
+        return response.json()
+
+    def __read_page_stream(self, whole_page=False):
+        """ [Hidden method]
+        Parses the next row (or all the remaining rows) of the page being streamed and adds its record to the queue
+          (the whole page when ad elements are downloaded or heavy fields are loaded lazily). Stores the "after_token"
+          once the page is over.
+        """
+        if whole_page or self.__read_whole_pages:
+            rows = list(self.__page_stream)
         else:
-            self.__after_token = None
+            rows = list(islice(self.__page_stream, 1))
+        if self.__crawl_state:
+            rows = self.__crawl_state.filter_rows(rows)
+        new_batch = [self.__record_parser(**row) for row in rows]
+        LazyObjectParser.group(new_batch)
+        if self.__ad_downloader and new_batch:
+            new_batch = self.__ad_downloader.download_batch(new_batch)
+        self.__queue.extend(new_batch)
+        if self.__page_stream.is_over():
+            self.__after_token = extract_after_token(self.__page_stream.get_envelope())
+            self.__page_stream = None
 
-    def __load_next_page(self):
+    def __load_next_page(self, whole_page=False):
         """ [Hidden method]
         Queries server for more nodes and loads them into the internal queue.
 
+        Args:
+            whole_page: Whether a streamed page is read as a whole (else its records are loaded one by one).
+
         Returns:
             True if successful, else False.
         """
+        # Save the records of the current page handed over (before querying the next one)
+        if self.__checkpoint:
+            self.__checkpoint.flush()
 
-        if not self.__after_token:
-            return False
+        # Wait for the next downloaded records from the pipeline (if any)
+        if self.__pipeline:
+            try:
+                records = self.__pipeline_loop.run(self.__pipeline.next_records())
+            except Exception:
+                # The records of the failed page or batch are lost: the pipeline cannot complete the cursor
+                self.__failed = True
+                # Stop the pipeline (no more pages are queried nor ads downloaded)
+                self.close()
+                raise
+            if not records:
+                self.close()
+                self.__complete()
+            self.__queue.extend(records)
+            return len(self.__queue) > 0
+
+        # Skip the pages without records (all their ads may have been filtered out by the crawl state)
+        while not self.__queue:
+            # Go on reading the page being streamed (if any)
+            if self.__page_stream:
+                self.__read_page_stream(whole_page)
+                continue
+
+            if not self.__after_token:
+                self.__complete()
+                return False
+
+            if self.__stream_pages and not self.__prefetch_pages:
+                response = self.__stream_next_page(self.__after_token)
+                if isinstance(response, JsonPageStream):
+                    self.__start_page_stream(response, self.__after_token)
+                    continue
+            elif self.__prefetch_pages:
+                # Start (or restart after a failure) prefetching pages from the current 'after' token
+                if not (self.__prefetcher and self.__prefetcher.is_alive()):
+                    self.__prefetcher = PagePrefetcher(
+                        self.__fetch_next_page, self.__after_token, self.__prefetch_pages
+                    )
+                try:
+                    response = self.__prefetcher.next_response()
+                except Exception:
+                    self.close()
+                    raise
+            else:
+                response = self.__fetch_next_page(self.__after_token)
+            self.__process_new_response(response, self.__after_token)
+
+        return True
+
+    def __start_page_stream(self, page_stream, page_token):
+        """ [Hidden method]
+        Starts reading a streamed page (its "after_token" is known once the page is over).
+        """
+        self.__page_stream = page_stream
+        self.__after_token = None
+        if self.__checkpoint:
+            downloader_state = self.__ad_downloader.get_state() if self.__ad_downloader else None
+            self.__checkpoint.start_page(page_token, 0, downloader_state)
+
+    def __complete(self):
+        """ [Hidden method]
+        The cursor is over (its last page was read successfully): remove the checkpoint and save the crawl state (if
+          any). Nothing is saved if records were lost by an error.
+        """
+        if self.__failed:
+            return
+        if self.__checkpoint:
+            self.__checkpoint.complete()
+        if self.__crawl_state:
+            self.__crawl_state.complete()
+            self.__crawl_state = None
+
+
+class AsyncNangaAdLibrary(NangaAdLibrary):
+    """
+    Asyncio counterpart of NangaAdLibrary: API calls are made with an httpx.AsyncClient (whose connection pool is
+      shared by all the cursors of the library) and ad elements are downloaded in the running event loop.
+        Usage example:
+            >>> async with AsyncNangaAdLibrary.init(platform="meta", **kwargs) as library:
+            >>>     cursor = await library.get_results()
+            >>>     async for record in cursor:
+            >>>         print(record.get("id"))
+
+    Several libraries can share the same connection pool by providing the same httpx.AsyncClient
+      (argument "http_client" of init).
+    """
+
+    SESSION_CLASSES = {
+        "meta": AsyncMetaGraphAPISession
+    }
+
+    # Async cursors do not stream their pages
+    CURSOR_OPTIONS = [option for option in NangaAdLibrary.CURSOR_OPTIONS if option != "stream_pages"]
+
+    async def __aenter__(self):
+        # Open connections in advance (if "warm_up_connections" was provided to init)
+        if self.get_session().get_warm_up_connections():
+            await self.get_session().warm_up(self.get_ad_library().get_batch_url())
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Closes the http client of the library (only if it was created by the library) and its downloader (cf close).
+        """
+        await self.get_session().aclose()
+        if self.get_ad_downloader():
+            await asyncio.to_thread(self.close)
+
+    @classmethod
+    def run_many(cls, platform, payloads, max_concurrency=None, **kwargs):
+        """
+        Runs several queries concurrently in the running event loop (cf NangaAdLibrary.run_many): all the queries
+          share the same httpx client.
+            Usage example:
+                >>> async for payload, page in AsyncNangaAdLibrary.run_many("meta", payloads, **kwargs):
+                >>>     print(payload.get("search_terms"), len(page))
+
+        Returns:
+            An async generator of tuples (payload, list of records), in the order the pages arrive.
+        """
+        libraries = cls.prepare_many(platform, payloads, max_concurrency, **kwargs)
+        runner = AsyncQueryRunner(libraries, max_concurrency or cls.DEFAULT_MAX_CONCURRENCY)
+
+        return cls.__iter_many(payloads, libraries, runner)
+
+    @staticmethod
+    async def __iter_many(payloads, libraries, runner):
+        """ [Hidden method]
+        Hands over the pages of the runner and closes the http client (and the downloader) of the queries once they are
+          over.
+        """
+        pages = runner.iter_pages()
+        try:
+            async for rank, page in pages:
+                yield payloads[rank], page
+        finally:
+            await pages.aclose()
+            if libraries:
+                await libraries[0].aclose()
+
+    @staticmethod
+    def new_request_limiter(max_concurrency):
+        """Returns the object limiting the number of concurrent requests (used as an async context manager)."""
+        return asyncio.Semaphore(max_concurrency)
+
+    async def execute(self, session, request_kwargs):
+        """
+        Makes a request with a session (waiting for the request limiter if any).
+
+        Returns:
+            The http response returned by the session execute method.
+        """
+        async with self.get_request_limiter() or nullcontext():
+            return await session.execute(**request_kwargs)
+
+    async def call(self, session=None, page_size=None):
+        """
+        Makes an API call using a session and an ad_library object (cf NangaAdLibrary.call)
+
+        Returns:
+            A PlatformResponse object.
+        """
+
+        # Get request response and encapsulate it in a PlatformResponse
+        session, request_kwargs = self.prepare_call(session)
+        if page_size:
+            session.update_params({"limit": page_size.get_limit()})
+        retries, delay = 0, None
+        while True:
+            start_time = time.monotonic()
+            response = self.process_response(await self.execute(session, request_kwargs))
+
+            # Request the same page again with a lower limit if needed
+            if self.reduce_page_size(session, page_size, response, time.monotonic() - start_time):
+                continue
+
+            # Request the same page again after a transient error
+            delay = self.get_retry_delay(response, retries, delay)
+            if delay is None:
+                return response
+            retries += 1
+            await asyncio.sleep(delay)
+
+    def get_record_parser(self):
+        """
+        Heavy fields cannot be loaded when they are accessed (it would block the event loop): records are always
+          ObjectParser (or CompactObjectParser) objects and heavy fields are loaded with load_heavy_fields().
+        """
+        return self.get_object_parser()
+
+    async def load_heavy_fields(self, records):
+        """
+        Loads in bulk the heavy fields of the records (cf NangaAdLibrary.load_heavy_fields).
+
+        Returns:
+            The records (updated in place).
+        """
+        for batch, session, request_kwargs in self.prepare_heavy_fields_calls(records):
+            self.merge_heavy_fields(batch, self.process_response(await self.execute(session, request_kwargs)))
+
+        return records
+
+    async def get_batch_results(self, payloads):
+        """
+        Queries the first page of several payloads with Graph API batch requests and creates an async cursor for each
+          of them (cf NangaAdLibrary.get_batch_results).
+
+        Returns:
+            A list of async cursors (in the order of the payloads).
+
+        Raises:
+            PlatformRequestError if the query of a payload failed with a permanent error.
+        """
+        cursors = []
+        for libraries, page_sizes, session, request_kwargs in self.prepare_batch_calls(payloads):
+            response = self.process_response(await self.execute(session, request_kwargs))
+            responses = self.split_batch_response(libraries, response)
+            for library, page_size, response in zip(libraries, page_sizes, responses):
+                if response is not None and response.is_failure():
+                    delay = library.get_batch_item_delay(response, page_size)
+                    if delay is not None:
+                        await asyncio.sleep(delay)
+                        response = None
+                if response is None:
+                    response = await library.call(page_size=page_size)
+                cursor = library.new_cursor(response, page_size=page_size)
+                await cursor.load()
+                cursors.append(cursor)
+
+        return cursors
+
+    async def get_results(self):
+        """
+        Make an API call and iterate an async cursor with the response.
+        """
+
+        checkpoint = self.get_checkpoint()
+        page_size = self.get_page_size()
+        self.load_crawl_state()
+        response = await self.call(self.get_first_page_session(checkpoint), page_size)
+        cursor = self.new_cursor(response, checkpoint, page_size)
+        await cursor.load()
+
+        return cursor
+
+
+class AsyncResultCursor:
+    """
+    Asyncio counterpart of ResultCursor, to iterate with "async for".
+
+    The first page is processed by load() (called by AsyncNangaAdLibrary.get_results).
+    With prefetch_pages > 0, the next pages are fetched in a background task while the current one is consumed.
+    With download_workers > 0 (and an ad_downloader), a DownloadPipeline runs in a background task (cf ResultCursor).
+    With a checkpoint, the progress of the cursor is saved at page boundaries and regularly (cf ResultCursor).
+    With a page_size, the 'limit' param of each request is adapted to the weight of the pages (cf ResultCursor).
+    With a record_parser, each row of the API is turned into a record by record_parser(**row) (cf ResultCursor).
+    With a crawl_state, only the new or changed ads are handed over (cf ResultCursor).
+    """
+
+    def __init__(
+        self, api, cursor_num, ad_downloader=None, response=None,
+        prefetch_pages=None, download_workers=None, download_queue_size=None, checkpoint=None, page_size=None,
+        record_parser=None, crawl_state=None
+    ):
+        """
+        Initializes a cursor with a PlatformResponse (processed when calling load())
+        """
+        self.__api = api
+        self.__cursor_num = cursor_num
+        self.__ad_downloader = ad_downloader
+        self.__queue = deque()
+        self.__after_token = None
+        self.__pending_response = response
+        self.__prefetch_pages = prefetch_pages or 0
+        self.__prefetch_task = None
+        self.__prefetch_queue = None
+        self.__pipeline = None
+        self.__pipeline_task = None
+        self.__checkpoint = checkpoint
+        self.__page_size = page_size
+        self.__record_parser = record_parser or ObjectParser
+        self.__crawl_state = crawl_state
+        self.__failed = False
+        self.__fetch_next_page = partial(
+            self.__fetch_page, api, api.get_cursor_session(cursor_num), page_size, crawl_state
+        )
+        if crawl_state:
+            crawl_state.filter_response(response)
+        if self.__ad_downloader and download_workers:
+            self.__pipeline = DownloadPipeline(
+                fetch_page=self.__fetch_next_page,
+                ad_downloader=ad_downloader,
+                first_response=response,
+                workers=download_workers,
+                queue_size=download_queue_size,
+                record_parser=self.__record_parser
+            )
+            self.__pending_response = None
+        elif checkpoint and ad_downloader:
+            ad_downloader.load_state(checkpoint.get_downloader_state())
+
+    def __repr__(self):
+        return str(list(self.__queue))
+
+    def __len__(self):
+        return len(self.__queue)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.__queue and not await self.__load_next_page():
+            raise StopAsyncIteration()
+
+        record = self.__queue.popleft()
+        if self.__checkpoint:
+            self.__checkpoint.records_emitted()
+
+        return record
+
+    def __getitem__(self, index):
+        return self.__queue[index]
+
+    async def load(self):
+        """Processes the first response of the cursor (or starts the download pipeline)."""
+        if self.__pipeline and not self.__pipeline_task:
+            self.__pipeline_task = asyncio.create_task(self.__pipeline.run())
+        elif self.__pending_response is not None:
+            response, self.__pending_response = self.__pending_response, None
+            if self.__checkpoint:
+                checkpoint = self.__checkpoint
+                await self.__process_new_response(
+                    response, checkpoint.get_resume_token(), checkpoint.get_resume_offset()
+                )
+            else:
+                await self.__process_new_response(response)
+
+    def get_page_sizes(self):
+        """
+        Returns the page sizes requested by the cursor (cf AdaptivePageSize.get_history), None if not adaptive.
+        """
+        return self.__page_size.get_history() if self.__page_size else None
+
+    async def load_heavy_fields(self, records=None):
+        """
+        Loads in bulk the heavy fields of some records (cf AsyncNangaAdLibrary.load_heavy_fields).
+
+        Args:
+            records: The records to complete (default: the records currently stored in the cursor).
+
+        Returns:
+            The records (updated in place).
+        """
+        return await self.__api.load_heavy_fields(list(self.__queue) if records is None else records)
+
+    def close(self):
+        """
+        Stops prefetching pages and downloading (if any): the records already in the cursor can still be read. The
+          progress of the cursor is saved in its checkpoint (if any).
+        """
+        if self.__checkpoint:
+            self.__checkpoint.flush()
+        if self.__prefetch_task:
+            self.__prefetch_task.cancel()
+            self.__prefetch_task, self.__prefetch_queue = None, None
+        if self.__pipeline_task:
+            self.__pipeline_task.cancel()
+            self.__pipeline, self.__pipeline_task = None, None
+
+    async def iter_records(self):
+        """
+        Stream the records of the cursor one by one (cf ResultCursor.iter_records).
+
+        Yields:
+            The records (ObjectParser objects) of the cursor.
+        """
+        while self.__queue or await self.__load_next_page():
+            record = self.__queue.popleft()
+            if self.__checkpoint:
+                self.__checkpoint.records_emitted()
+            yield record
+
+    async def iter_pages(self):
+        """
+        Stream the records of the cursor page by page (cf ResultCursor.iter_pages).
+
+        Yields:
+            Lists of records (ObjectParser objects), one list for each page returned by the API.
+        """
+        while self.__queue or await self.__load_next_page():
+            page = list(self.__queue)
+            self.__queue.clear()
+            if self.__checkpoint:
+                self.__checkpoint.records_emitted(len(page))
+            yield page
+
+    async def iter_record_batches(self, batch_size=None):
+        """
+        Stream the records of the cursor as columnar batches (cf ResultCursor.iter_record_batches).
+
+        Yields:
+            pyarrow.RecordBatch objects.
+        """
+        builder = ArrowBatchBuilder(batch_size)
+        async for page in self.iter_pages():
+            for batch in builder.add(page):
+                yield batch
+        for batch in builder.flush():
+            yield batch
+
+    async def to_arrow(self, batch_size=None):
+        """
+        Returns all the records of the cursor as a pyarrow.Table (cf ResultCursor.to_arrow).
+        """
+        return ArrowBatchBuilder.concat([batch async for batch in self.iter_record_batches(batch_size)])
+
+    async def to_pandas(self, batch_size=None, **kwargs):
+        """
+        Returns all the records of the cursor as a pandas.DataFrame (cf ResultCursor.to_pandas).
+        """
+        return (await self.to_arrow(batch_size)).to_pandas(**kwargs)
+
+    async def write_to(self, sink):
+        """
+        Stream the records of the cursor page by page into a sink (cf ResultCursor.write_to): handing a page over is
+          done in a thread as it waits when the queue of the sink is full.
+
+        Returns:
+            The number of records handed over to the sink.
+        """
+        num_records = 0
+        async for page in self.iter_pages():
+            await asyncio.to_thread(sink.write_page, page)
+            num_records += len(page)
+
+        return num_records
+
+    async def __process_new_response(self, response, page_token=None, offset=0):
+        """ [Hidden method]
+        Add new API response to the cursor queue (first download and add to response ad elements if needed).
+        Stores the "after_token" (if any) to be able to query the following records from API.
+        (cf ResultCursor.__process_new_response)
+        """
+        if "data" in response:
+            new_batch = [self.__record_parser(**row) for row in response["data"][offset:]]
+            LazyObjectParser.group(new_batch)
+            if self.__ad_downloader:
+                new_batch = await self.__ad_downloader.download_from_new_batch(new_batch)
+            self.__queue.extend(new_batch)
+        self.__after_token = extract_after_token(response)
+        if self.__checkpoint:
+            downloader_state = self.__ad_downloader.get_state() if self.__ad_downloader else None
+            self.__checkpoint.start_page(page_token, offset, downloader_state)
+
+    @staticmethod
+    async def __fetch_page(api, session, page_size, crawl_state, after_token):
+        """ [Hidden method]
+        Queries the page matching after_token using the cursor session (and the AdaptivePageSize object if any).
+
+        Returns:
+            The json response of the API (without the ads that did not change if a CrawlState is provided).
+
+        Raises:
+            PlatformRequestError if the call failed (cf ResultCursor.__fetch_page).
+        """
+        session.update_params({"after": after_token})
+        response = await api.call(session, page_size)
+        response.raise_for_status()
+        response = response.json()
+
+        return crawl_state.filter_response(response) if crawl_state else response
+
+    @staticmethod
+    async def __prefetch(fetch_page, after_token, responses):
+        """ [Hidden method]
+        Background task: query the next pages one after another and store them (or the error met) in responses.
+        """
+        while after_token:
+            try:
+                response = await fetch_page(after_token)
+            except Exception as error:
+                await responses.put(error)
+                return
+            after_token = extract_after_token(response)
+            await responses.put(response)
+
+    async def __load_next_page(self):
+        """ [Hidden method]
+        Queries server for more nodes and loads them into the internal queue.
+
+        Returns:
+            True if successful, else False.
+        """
+        # Save the records of the current page handed over (before querying the next one)
+        if self.__checkpoint:
+            self.__checkpoint.flush()
+
+        # Process the first response if load() was not called
+        if self.__pending_response is not None or (self.__pipeline and not self.__pipeline_task):
+            await self.load()
+            if self.__queue:
+                return True
+
+        # Wait for the next downloaded records from the pipeline (if any)
+        if self.__pipeline:
+            try:
+                records = await self.__pipeline.next_records()
+            except Exception:
+                # The records of the failed page or batch are lost: the pipeline cannot complete the cursor
+                self.__failed = True
+                # Stop the pipeline (no more pages are queried nor ads downloaded)
+                self.close()
+                raise
+            if not records:
+                self.close()
+                self.__complete()
+            self.__queue.extend(records)
+            return len(self.__queue) > 0
+
+        # Skip the pages without records (all their ads may have been filtered out by the crawl state)
+        while not self.__queue:
+            if not self.__after_token:
+                self.__complete()
+                return False
+
+            if self.__prefetch_pages:
+                # Start (or restart after a failure) prefetching pages from the current 'after' token
+                if not self.__prefetch_task or (self.__prefetch_task.done() and self.__prefetch_queue.empty()):
+                    self.__prefetch_queue = asyncio.Queue(maxsize=self.__prefetch_pages)
+                    self.__prefetch_task = asyncio.create_task(
+                        self.__prefetch(self.__fetch_next_page, self.__after_token, self.__prefetch_queue)
+                    )
+                response = await self.__prefetch_queue.get()
+                if isinstance(response, Exception):
+                    self.close()
+                    raise response
+            else:
+                response = await self.__fetch_next_page(self.__after_token)
+            await self.__process_new_response(response, self.__after_token)
+
+        return True
+
+    def __complete(self):
+        """ [Hidden method]
+        The cursor is over (its last page was read successfully): remove the checkpoint and save the crawl state (if
+          any). Nothing is saved if records were lost by an error.
+        """
+        if self.__failed:
+            return
+        if self.__checkpoint:
+            self.__checkpoint.complete()
+        if self.__crawl_state:
+            self.__crawl_state.complete()
+            self.__crawl_state = None
 
-        session = self.__api.get_cursor_session(self.__cursor_num)
-        if session:
-            session.update_params({"after": self.__after_token})
-            platform_response = self.__api.call(session)
-            self.__process_new_response(platform_response.json())
 
-        return len(self.__queue) > 0
+# Cursor classes are defined after the library classes
+NangaAdLibrary.CURSOR_CLASS = ResultCursor
+AsyncNangaAdLibrary.CURSOR_CLASS = AsyncResultCursor
@@ -1,11 +1,26 @@
+import time
+import socket
 import hashlib
 import hmac
+import asyncio
+import threading
 
 import requests
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 from requests.packages.urllib3.util.retry import Retry
+from requests.packages.urllib3.connection import HTTPConnection
 
 from enum import Enum
+from functools import partial
+
+from nanga_ad_library.utils.rate_limiter import UsageRateLimiter
+from nanga_ad_library.utils.response_cache import ResponseCache
+from nanga_ad_library.utils.request_coalescer import RequestCoalescer, AsyncRequestCoalescer
+from nanga_ad_library.utils.request_handler import get_request_key
+
+# Imported with the first async session (cf import_httpx): the sync API does not need it
+httpx = None
 
 """
 The purpose of the session module is to encapsulate authentication classes and utilities.
@@ -14,40 +29,105 @@ Based on Session module of Requests package (https://pypi.org/project/requests/)
 """
 
 
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter enabling TCP keep-alive on its connections, so that idle pooled connections are not silently dropped
+      by the network between two pages.
+    """
+
+    # Idle time and interval (in seconds) of the TCP keep-alive probes (when the platform supports them)
+    KEEP_ALIVE_IDLE = 60
+    KEEP_ALIVE_INTERVAL = 30
+
+    def init_poolmanager(self, *args, **kwargs):
+        socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.KEEP_ALIVE_IDLE))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.KEEP_ALIVE_INTERVAL))
+        kwargs["socket_options"] = socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
 class ApiSession(object):
+    """
+    Encapsulates a requests session.
+
+    Sessions created using duplicate() are lightweight overlays on the same transport: they only have their own params
+      and timeout, and share the requests session (headers, proxies, SSL config, retries and connection pool) of the
+      original session, which is in charge of closing it.
+    The rate limiter (if any) is shared with them too: each request waits for it and updates it with the response.
+    So is the response cache (if any): GET requests already answered (and not expired) are read from it, without
+      reaching the API nor the rate limiter.
+    With a request coalescer, identical GET requests (same url and params, access token included) made at the same
+      time by several sessions share the same in-flight call and its response if successful.
+    """
 
     DEFAULT_HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
     MAX_RETRIES = 5
     BACKOFF_FACTOR = 1
+    POOL_CONNECTIONS = 10
+    POOL_MAXSIZE = 10
+
+    # Methods whose responses can be read from the response cache or shared by identical in-flight requests
+    IDEMPOTENT_METHODS = ["GET"]
+
+    # Timeout (in seconds) of the requests opening connections in advance (cf warm_up)
+    WARM_UP_TIMEOUT = 10
 
     def __init__(
         self,
         cert_path=None, proxies=None, headers=None, params=None,
         max_retries=None, backoff_factor=None,
         timeout=None,
-        verbose=False
+        verbose=False,
+        pool_connections=None, pool_maxsize=None, keep_alive=True,
+        rate_limiter=None,
+        response_cache=None,
+        request_coalescer=None,
+        requests_session=None
     ):
         """
         Initializes a requests session
+
+        Args:
+            pool_connections: Number of hosts whose connection pool is kept.
+            pool_maxsize: Maximum number of connections kept open with each host (at least the number of requests
+                made concurrently with this session and its duplicates).
+            keep_alive: Whether to enable TCP keep-alive on the pooled connections.
+            rate_limiter: A UsageRateLimiter object delaying the requests when the usage of the API gets high.
+            response_cache: A ResponseCache object storing the responses of the GET requests.
+            request_coalescer: A RequestCoalescer object sharing the identical GET requests in flight.
+            requests_session: The requests session of another ApiSession to share (its settings are kept as is).
         """
 
-        # Initiate requests Session
-        self.__requests_session = requests.Session()
+        # Initiate requests Session (or share the one of another session)
+        self.__owns_requests_session = requests_session is None
+        self.__requests_session = requests_session or requests.Session()
         self.__params = params or {}
         self.__timeout = timeout
         self.__max_retries, self.__backoff_factor = None, None
+        self.__pool_connections = pool_connections or self.POOL_CONNECTIONS
+        self.__pool_maxsize = pool_maxsize or self.POOL_MAXSIZE
+        self.__keep_alive = keep_alive
+        self.__rate_limiter = rate_limiter
+        self.__response_cache = response_cache
+        self.__request_coalescer = request_coalescer
         self.__verbose = False
 
         # Update all needed session attributes
-        self.update_headers(
-            headers or self.DEFAULT_HEADERS
-        )
-        self.update_retries(
-            max_retries or self.MAX_RETRIES,
-            backoff_factor or self.BACKOFF_FACTOR
-        )
-        self.update_ssl_config(cert_path)
-        self.update_proxies(proxies)
+        if self.__owns_requests_session:
+            self.update_headers(
+                headers or self.DEFAULT_HEADERS
+            )
+            self.update_retries(
+                max_retries or self.MAX_RETRIES,
+                backoff_factor or self.BACKOFF_FACTOR
+            )
+            self.update_ssl_config(cert_path)
+            self.update_proxies(proxies)
+        else:
+            self.__max_retries, self.__backoff_factor = max_retries, backoff_factor
 
         # Print a message if verbose
         self.__verbose = verbose or False
@@ -56,7 +136,8 @@ class ApiSession(object):
     def __del__(self):
         if self.__verbose:
             print("API session object killed")
-        self.__requests_session.close()
+        if self.__owns_requests_session:
+            self.__requests_session.close()
         self.__dict__.clear()
 
     def __log_update(self, creation=False):
@@ -86,12 +167,51 @@ class ApiSession(object):
                 backoff_factor=backoff_factor,
                 status_forcelist=[500, 502, 503, 504]
             )
-            adapter = HTTPAdapter(max_retries=retries)
+            adapter_class = KeepAliveHTTPAdapter if self.__keep_alive else HTTPAdapter
+            adapter = adapter_class(
+                max_retries=retries,
+                pool_connections=self.__pool_connections,
+                pool_maxsize=self.__pool_maxsize
+            )
             self.__requests_session.mount("http://", adapter)
             self.__requests_session.mount("https://", adapter)
             self.__max_retries, self.__backoff_factor = max_retries, backoff_factor
             self.__log_update()
 
+    def get_pool_config(self):
+        return self.__pool_connections, self.__pool_maxsize, self.__keep_alive
+
+    def update_pool_config(self, pool_connections=None, pool_maxsize=None, keep_alive=None):
+        """
+        Mounts new adapters using the new connection pool settings (for all the sessions sharing the transport).
+        """
+        self.__pool_connections = pool_connections or self.__pool_connections
+        self.__pool_maxsize = pool_maxsize or self.__pool_maxsize
+        if keep_alive is not None:
+            self.__keep_alive = keep_alive
+        self.update_retries(self.__max_retries, self.__backoff_factor)
+
+    def warm_up(self, url, connections=1):
+        """
+        Opens connections with the host of url in advance (concurrently), so that the first calls reuse warm
+          connections (TLS handshakes already done). Errors are ignored.
+
+        Args:
+            url: An url of the host to connect to.
+            connections: Number of connections to open (at most pool_maxsize are kept).
+        """
+        def connect():
+            try:
+                self.__requests_session.head(url, timeout=self.WARM_UP_TIMEOUT)
+            except requests.RequestException:
+                pass
+
+        threads = [threading.Thread(target=connect, daemon=True) for _ in range(min(connections, self.__pool_maxsize))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
     def remove_retries(self):
         self.__requests_session.adapters.clear()
         self.__max_retries, self.__backoff_factor = None, None
@@ -135,6 +255,15 @@ class ApiSession(object):
     def get_timeout(self):
         return self.__timeout
 
+    def get_rate_limiter(self):
+        return self.__rate_limiter
+
+    def get_response_cache(self):
+        return self.__response_cache
+
+    def get_request_coalescer(self):
+        return self.__request_coalescer
+
     def update_timeout(self, timeout):
         if timeout:
             self.__timeout = timeout
@@ -154,14 +283,29 @@ class ApiSession(object):
             f"""\tParams:\t\t{self.get_params()}\n"""
             f"""\tTimeout:\t{self.get_timeout()}\n"""
             f"""\tRetries:\tRetry on error (up to {max_retries} times) every {backoff_factor}\n"""
+            f"""\tPool:\t\t{self.get_pool_config()}\n"""
         )
 
-    def execute(self, method, url):
+    def execute(self, method, url, stream=False):
+        """
+        Launches a request with the session params.
+
+        Args:
+            method: The http method.
+            url: The url to query.
+            stream: Whether to return as soon as the headers are received (the body is then read by the caller, for
+                instance with response.iter_content). Streamed responses are neither coalesced nor cached.
+
+        Returns:
+            A requests Response.
+        """
         # Prepare request arguments
         kwargs = {
             "method": method,
             "url": url,
         }
+        if stream:
+            kwargs["stream"] = True
         if self.__timeout:
             kwargs["timeout"] = self.__timeout
         if self.__params:
@@ -170,30 +314,383 @@ class ApiSession(object):
             else:
                 kwargs["data"] = self.__params
 
-        # Launch request
-        response = self.__requests_session.request(**kwargs)
+        # Read the response from the cache (if stored and not expired)
+        request_key = None
+        if method in self.IDEMPOTENT_METHODS and (self.__response_cache or self.__request_coalescer):
+            request_key = get_request_key(method, url, self.__params)
+        if request_key and self.__response_cache:
+            entry = self.__response_cache.get(request_key)
+            if entry:
+                return self.__build_cached_response(kwargs, *entry)
+
+        # Share the call with the identical requests of the same user in flight (if any): only successful responses
+        #   are shared
+        if stream:
+            return self.__send(kwargs)
+        if request_key and self.__request_coalescer:
+            return self.__request_coalescer.run(
+                get_request_key(method, url, self.__params, ignored_params=()),
+                partial(self.__send, kwargs, request_key),
+                lambda response: 200 <= response.status_code < 300
+            )
+
+        return self.__send(kwargs, request_key)
+
+    def __send(self, request_kwargs, request_key=None):
+        """ [Hidden method]
+        Launches a request (once the rate limiter allows it) and stores its response in the cache if successful.
+        """
+        if self.__rate_limiter:
+            time.sleep(self.__rate_limiter.reserve())
+        response = self.__requests_session.request(**request_kwargs)
+        if self.__rate_limiter:
+            self.__rate_limiter.update(response.headers)
+
+        # Store successful responses in the cache
+        if request_key and self.__response_cache and response.ok:
+            self.__response_cache.put(request_key, response.status_code, response.headers, response.content)
+
+        return response
+
+    @staticmethod
+    def __build_cached_response(request_kwargs, status, headers, content):
+        """ [Hidden method]
+        Rebuilds a requests Response from a response stored in the cache.
+        """
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response._content_consumed = True
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.request = requests.Request(
+            method=request_kwargs["method"], url=request_kwargs["url"], params=request_kwargs.get("params")
+        ).prepare()
+        response.url = response.request.url
 
         return response
 
     def duplicate(self):
         """
-        Initiate a new Api Session object with the same attributes as self.
+        Initiate a new Api Session object with the same params as self, overlaid on the same transport (requests
+          session and connection pool).
         """
         new_api_session = ApiSession(
-            cert_path=self.__requests_session.verify,
-            proxies=self.__requests_session.proxies,
-            headers=self.__requests_session.headers,
-            params=self.__params,
+            params=dict(self.__params),
             max_retries=self.__max_retries,
             backoff_factor=self.__backoff_factor,
             timeout=self.__timeout,
-            verbose=self.__verbose
+            verbose=self.__verbose,
+            pool_connections=self.__pool_connections,
+            pool_maxsize=self.__pool_maxsize,
+            keep_alive=self.__keep_alive,
+            rate_limiter=self.__rate_limiter,
+            response_cache=self.__response_cache,
+            request_coalescer=self.__request_coalescer,
+            requests_session=self.__requests_session
+        )
+
+        return new_api_session
+
+
+def import_httpx():
+    """
+    Imports httpx the first time an async session is created (it takes as long to import as requests).
+
+    Raises:
+        ImportError if httpx is not installed.
+    """
+    global httpx
+    if httpx is None:
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                """The async API requires the httpx package: run 'pip install nanga-ad-library[async]'."""
+            ) from None
+
+    return httpx
+
+
+class AsyncApiSession(object):
+    """
+    Asynchronous counterpart of ApiSession, based on an httpx.AsyncClient.
+
+    The client (and its connection pool) is shared with all the sessions created using duplicate(): many cursors can
+      run concurrently in the same event loop while reusing the same connections. So are the rate limiter, the
+      response cache and the request coalescer (if any).
+    """
+
+    DEFAULT_HEADERS = ApiSession.DEFAULT_HEADERS
+    MAX_RETRIES = ApiSession.MAX_RETRIES
+    WARM_UP_TIMEOUT = ApiSession.WARM_UP_TIMEOUT
+
+    # Default maximum number of connections of the httpx client and time (in seconds) idle connections are kept
+    POOL_MAXSIZE = 100
+    KEEP_ALIVE_EXPIRY = 60
+
+    def __init__(
+        self,
+        cert_path=None, proxies=None, headers=None, params=None,
+        max_retries=None,
+        timeout=None,
+        verbose=False,
+        http_client=None,
+        rate_limiter=None,
+        pool_maxsize=None, keep_alive=True, warm_up_connections=None,
+        response_cache=None, request_coalescer=None
+    ):
+        """
+        Initializes an async session (and its httpx client if no client is provided)
+
+        Args:
+            http_client: An httpx.AsyncClient to share with other sessions (the session won't close it).
+            rate_limiter: A UsageRateLimiter object delaying the requests when the usage of the API gets high.
+            pool_maxsize: Maximum number of connections of the httpx client created by the session.
+            keep_alive: Whether the httpx client created by the session keeps idle connections open.
+            warm_up_connections: Default number of connections opened in advance by warm_up().
+            response_cache: A ResponseCache object storing the responses of the GET requests.
+            request_coalescer: An AsyncRequestCoalescer object sharing the identical GET requests in flight.
+        """
+        import_httpx()
+
+        # Initiate (or reuse) the httpx client
+        self.__owns_http_client = http_client is None
+        if self.__owns_http_client:
+            pool_maxsize = pool_maxsize or self.POOL_MAXSIZE
+            transport_kwargs = {
+                "verify": cert_path if cert_path else True,
+                "retries": max_retries or self.MAX_RETRIES,
+                "limits": httpx.Limits(
+                    max_connections=pool_maxsize,
+                    max_keepalive_connections=pool_maxsize if keep_alive else 0,
+                    keepalive_expiry=self.KEEP_ALIVE_EXPIRY
+                )
+            }
+            http_client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(**transport_kwargs),
+                mounts={
+                    f"{scheme}://": httpx.AsyncHTTPTransport(proxy=proxy, **transport_kwargs)
+                    for scheme, proxy in (proxies or {}).items()
+                } or None
+            )
+        self.__http_client = http_client
+        self.__headers = dict(self.DEFAULT_HEADERS)
+        self.__params = dict(params or {})
+        self.__timeout = timeout
+        self.__max_retries = max_retries or self.MAX_RETRIES
+        self.__rate_limiter = rate_limiter
+        self.__response_cache = response_cache
+        self.__request_coalescer = request_coalescer
+        self.__warm_up_connections = warm_up_connections
+        self.__verbose = False
+
+        # Update all needed session attributes
+        self.update_headers(headers)
+
+        # Print a message if verbose
+        self.__verbose = verbose or False
+        self.__log_update(creation=True)
+
+    def __log_update(self, creation=False):
+        if self.__verbose:
+            print("New async API session initiated" if creation else "Async API session updated")
+            self.display_session_attributes()
+
+    def get_http_client(self):
+        return self.__http_client
+
+    def get_headers(self):
+        return self.__headers
+
+    def update_headers(self, headers):
+        if headers:
+            self.__headers.update(headers)
+            self.__log_update()
+
+    def clean_headers(self):
+        self.__headers = dict(self.DEFAULT_HEADERS)
+        self.__log_update()
+
+    def get_params(self):
+        return self.__params
+
+    def update_params(self, params):
+        if params:
+            self.__params.update(params)
+            self.__log_update()
+
+    def clean_params(self):
+        self.__params = {}
+        self.__log_update()
+
+    def get_timeout(self):
+        return self.__timeout
+
+    def get_rate_limiter(self):
+        return self.__rate_limiter
+
+    def get_response_cache(self):
+        return self.__response_cache
+
+    def get_request_coalescer(self):
+        return self.__request_coalescer
+
+    def update_timeout(self, timeout):
+        if timeout:
+            self.__timeout = timeout
+            self.__log_update()
+
+    def remove_timeout(self):
+        self.__timeout = None
+        self.__log_update()
+
+    def display_session_attributes(self):
+        print(
+            f"""Async session attributes:\n"""
+            f"""\tHeaders:\t{self.get_headers()}\n"""
+            f"""\tParams:\t\t{self.get_params()}\n"""
+            f"""\tTimeout:\t{self.get_timeout()}\n"""
+        )
+
+    async def execute(self, method, url):
+        # Prepare request arguments (timeout=None disables httpx default timeout, as in requests)
+        kwargs = {
+            "method": method,
+            "url": url,
+            "headers": self.__headers,
+            "timeout": self.__timeout,
+        }
+        if self.__params:
+            if method in ["GET", "HEADERS", "DELETE"]:
+                kwargs["params"] = self.__params
+            else:
+                kwargs["data"] = self.__params
+
+        # Read the response from the cache (if stored and not expired)
+        request_key = None
+        if method in ApiSession.IDEMPOTENT_METHODS and (self.__response_cache or self.__request_coalescer):
+            request_key = get_request_key(method, url, self.__params)
+        if request_key and self.__response_cache:
+            entry = self.__response_cache.get(request_key)
+            if entry:
+                status, headers, content = entry
+                request = httpx.Request(method, url, params=kwargs.get("params"))
+                return httpx.Response(status, headers=headers, content=content, request=request)
+
+        # Share the call with the identical requests of the same user in flight (if any): only successful responses
+        #   are shared
+        if request_key and self.__request_coalescer:
+            return await self.__request_coalescer.run(
+                get_request_key(method, url, self.__params, ignored_params=()),
+                partial(self.__send, kwargs, request_key),
+                lambda response: response.is_success
+            )
+
+        return await self.__send(kwargs, request_key)
+
+    async def __send(self, request_kwargs, request_key=None):
+        """ [Hidden method]
+        Launches a request (once the rate limiter allows it) and stores its response in the cache if successful.
+        """
+        if self.__rate_limiter:
+            await asyncio.sleep(self.__rate_limiter.reserve())
+        response = await self.__http_client.request(**request_kwargs)
+        if self.__rate_limiter:
+            self.__rate_limiter.update(response.headers)
+
+        # Store successful responses in the cache
+        if request_key and self.__response_cache and response.is_success:
+            self.__response_cache.put(request_key, response.status_code, response.headers, response.content)
+
+        return response
+
+    def duplicate(self):
+        """
+        Initiate a new AsyncApiSession object with the same attributes as self, sharing the same httpx client.
+        """
+        new_api_session = AsyncApiSession(
+            headers=self.__headers,
+            params=dict(self.__params),
+            max_retries=self.__max_retries,
+            timeout=self.__timeout,
+            verbose=self.__verbose,
+            http_client=self.__http_client,
+            rate_limiter=self.__rate_limiter,
+            response_cache=self.__response_cache,
+            request_coalescer=self.__request_coalescer
         )
 
         return new_api_session
 
+    def get_warm_up_connections(self):
+        return self.__warm_up_connections
+
+    async def warm_up(self, url, connections=None):
+        """
+        Opens connections with the host of url in advance (concurrently), cf ApiSession.warm_up.
 
-class MetaGraphAPISession(ApiSession):
+        Args:
+            url: An url of the host to connect to.
+            connections: Number of connections to open (default: warm_up_connections, else 1).
+        """
+        async def connect():
+            try:
+                await self.__http_client.head(url, timeout=self.WARM_UP_TIMEOUT)
+            except httpx.HTTPError:
+                pass
+
+        await asyncio.gather(*[connect() for _ in range(connections or self.__warm_up_connections or 1)])
+
+    async def aclose(self):
+        """
+        Close the httpx client (only if it was created by this session).
+        """
+        if self.__owns_http_client:
+            await self.__http_client.aclose()
+
+
+class MetaGraphAPIAuthentication:
+    """
+    Meta Graph API authentication, shared by the sync and async sessions.
+    Classes using it must store the access_token and app_secret attributes and implement update_params().
+    """
+
+    GRAPH_API_URL = "https://graph.facebook.com"
+
+    def __gen_app_secret_proof(self):
+        """
+        Generate a secret proof for Meta GRAPH API using app_secret and access_token.
+        """
+        h = hmac.new(
+            self.app_secret.encode('utf-8'),
+            msg=self.access_token.encode('utf-8'),
+            digestmod=hashlib.sha256
+        )
+
+        return h.hexdigest()
+
+    def get_auth_params(self):
+        """
+        Returns the access_token and appsecret_proof (if app_secret is provided) params.
+        """
+        params = {
+            "access_token": self.access_token,
+        }
+        if self.app_secret:
+            params["appsecret_proof"] = self.__gen_app_secret_proof()
+
+        return params
+
+    def authenticate(self):
+        """
+        Allow Meta GRAPH API authentication adding tokens to session params.
+        """
+        # Update Api Session params with the authentication params
+        self.update_params(self.get_auth_params())
+
+
+class MetaGraphAPISession(MetaGraphAPIAuthentication, ApiSession):
     """
     MetaGraphAPISession manages the Graph API authentication and https
     connection.
@@ -203,6 +700,9 @@ class MetaGraphAPISession(ApiSession):
         app_secret: The application secret.
     """
 
+    # Coalescer shared by the sessions of the process using it (requests are coalesced per access token)
+    REQUEST_COALESCER = RequestCoalescer()
+
     def __init__(
         self,
         access_token, app_secret=None,
@@ -210,57 +710,145 @@ class MetaGraphAPISession(ApiSession):
         max_retries=None, backoff_factor=None,
         timeout=None,
         verbose=False,
+        pool_connections=None, pool_maxsize=None, keep_alive=True,
+        rate_limit=True, rate_limit_max_wait=None,
+        cache_path=None, cache_ttl=None, cache_max_entries=None,
+        coalesce_requests=False
     ):
         """
         Store the authentication tokens and initiate an ApiSession object
+
+        Args:
+            rate_limit: Whether to slow down the requests when Meta usage headers get close to the limits.
+            rate_limit_max_wait: Maximum time (in seconds) a request waits for the rate limits (cf UsageRateLimiter).
+            cache_path: Path of the SQLite database caching the responses (no cache if not provided).
+            cache_ttl: Time (in seconds) after which a cached response expires.
+            cache_max_entries: Maximum number of responses cached.
+            coalesce_requests: Whether identical requests made at the same time by the sessions of the process with the
+                same access token share the same call (disabled by default).
         """
         # Init parent
         super().__init__(
             cert_path=cert_path, proxies=proxies, headers=headers, params=None,
             max_retries=max_retries, backoff_factor=backoff_factor,
             timeout=timeout,
-            verbose=verbose
+            verbose=verbose,
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive,
+            rate_limiter=UsageRateLimiter(max_wait=rate_limit_max_wait) if rate_limit else None,
+            response_cache=ResponseCache(cache_path, cache_ttl, cache_max_entries) if cache_path else None,
+            request_coalescer=self.REQUEST_COALESCER if coalesce_requests else None
         )
 
         # Store authentication tokens
         self.access_token = access_token
         self.app_secret = app_secret
 
-    def __gen_app_secret_proof(self):
+    @classmethod
+    def init(cls, **kwargs):
         """
-        Generate a secret proof for Meta GRAPH API using app_secret and access_token.
+        Initiate an API requests session and authenticate using auth tokens
         """
-        h = hmac.new(
-            self.app_secret.encode('utf-8'),
-            msg=self.access_token.encode('utf-8'),
-            digestmod=hashlib.sha256
+
+        # Check that mandatory parameters are provided
+        MetaSessionMandatoryArgs.check_arguments(**kwargs)
+
+        # Initiate a requests session for Meta GRAPH API
+        meta_session = cls(
+            kwargs.get("access_token"),
+            app_secret=kwargs.get("app_secret"),
+            cert_path=kwargs.get("cert_path"),
+            proxies=kwargs.get("proxies"),
+            headers=kwargs.get("headers"),
+            max_retries=kwargs.get("max_retries"),
+            backoff_factor=kwargs.get("backoff_factor"),
+            timeout=kwargs.get("timeout"),
+            verbose=kwargs.get("verbose"),
+            pool_connections=kwargs.get("pool_connections"),
+            pool_maxsize=kwargs.get("pool_maxsize"),
+            keep_alive=kwargs.get("keep_alive", True),
+            rate_limit=kwargs.get("rate_limit", True),
+            rate_limit_max_wait=kwargs.get("retry_max_delay"),
+            cache_path=kwargs.get("cache_path"),
+            cache_ttl=kwargs.get("cache_ttl"),
+            cache_max_entries=kwargs.get("cache_max_entries"),
+            coalesce_requests=kwargs.get("coalesce_requests")
         )
 
-        return h.hexdigest()
+        # Authenticate using access token and app_secret (if provided)
+        meta_session.authenticate()
 
-    def authenticate(self):
+        # Open connections with Meta GRAPH API in advance (if asked)
+        if kwargs.get("warm_up_connections"):
+            meta_session.warm_up(cls.GRAPH_API_URL, kwargs.get("warm_up_connections"))
+
+        return meta_session
+
+
+class AsyncMetaGraphAPISession(MetaGraphAPIAuthentication, AsyncApiSession):
+    """
+    Asynchronous counterpart of MetaGraphAPISession (Graph API authentication over an httpx.AsyncClient).
+
+    Attributes:
+        access_token: The access token.
+        app_secret: The application secret.
+    """
+
+    # Coalescer shared by the async sessions of the process using it (requests are coalesced per access token, within
+    #   each event loop)
+    REQUEST_COALESCER = AsyncRequestCoalescer()
+
+    def __init__(
+        self,
+        access_token, app_secret=None,
+        cert_path=None, proxies=None, headers=None,
+        max_retries=None,
+        timeout=None,
+        verbose=False,
+        http_client=None,
+        rate_limit=True, rate_limit_max_wait=None,
+        pool_maxsize=None, keep_alive=True, warm_up_connections=None,
+        cache_path=None, cache_ttl=None, cache_max_entries=None,
+        coalesce_requests=False
+    ):
         """
-        Allow Meta GRAPH API authentication adding tokens to session params.
+        Store the authentication tokens and initiate an AsyncApiSession object
+
+        Args:
+            rate_limit: Whether to slow down the requests when Meta usage headers get close to the limits.
+            rate_limit_max_wait: Maximum time (in seconds) a request waits for the rate limits (cf UsageRateLimiter).
+            cache_path: Path of the SQLite database caching the responses (cf MetaGraphAPISession).
+            cache_ttl: Time (in seconds) after which a cached response expires.
+            cache_max_entries: Maximum number of responses cached.
+            coalesce_requests: Whether identical requests made at the same time by the sessions of the process with the
+                same access token share the same call (within the same event loop, disabled by default).
         """
-        # Store new access_token and appsecret_proof (if app_secret is provided)
-        params = {
-            "access_token": self.access_token,
-        }
-        if self.app_secret:
-            params["appsecret_proof"] = self.__gen_app_secret_proof()
-        # Update Api Session params with params dict
-        self.update_params(params)
+        # Init parent
+        super().__init__(
+            cert_path=cert_path, proxies=proxies, headers=headers, params=None,
+            max_retries=max_retries,
+            timeout=timeout,
+            verbose=verbose,
+            http_client=http_client,
+            rate_limiter=UsageRateLimiter(max_wait=rate_limit_max_wait) if rate_limit else None,
+            pool_maxsize=pool_maxsize, keep_alive=keep_alive, warm_up_connections=warm_up_connections,
+            response_cache=ResponseCache(cache_path, cache_ttl, cache_max_entries) if cache_path else None,
+            request_coalescer=self.REQUEST_COALESCER if coalesce_requests else None
+        )
+
+        # Store authentication tokens
+        self.access_token = access_token
+        self.app_secret = app_secret
 
     @classmethod
     def init(cls, **kwargs):
         """
-        Initiate an API requests session and authenticate using auth tokens
+        Initiate an async API session and authenticate using auth tokens
         """
 
         # Check that mandatory parameters are provided
         MetaSessionMandatoryArgs.check_arguments(**kwargs)
 
-        # Initiate a requests session for Meta GRAPH API
+        # Initiate an async session for Meta GRAPH API
         meta_session = cls(
             kwargs.get("access_token"),
             app_secret=kwargs.get("app_secret"),
@@ -268,9 +856,18 @@ class MetaGraphAPISession(ApiSession):
             proxies=kwargs.get("proxies"),
             headers=kwargs.get("headers"),
             max_retries=kwargs.get("max_retries"),
-            backoff_factor=kwargs.get("backoff_factor"),
             timeout=kwargs.get("timeout"),
-            verbose=kwargs.get("verbose")
+            verbose=kwargs.get("verbose"),
+            http_client=kwargs.get("http_client"),
+            rate_limit=kwargs.get("rate_limit", True),
+            rate_limit_max_wait=kwargs.get("retry_max_delay"),
+            pool_maxsize=kwargs.get("pool_maxsize"),
+            keep_alive=kwargs.get("keep_alive", True),
+            warm_up_connections=kwargs.get("warm_up_connections"),
+            cache_path=kwargs.get("cache_path"),
+            cache_ttl=kwargs.get("cache_ttl"),
+            cache_max_entries=kwargs.get("cache_max_entries"),
+            coalesce_requests=kwargs.get("coalesce_requests")
         )
 
         # Authenticate using access token and app_secret (if provided)
@@ -315,4 +912,4 @@ class MetaSessionMandatoryArgs(Enum):
             )
 
 
-__all__ = ['MetaGraphAPISession']
+__all__ = ['MetaGraphAPISession', 'AsyncMetaGraphAPISession']
@@ -1,7 +1,24 @@
 # nanga_ad_library/utils/__init__.py
 # import classes and methods from the package as a whole
 
-from .object_parser import ObjectParser
-from .param_checker import check_param_value, check_param_type, enforce_date_param_format
-from .request_handler import PlatformResponse, HttpMethod, UserAgent, json_encode_top_level_param
+from .object_parser import ObjectParser, LazyObjectParser, CompactObjectParser, FrozenList, FrozenDict
+from .param_checker import check_param_value, check_param_type, enforce_date_param_format, ParamSchema
+from .request_handler import (
+    PlatformResponse, HttpMethod, UserAgent, json_encode_top_level_param, extract_after_token, get_request_key,
+    json_loads, CompiledQuery
+)
+from .page_prefetcher import PagePrefetcher
+from .json_stream import JsonPageStream
+from .columnar import ArrowBatchBuilder
+from .sinks import FileSink, NdjsonSink, CsvSink, ParquetSink
+from .event_loop import BackgroundEventLoop
+from .download_pipeline import DownloadPipeline
+from .query_runner import QueryRunner, AsyncQueryRunner
+from .checkpoint import CursorCheckpoint
+from .crawl_state import CrawlState
+from .page_size import AdaptivePageSize
+from .rate_limiter import UsageRateLimiter
+from .retry_policy import RetryPolicy
+from .response_cache import ResponseCache
+from .request_coalescer import RequestCoalescer, AsyncRequestCoalescer
 from .version import compare_version_to_default, get_default_api_version, get_sdk_version
@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import hashlib
+import warnings
+
+"""
+Persist the progress of a cursor on disk to be able to resume a crawl where it stopped.
+"""
+
+
+class CursorCheckpoint:
+    """
+    Stores the progress of a cursor in a local json file, updated (atomically) when a new page is read and while the
+      records are handed over (every SAVE_EVERY records or SAVE_INTERVAL seconds, cf flush):
+        - the fingerprint of the query (a checkpoint is resumed only by the same query),
+        - the 'after' token used to query the page being read (None for the first page),
+        - the number of records of this page already handed over,
+        - the total number of records handed over,
+        - the state of the ad downloader (if any).
+    The file is removed once the cursor is over, so that the next run of the query starts from the first page.
+        Usage example:
+            >>> checkpoint = CursorCheckpoint("crawl.json", CursorCheckpoint.fingerprint("GET", url, payload))
+            >>> checkpoint.get_resume_token()  # Token of the page to query first ('None' to start from the first page)
+
+    If the process stops abruptly, the records handed over since the last save are handed over again by the next run.
+    """
+
+    # Number of records and time (in seconds) after which the records handed over are saved
+    SAVE_EVERY = 1000
+    SAVE_INTERVAL = 1
+
+    def __init__(self, path, fingerprint):
+        """
+        Initiates the checkpoint and loads the state saved by a previous run of the same query (if any).
+
+        Args:
+            path: Path of the json file storing the checkpoint.
+            fingerprint: Fingerprint of the query (cf CursorCheckpoint.fingerprint).
+        """
+        self.__path = path
+        self.__fingerprint = fingerprint
+        self.__resumed_state = self.__read()
+
+        state = self.__resumed_state or {}
+        self.__page_token = state.get("page_token")
+        self.__page_offset = state.get("page_offset", 0)
+        self.__records_emitted = state.get("records_emitted", 0)
+        self.__downloader_state = state.get("downloader_state")
+
+        # Records handed over since the last save
+        self.__num_unsaved = 0
+        self.__saved_at = time.monotonic()
+        self.__completed = False
+
+    @staticmethod
+    def fingerprint(method, url, payload):
+        """
+        Computes the fingerprint of a query (authentication params are not part of the payload).
+
+        Returns:
+            A sha256 hex digest.
+        """
+        query = json.dumps({"method": method, "url": url, "payload": payload}, sort_keys=True, default=str)
+
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def __read(self):
+        """ [Hidden method]
+        Reads the checkpoint file.
+
+        Returns:
+            The saved state if it matches the query fingerprint, else None.
+        """
+        try:
+            with open(self.__path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            warnings.warn(f"""Checkpoint file '{self.__path}' cannot be read: the crawl will start from scratch.""")
+            return None
+
+        if state.get("fingerprint") != self.__fingerprint:
+            warnings.warn(
+                f"""Checkpoint file '{self.__path}' was saved for another query: the crawl will start from scratch."""
+            )
+            return None
+
+        return state
+
+    def __save(self):
+        """ [Hidden method]
+        Writes the current state in a temporary file and then replaces the checkpoint file with it.
+        """
+        temporary_path = f"{self.__path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(self.get_state(), file)
+        os.replace(temporary_path, self.__path)
+        self.__num_unsaved = 0
+        self.__saved_at = time.monotonic()
+
+    def get_path(self):
+        return self.__path
+
+    def is_resumed(self):
+        """Returns whether a state saved by a previous run was loaded."""
+        return self.__resumed_state is not None
+
+    def get_resume_token(self):
+        """Returns the token of the page that was being read when the checkpoint was saved."""
+        return self.__page_token if self.is_resumed() else None
+
+    def get_resume_offset(self):
+        """Returns the number of records of the resumed page that were already handed over."""
+        return self.__page_offset if self.is_resumed() else 0
+
+    def get_downloader_state(self):
+        return self.__downloader_state
+
+    def get_state(self):
+        return {
+            "fingerprint": self.__fingerprint,
+            "page_token": self.__page_token,
+            "page_offset": self.__page_offset,
+            "records_emitted": self.__records_emitted,
+            "downloader_state": self.__downloader_state,
+            "updated_at": time.time(),
+        }
+
+    def start_page(self, page_token, offset=0, downloader_state=None):
+        """
+        Saves that a new page is being read.
+
+        Args:
+            page_token: The 'after' token used to query the page (None for the first page).
+            offset: Number of records of the page already handed over.
+            downloader_state: The state of the ad downloader (if any).
+        """
+        self.__page_token = page_token
+        self.__page_offset = offset
+        if downloader_state is not None:
+            self.__downloader_state = downloader_state
+        self.__save()
+
+    def records_emitted(self, count=1):
+        """
+        Records that count records of the current page were handed over (saved every SAVE_EVERY records or
+          SAVE_INTERVAL seconds).
+        """
+        self.__page_offset += count
+        self.__records_emitted += count
+        self.__num_unsaved += count
+        if self.__num_unsaved >= self.SAVE_EVERY or time.monotonic() - self.__saved_at >= self.SAVE_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Saves the records handed over since the last save (if any)."""
+        if self.__num_unsaved and not self.__completed:
+            self.__save()
+
+    def complete(self):
+        """Removes the checkpoint file (the cursor is over)."""
+        self.__completed = True
+        try:
+            os.remove(self.__path)
+        except FileNotFoundError:
+            pass
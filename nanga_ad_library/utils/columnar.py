@@ -0,0 +1,228 @@
+import json
+import warnings
+
+# Imported the first time it is needed (cf import_pyarrow): it takes longer to import than the whole package
+pyarrow = None
+
+"""
+Turn the records of a cursor into columnar batches (Apache Arrow) while the pages are received.
+"""
+
+
+def import_pyarrow():
+    """
+    Imports pyarrow (with its compute and parquet modules) the first time it is needed.
+
+    Raises:
+        ImportError if pyarrow is not installed.
+    """
+    global pyarrow
+    if pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.parquet
+        except ImportError:
+            pyarrow = None
+            raise ImportError(
+                """Columnar export requires the pyarrow package: run 'pip install nanga-ad-library[arrow]'."""
+            ) from None
+
+    return pyarrow
+
+
+class ArrowBatchBuilder:
+    """
+    Builds Arrow record batches (one column per field) from the pages of a cursor:
+        - date fields (ad_creation_time, ad_delivery_start_time, ...) become UTC timestamp columns,
+        - fields made of repeated strings (currency, page_name, ...) become dictionary columns, and lists of such strings
+          (publisher_platforms, languages, ...) lists of dictionary encoded strings,
+        - nested dicts (ad_elements, spend, impressions, ...) become struct columns.
+        Usage example:
+            >>> builder = ArrowBatchBuilder(batch_size=10000)
+            >>> for page in cursor.iter_pages():
+            >>>     for batch in builder.add(page):
+            >>>         writer.write_batch(batch)
+            >>> batches = builder.flush()  # The remaining records
+
+    The values of a column are converted by Arrow in one go (no intermediate dict per record). A column whose values do
+      not share a type is stored as json strings.
+    The type of each column is fixed by the first batch where it is not empty: the next batches are cast to it (nested
+      fields missing from a page become nulls, json strings stay json strings, and the values that cannot be cast are
+      stored as nulls with a warning). Batches can still miss fields (absent from a page): concat() unifies them.
+
+    Raises:
+        ImportError if pyarrow is not installed.
+    """
+
+    DATE_FIELDS = frozenset(["ad_creation_time", "ad_delivery_start_time", "ad_delivery_stop_time"])
+    # Fields made of a few distinct strings (or lists of such strings): the same fields are encoded in all the batches
+    DICTIONARY_FIELDS = frozenset([
+        "bylines", "currency", "languages", "page_id", "page_name", "publisher_platforms", "target_gender"
+    ])
+
+    TIMESTAMP_UNIT = "s"
+
+    def __init__(self, batch_size=None):
+        """
+        Args:
+            batch_size: Number of records of each batch (default: one batch per page).
+        """
+        import_pyarrow()
+        self.__batch_size = batch_size
+        self.__pending = []
+        self.__timestamp_type = pyarrow.timestamp(self.TIMESTAMP_UNIT, tz="UTC")
+
+        # Type of each column (fixed by the first batch where it is not empty) and columns stored as json strings
+        self.__types = {}
+        self.__json_fields = set()
+
+    def get_types(self):
+        """Returns the type of each column built so far (dict {field: pyarrow.DataType})."""
+        return dict(self.__types)
+
+    def add(self, records):
+        """
+        Adds the records of a page.
+
+        Returns:
+            The batches completed by these records (pyarrow.RecordBatch objects).
+        """
+        if not self.__batch_size:
+            return [self.build(records)] if records else []
+
+        self.__pending.extend(records)
+        batches = []
+        while len(self.__pending) >= self.__batch_size:
+            batches.append(self.build(self.__pending[:self.__batch_size]))
+            del self.__pending[:self.__batch_size]
+
+        return batches
+
+    def flush(self):
+        """Returns the batch of the records added and not handed over yet (empty list if there is none)."""
+        batches = [self.build(self.__pending)] if self.__pending else []
+        self.__pending = []
+
+        return batches
+
+    def build(self, records):
+        """Returns a pyarrow.RecordBatch with one row per record and one column per field found in the records."""
+        columns = {}
+        for rank, record in enumerate(records):
+            # items() does not trigger the loading of the heavy fields of LazyObjectParser records
+            for field, value in record.items():
+                column = columns.get(field)
+                if column is None:
+                    column = columns[field] = [None] * rank
+                elif len(column) < rank:
+                    column.extend([None] * (rank - len(column)))
+                column.append(value)
+        for column in columns.values():
+            column.extend([None] * (len(records) - len(column)))
+
+        return pyarrow.RecordBatch.from_arrays(
+            [self.__build_column(field, values) for field, values in columns.items()],
+            names=list(columns)
+        )
+
+    def __build_column(self, field, values):
+        """ [Hidden method]
+        Converts the values of a field into an Arrow array of the type of its column (cf class description).
+        """
+        if field in self.__json_fields:
+            return self.__build_json(values)
+        array = self.__convert(field, values)
+        if pyarrow.types.is_null(array.type):
+            column_type = self.__types.get(field)
+            return array.cast(column_type) if column_type else array
+
+        column_type = self.__types.setdefault(field, array.type)
+        if array.type.equals(column_type):
+            return array
+        if pyarrow.types.is_string(column_type):
+            # Strings stay strings, the other values are stored as json
+            return pyarrow.array(
+                [value if value is None or isinstance(value, str) else json.dumps(value) for value in values],
+                pyarrow.string()
+            )
+        try:
+            return array.cast(column_type)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError):
+            return self.__cast_values(field, values, column_type)
+
+    def __cast_values(self, field, values, column_type):
+        """ [Hidden method]
+        Casts the values of a field one by one to the type of its column (those that cannot be cast become nulls).
+        """
+        arrays, num_nulls = [], 0
+        for value in values:
+            try:
+                arrays.append(self.__convert(field, [value]).cast(column_type))
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError):
+                arrays.append(pyarrow.nulls(1, column_type))
+                num_nulls += value is not None
+        if num_nulls:
+            warnings.warn(
+                f"""{num_nulls} value(s) of the '{field}' field do not match the type of its column ({column_type}): """
+                f"""they are stored as nulls."""
+            )
+
+        return pyarrow.chunked_array(arrays, column_type).combine_chunks()
+
+    @staticmethod
+    def __build_json(values):
+        """ [Hidden method]
+        Converts values into json strings.
+        """
+        return pyarrow.array([None if value is None else json.dumps(value) for value in values], pyarrow.string())
+
+    def __convert(self, field, values):
+        """ [Hidden method]
+        Converts the values of a field into an Arrow array of the type they share (json strings if there is none).
+        """
+        try:
+            array = pyarrow.array(values)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            if field not in self.__types:
+                self.__json_fields.add(field)
+            return self.__build_json(values)
+
+        if pyarrow.types.is_string(array.type):
+            if field in self.DATE_FIELDS:
+                return self.__build_timestamps(array)
+            if field in self.DICTIONARY_FIELDS:
+                return array.dictionary_encode()
+        elif field in self.DICTIONARY_FIELDS and pyarrow.types.is_list(array.type) and pyarrow.types.is_string(
+                array.type.value_type
+        ):
+            return pyarrow.ListArray.from_arrays(
+                array.offsets, array.values.dictionary_encode(), mask=array.is_null() if array.null_count else None
+            )
+
+        return array
+
+    def __build_timestamps(self, array):
+        """ [Hidden method]
+        Converts dates ("2025-05-06") or datetimes with a zone offset into UTC timestamps (the strings are kept if they
+          are neither).
+        """
+        try:
+            return pyarrow.compute.assume_timezone(array.cast(pyarrow.timestamp(self.TIMESTAMP_UNIT)), "UTC")
+        except pyarrow.ArrowInvalid:
+            pass
+        try:
+            return array.cast(self.__timestamp_type)
+        except pyarrow.ArrowInvalid:
+            return array
+
+    @staticmethod
+    def concat(batches):
+        """Returns a pyarrow.Table made of the batches (their schemas being unified)."""
+        import_pyarrow()
+        if not batches:
+            return pyarrow.table({})
+
+        return pyarrow.concat_tables(
+            [pyarrow.Table.from_batches([batch]) for batch in batches], promote_options="permissive"
+        )
@@ -0,0 +1,172 @@
+import json
+import time
+import sqlite3
+import hashlib
+
+"""
+Remember what previous runs of a query returned to crawl only the new or changed ads (incremental crawling).
+"""
+
+
+class CrawlState:
+    """
+    Stores in a local SQLite database, for each query fingerprint:
+        - the high-water mark of the ad delivery start times already seen,
+        - the content hash of each ad already handed over.
+    The next run of the same query only asks for the ads delivered since the high-water mark (the date of the
+      high-water mark included) and hands over only the ads that are new or whose content changed.
+        Usage example:
+            >>> state = CrawlState("crawl.db", CrawlState.fingerprint("GET", url, payload))
+            >>> payload["ad_delivery_date_min"] = state.get_date_min(payload.get("ad_delivery_date_min"))
+            >>> rows = state.filter_rows(response["data"])  # Only the new or changed ads
+            >>> state.complete()  # Once the crawl is over: save what was seen
+
+    Nothing is saved before complete(): an interrupted crawl is fully handed over again by the next run (or resumed
+      by its checkpoint, the filter being the same until complete() is called).
+    """
+
+    # Field holding the delivery start time of each ad
+    DATE_FIELD = "ad_delivery_start_time"
+
+    # Number of characters of the delivery start time holding its date ('YYYY-MM-DD')
+    DATE_LENGTH = 10
+
+    def __init__(self, path, fingerprint):
+        """
+        Initiates the state and loads what was saved by the previous runs of the same query.
+
+        Args:
+            path: Path of the SQLite database storing the states of the queries.
+            fingerprint: Fingerprint of the query (cf CrawlState.fingerprint).
+        """
+        self.__path = path
+        self.__fingerprint = fingerprint
+        self.__high_water_mark, self.__seen_hashes = self.__read()
+
+        # Changes saved by complete()
+        self.__new_high_water_mark = self.__high_water_mark
+        self.__new_hashes = {}
+
+    @staticmethod
+    def fingerprint(method, url, payload):
+        """
+        Computes the fingerprint of a query regardless of its 'ad_delivery_date_min' param (narrowed by the state).
+
+        Returns:
+            A sha256 hex digest.
+        """
+        payload = {key: value for key, value in payload.items() if key != "ad_delivery_date_min"}
+        query = json.dumps({"method": method, "url": url, "payload": payload}, sort_keys=True, default=str)
+
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def content_hash(row):
+        """Returns the hash of the content of an ad (a row of the API)."""
+        content = json.dumps(row, sort_keys=True, default=str, separators=(",", ":"))
+
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def __connect(self):
+        """ [Hidden method]
+        Opens the database (and creates its tables if needed).
+        """
+        connection = sqlite3.connect(self.__path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS queries (fingerprint TEXT PRIMARY KEY, high_water_mark TEXT, updated_at REAL)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen_ads ("
+            "fingerprint TEXT, ad_id TEXT, content_hash TEXT, PRIMARY KEY (fingerprint, ad_id))"
+        )
+
+        return connection
+
+    def __read(self):
+        """ [Hidden method]
+        Reads the high-water mark and the content hashes saved for the query.
+        """
+        connection = self.__connect()
+        try:
+            row = connection.execute(
+                "SELECT high_water_mark FROM queries WHERE fingerprint = ?", (self.__fingerprint,)
+            ).fetchone()
+            seen_hashes = dict(connection.execute(
+                "SELECT ad_id, content_hash FROM seen_ads WHERE fingerprint = ?", (self.__fingerprint,)
+            ))
+        finally:
+            connection.close()
+
+        return (row[0] if row else None), seen_hashes
+
+    def get_path(self):
+        return self.__path
+
+    def get_high_water_mark(self):
+        return self.__high_water_mark
+
+    def get_num_seen_ads(self):
+        return len(self.__seen_hashes)
+
+    def get_date_min(self, date_min=None):
+        """
+        Returns the 'ad_delivery_date_min' param to use: the date of the high-water mark unless the provided date_min
+          is more recent.
+        """
+        if not self.__high_water_mark:
+            return date_min
+        high_water_date = self.__high_water_mark[:self.DATE_LENGTH]
+
+        return max(date_min, high_water_date) if date_min else high_water_date
+
+    def filter_rows(self, rows):
+        """
+        Keeps the rows (ads) that are new or changed since the previous runs and stores the changes to save.
+
+        Returns:
+            The list of new or changed rows.
+        """
+        kept_rows = []
+        for row in rows:
+            ad_id, content_hash = str(row.get("id")), self.content_hash(row)
+            date = row.get(self.DATE_FIELD)
+            if date and (not self.__new_high_water_mark or date > self.__new_high_water_mark):
+                self.__new_high_water_mark = date
+            if self.__seen_hashes.get(ad_id) == content_hash:
+                continue
+            self.__new_hashes[ad_id] = content_hash
+            kept_rows.append(row)
+
+        return kept_rows
+
+    def filter_response(self, response):
+        """
+        Drops from a json response of the API the ads that did not change since the previous runs.
+
+        Returns:
+            The response (updated in place).
+        """
+        if isinstance(response, dict) and "data" in response:
+            response["data"] = self.filter_rows(response["data"])
+
+        return response
+
+    def complete(self):
+        """Saves the high-water mark and the content hashes of the ads handed over (the crawl is over)."""
+        connection = self.__connect()
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO queries (fingerprint, high_water_mark, updated_at) VALUES (?, ?, ?)",
+                    (self.__fingerprint, self.__new_high_water_mark, time.time())
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO seen_ads (fingerprint, ad_id, content_hash) VALUES (?, ?, ?)",
+                    [(self.__fingerprint, ad_id, content_hash) for ad_id, content_hash in self.__new_hashes.items()]
+                )
+        finally:
+            connection.close()
+
+        self.__high_water_mark = self.__new_high_water_mark
+        self.__seen_hashes.update(self.__new_hashes)
+        self.__new_hashes = {}
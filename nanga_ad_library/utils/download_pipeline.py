@@ -0,0 +1,148 @@
+import asyncio
+
+from nanga_ad_library.utils.object_parser import ObjectParser, LazyObjectParser
+from nanga_ad_library.utils.request_handler import extract_after_token
+
+"""
+Producer/consumer pipeline decoupling API pagination from ad elements downloading.
+"""
+
+
+class DownloadPipeline:
+    """
+    Runs API pagination and ad elements downloading concurrently:
+        - a producer follows the 'after' tokens and splits each page into small batches of records,
+        - the batches wait in a bounded queue (when it is full, the producer stops querying the API),
+        - several download workers drain the queue and hand over each batch as soon as it is downloaded.
+
+    Records are therefore handed over in the order their download ends (not in the API order).
+        Usage example:
+            >>> pipeline = DownloadPipeline(fetch_page, ad_downloader, first_response, workers=2)
+            >>> task = asyncio.create_task(pipeline.run())
+            >>> records = await pipeline.next_records()  # Empty list when the pipeline is over
+    """
+
+    # Default number of concurrent download workers and default size of the queue of batches waiting for download
+    DEFAULT_WORKERS = 2
+    DEFAULT_QUEUE_SIZE = 4
+
+    def __init__(
+        self, fetch_page, ad_downloader, first_response, workers=None, queue_size=None, blocking_fetch=False,
+        record_parser=None
+    ):
+        """
+        Initiates the pipeline (nothing runs until run() is awaited).
+
+        Args:
+            fetch_page: Callable taking an 'after' token and returning the json response of the matching page.
+            ad_downloader: {Platform}Downloader object used to download ad elements.
+            first_response: The json response of the first page (already fetched).
+            workers: Number of concurrent download workers.
+            queue_size: Maximum number of batches waiting for download (backpressure on the API side).
+            blocking_fetch: Whether fetch_page is a blocking function (run in a thread) instead of a coroutine function.
+            record_parser: Callable turning each row of the API into a record (default: ObjectParser).
+        """
+        self.__fetch_page = fetch_page
+        self.__ad_downloader = ad_downloader
+        self.__first_response = first_response
+        self.__workers = workers or self.DEFAULT_WORKERS
+        self.__queue_size = queue_size or self.DEFAULT_QUEUE_SIZE
+        self.__blocking_fetch = blocking_fetch
+        self.__record_parser = record_parser or ObjectParser
+        self.__batch_size = getattr(ad_downloader, "MAX_BATCH_SIZE", 1)
+
+        # Queues are created in run() so that they are bound to the loop running the pipeline
+        self.__batches = None
+        self.__outputs = None
+        self.__pending_error = None
+
+    async def __produce(self):
+        """ [Hidden method]
+        Query the API pages one after another and queue their records by batches.
+        """
+        response = self.__first_response
+        while True:
+            records = [self.__record_parser(**row) for row in response.get("data", [])]
+            LazyObjectParser.group(records)
+            for k in range(0, len(records), self.__batch_size):
+                await self.__batches.put(records[k:k + self.__batch_size])
+
+            after_token = extract_after_token(response)
+            if not after_token:
+                break
+            if self.__blocking_fetch:
+                response = await asyncio.to_thread(self.__fetch_page, after_token)
+            else:
+                response = await self.__fetch_page(after_token)
+
+    async def __download(self):
+        """ [Hidden method]
+        Download worker: download the queued batches until the end signal (None) is received.
+        """
+        while True:
+            batch = await self.__batches.get()
+            if batch is None:
+                return
+            try:
+                await self.__outputs.put(await self.__ad_downloader.download_from_new_batch(batch))
+            except Exception as error:
+                await self.__outputs.put(error)
+
+    async def run(self):
+        """
+        Runs the producer and the download workers until all pages are downloaded, then signals the end of the
+          pipeline. An error raised by the producer is handed over (and raised by next_records()) after the
+          batches already queued are downloaded.
+        """
+        self.__batches = asyncio.Queue(maxsize=self.__queue_size)
+        self.__outputs = asyncio.Queue(maxsize=self.__workers)
+
+        workers = [asyncio.create_task(self.__download()) for _ in range(self.__workers)]
+        producer_error = None
+        try:
+            await self.__produce()
+        except Exception as error:
+            producer_error = error
+
+        # Signal the end of the pages to each worker and wait for the last downloads
+        for _ in workers:
+            await self.__batches.put(None)
+        await asyncio.gather(*workers)
+        if producer_error:
+            await self.__outputs.put(producer_error)
+        await self.__outputs.put(None)
+
+    async def next_records(self):
+        """
+        Waits for downloaded records and returns all those already available.
+
+        Returns:
+            A list of records (empty when the pipeline is over).
+
+        Raises:
+            The error met by the producer or by a download worker.
+        """
+        while self.__outputs is None:
+            await asyncio.sleep(0)
+
+        # Raise the error met after the records returned by the previous call
+        if self.__pending_error:
+            error, self.__pending_error = self.__pending_error, None
+            raise error
+
+        records = []
+        output = await self.__outputs.get()
+        while True:
+            if output is None:
+                # Keep the end signal for the next calls
+                self.__outputs.put_nowait(None)
+                return records
+            if isinstance(output, Exception):
+                if not records:
+                    raise output
+                self.__pending_error = output
+                return records
+            records += output
+            if self.__outputs.empty():
+                return records
+            output = self.__outputs.get_nowait()
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+"""
+Run coroutines from synchronous code in an event loop living in a background thread.
+"""
+
+
+class BackgroundEventLoop:
+    """
+    An asyncio event loop running forever in a daemon thread.
+        Usage example:
+            >>> loop = BackgroundEventLoop()
+            >>> result = loop.run(some_coroutine())  # Blocks until the coroutine is done
+            >>> loop.stop()
+
+    Unlike asyncio.run(), the loop (and the objects bound to it) survives between two calls, and it can be used
+      while another event loop is already running in the calling thread (Jupyter, web servers, ...).
+    """
+
+    # Maximum time (in seconds) to wait for the pending tasks to be cancelled when stopping the loop
+    STOP_TIMEOUT = 5
+
+    def __init__(self, name=None):
+        """
+        Creates the event loop and starts the background thread.
+
+        Args:
+            name: Name of the background thread (to help debugging).
+        """
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__loop.run_forever, name=name, daemon=True)
+        self.__thread.start()
+
+    def get_loop(self):
+        return self.__loop
+
+    def is_running(self):
+        return self.__thread.is_alive() and not self.__loop.is_closed()
+
+    def submit(self, coroutine):
+        """
+        Schedules a coroutine in the background loop.
+
+        Returns:
+            A concurrent.futures.Future object holding the result of the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+
+    def run(self, coroutine):
+        """
+        Runs a coroutine in the background loop and waits for its result.
+
+        Returns:
+            The result of the coroutine (or raises its exception).
+        """
+        return self.submit(coroutine).result()
+
+    def stop(self):
+        """Cancels the pending tasks, stops the loop and waits for the background thread to finish."""
+        if not self.is_running():
+            return
+
+        async def cancel_tasks():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            self.submit(cancel_tasks()).result(timeout=self.STOP_TIMEOUT)
+        finally:
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join(timeout=self.STOP_TIMEOUT)
+            if not self.__thread.is_alive():
+                self.__loop.close()
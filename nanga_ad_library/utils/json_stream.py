@@ -0,0 +1,174 @@
+import json
+import codecs
+
+"""
+Parse the pages of the API while they are received (row by row), instead of once their whole body is loaded.
+"""
+
+
+class JsonPageStream:
+    """
+    Parses a page of the API ({"data": [...], "paging": {...}}) from the chunks of its http response body:
+        - the rows of the data array are yielded one by one, as soon as they are received,
+        - the other members of the page (paging, ...) are available once the rows are over (cf get_envelope).
+        Usage example:
+            >>> stream = JsonPageStream(response.iter_content(chunk_size=65536), close=response.close)
+            >>> for row in stream:
+            >>>     print(row.get("id"))
+            >>> after_token = extract_after_token(stream.get_envelope())
+
+    Only the row being parsed and the chunks not parsed yet are kept in memory (never the whole body).
+
+    Raises:
+        ValueError (json.JSONDecodeError) while iterating if the body is not a valid json object.
+    """
+
+    ARRAY_KEY = "data"
+
+    # Number of parsed characters after which they are dropped from the buffer
+    COMPACT_SIZE = 1 << 16
+
+    WHITESPACES = " \t\r\n"
+
+    def __init__(self, chunks, array_key=None, close=None):
+        """
+        Args:
+            chunks: An iterable of bytes (or str) chunks of the body.
+            array_key: The member of the page whose items are yielded one by one (default: ARRAY_KEY).
+            close: A callable releasing the http response (called once: by close() or when the body is over).
+        """
+        self.__chunks = iter(chunks)
+        self.__array_key = array_key or self.ARRAY_KEY
+        self.__close = close
+        self.__text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__json_decoder = json.JSONDecoder()
+        self.__buffer = ""
+        self.__position = 0
+        self.__ended = False
+        self.__over = False
+        self.__envelope = {}
+        self.__rows = self.__parse()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.__rows)
+
+    def is_over(self):
+        """Returns whether the whole page was parsed."""
+        return self.__over
+
+    def get_envelope(self):
+        """Returns the members of the page other than the array (complete once the stream is over)."""
+        return self.__envelope
+
+    def close(self):
+        """Stops parsing and releases the http response."""
+        self.__rows.close()
+        self.__release()
+
+    def __del__(self):
+        # A stream dropped before its end still releases its http response (and its request limiter slot)
+        if getattr(self, "_JsonPageStream__close", None):
+            self.close()
+
+    def __release(self):
+        """ [Hidden method]
+        Releases the http response (only once, even if releasing it fails).
+        """
+        close, self.__close = self.__close, None
+        if close:
+            close()
+
+    def __read(self):
+        """ [Hidden method]
+        Adds the next chunk to the buffer (dropping the characters already parsed).
+
+        Returns:
+            False if the body is over, else True.
+        """
+        if self.__position > self.COMPACT_SIZE:
+            self.__buffer = self.__buffer[self.__position:]
+            self.__position = 0
+        try:
+            chunk = next(self.__chunks)
+        except StopIteration:
+            self.__ended = True
+            self.__buffer += self.__text_decoder.decode(b"", final=True)
+            return False
+        self.__buffer += self.__text_decoder.decode(chunk) if isinstance(chunk, (bytes, bytearray)) else chunk
+
+        return True
+
+    def __peek(self):
+        """ [Hidden method]
+        Skips the whitespaces and returns the next character ("" if the body is over).
+        """
+        while True:
+            while self.__position < len(self.__buffer) and self.__buffer[self.__position] in self.WHITESPACES:
+                self.__position += 1
+            if self.__position < len(self.__buffer):
+                return self.__buffer[self.__position]
+            if not self.__read():
+                return ""
+
+    def __expect(self, characters):
+        """ [Hidden method]
+        Consumes the next character, which must be one of characters.
+        """
+        character = self.__peek()
+        if not character or character not in characters:
+            raise json.JSONDecodeError(
+                f"Expecting one of {list(characters)}", self.__buffer, self.__position
+            )
+        self.__position += 1
+
+        return character
+
+    def __decode_value(self):
+        """ [Hidden method]
+        Decodes the json value starting at the next character (reading chunks until it is complete).
+        """
+        self.__peek()
+        while True:
+            pending = len(self.__buffer) - self.__position
+            try:
+                value, end = self.__json_decoder.raw_decode(self.__buffer, self.__position)
+                # A value ending with the buffer (a number for instance) may go on in the next chunk
+                if end < len(self.__buffer) or self.__ended:
+                    self.__position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.__ended:
+                    raise
+            # Read at least as many characters as already pending before decoding again (linear cost overall)
+            while len(self.__buffer) - self.__position < 2 * pending and self.__read():
+                pass
+
+    def __parse(self):
+        """ [Hidden method]
+        Generator parsing the page and yielding the rows of its array.
+        """
+        self.__expect("{")
+        if self.__peek() == "}":
+            self.__position += 1
+        else:
+            while True:
+                key = self.__decode_value()
+                self.__expect(":")
+                if key == self.__array_key and self.__peek() == "[":
+                    self.__position += 1
+                    if self.__peek() == "]":
+                        self.__position += 1
+                    else:
+                        while True:
+                            yield self.__decode_value()
+                            if self.__expect(",]") == "]":
+                                break
+                else:
+                    self.__envelope[key] = self.__decode_value()
+                if self.__expect(",}") == "}":
+                    break
+        self.__over = True
+        self.__release()
@@ -1,4 +1,10 @@
 import json
+import threading
+import warnings
+
+from collections import OrderedDict
+
+from nanga_ad_library.exceptions import PlatformError
 
 
 class ObjectParser:
@@ -37,3 +43,327 @@ class ObjectParser:
 
     def items(self):
         return self.__dict__.items()
+
+
+class LazyObjectParser(ObjectParser):
+    """
+    ObjectParser whose lazy fields are loaded (by the provided loader) the first time they are accessed.
+        Usage example:
+            >>> page = [LazyObjectParser(["demographic_distribution"], loader, **row) for row in rows]
+            >>> ad = LazyObjectParser.group(page)[0]
+            >>> ad.page_name  # No request
+            >>> ad.demographic_distribution  # Calls loader(page) which updates all the objects of the page
+
+    Only object.field, object["field"] and object.get("field") trigger the loading: .keys(), .values() and .items()
+      return the fields already loaded.
+    The objects of a group (typically a page, cf group) are loaded together by the first access; an object that is not
+      part of any group is loaded alone.
+    If the loading fails, object.field and object["field"] raise the error of the loader (PlatformRequestError for the
+      API loader) while object.get("field") warns and returns the default value (the loading is attempted again by the
+      next access).
+    """
+
+    # Stored outside of __dict__ so that they are not listed among the fields of the object
+    __slots__ = ("__lazy_fields", "__loader", "__group")
+
+    def __init__(self, lazy_fields, loader, **kwargs):
+        """
+        Args:
+            lazy_fields: The names of the fields that can be loaded afterwards.
+            loader: Callable taking a list of LazyObjectParser objects and adding the lazy fields to them (it skips
+              the objects already loaded).
+            **kwargs: The fields already available.
+        """
+        super().__init__(**kwargs)
+        self.__lazy_fields = frozenset(lazy_fields)
+        self.__loader = loader
+        self.__group = None
+
+    @staticmethod
+    def group(records):
+        """
+        Makes the LazyObjectParser objects among the records load their lazy fields together: the first access to a
+          lazy field of one of them loads the whole group with a single loader call.
+
+        Args:
+            records: The records of a page (the other objects than LazyObjectParser ones are ignored).
+
+        Returns:
+            The records.
+        """
+        group = []
+        for record in records:
+            if isinstance(record, LazyObjectParser):
+                record.__group = group
+                group.append(record)
+
+        return records
+
+    def __load(self, key):
+        """ [Hidden method]
+        Loads the lazy fields (of the whole group of the object) if key is one of them and was not loaded yet.
+        """
+        if key in self.__lazy_fields and key not in self.__dict__:
+            group = self.__group or [self]
+            self.__loader(group)
+            # Loaded objects no longer need their group
+            group.clear()
+
+    def __getattr__(self, key):
+        # Only called when the attribute is not found
+        if key.startswith("_"):
+            raise AttributeError(key)
+        self.__load(key)
+        try:
+            return self.__dict__[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __getitem__(self, key):
+        self.__load(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        try:
+            self.__load(key)
+        except PlatformError as error:
+            warnings.warn(f"""Lazy field '{key}' could not be loaded (the default value is returned): {error}""")
+        return super().get(key, default)
+
+    def get_missing_fields(self):
+        """Returns the lazy fields not loaded yet."""
+        return [field for field in self.__lazy_fields if field not in self.__dict__]
+
+
+class FrozenList(list):
+    """
+    Read-only list (interned by CompactObjectParser and shared by the records): methods modifying it in place raise a
+      TypeError. Being a list, it is handled as such by json, isinstance and comparisons.
+    """
+
+    def __readonly(self, *args, **kwargs):
+        # To update
+        raise TypeError("""Interned values are shared by the records: update() the record instead.""")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = __readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = __readonly
+
+    def __reduce__(self):
+        return FrozenList, (list(self),)
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict (interned by CompactObjectParser and shared by the records), cf FrozenList.
+    """
+
+    def __readonly(self, *args, **kwargs):
+        # To update
+        raise TypeError("""Interned values are shared by the records: update() the record instead.""")
+
+    __setitem__ = __delitem__ = __ior__ = __readonly
+    clear = pop = popitem = setdefault = update = __readonly
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+class CompactObjectParser(ObjectParser):
+    """
+    Memory efficient ObjectParser: each set of fields gets its own class (cf for_fields) storing the fields in
+      __slots__ instead of a dict, and the values are interned so that records share a single copy of each of them:
+      short strings (page names, currencies, platforms, age ranges, ...) and small lists and dicts only made of such
+      values (spend and impressions ranges, demographic buckets, ...).
+        Usage example:
+            >>> parser = CompactObjectParser.for_fields(["id", "page_name", "currency"])
+            >>> ad = parser(id="123", page_name="nanga", currency="EUR")
+            >>> print(ad.page_name, ad["currency"], ad.get("id"))
+
+    Records have the same interface as ObjectParser: fields missing from the row are not set (cf keys()), and keys
+      that are not among the fields (ad_elements, ...) are stored in a small dict created only when needed.
+    Values are shared by the records: interned lists and dicts are read-only (FrozenList and FrozenDict objects), use
+      update() on the record to change them.
+    The intern table keeps the MAX_INTERNED values used most recently (the least recently used ones are dropped from
+      it, the records keeping their copy): call clear() to empty it once the records of a crawl are released.
+    """
+
+    __slots__ = ("__extra",)
+
+    # Fields whose values are unique to each record (not interned)
+    UNIQUE_FIELDS = frozenset(["id"])
+
+    # Strings longer than this (ad texts, urls, ...) and lists and dicts with more items are not interned
+    INTERN_MAX_LENGTH = 64
+    INTERN_MAX_ITEMS = 8
+
+    # Maximum number of values in the intern table (when reached, the least recently used ones are dropped from it)
+    MAX_INTERNED = 50000
+
+    SCALAR_TYPES = frozenset([str, int, float, bool, type(None)])
+    STRING_TYPE = frozenset([str])
+
+    __fields = ()
+    __field_set = frozenset()
+    __interned_fields = frozenset()
+    __interned = OrderedDict()
+    __classes = {}
+    __lock = threading.Lock()
+
+    @classmethod
+    def for_fields(cls, fields):
+        """
+        Returns the record class storing fields in __slots__ (created once for each set of fields).
+
+        Args:
+            fields: The names of the fields queried (typically the 'fields' param of the payload).
+        """
+        fields = tuple(dict.fromkeys(
+            field for field in fields or [] if field.isidentifier() and not hasattr(CompactObjectParser, field)
+        ))
+        with cls.__lock:
+            if fields not in cls.__classes:
+                cls.__classes[fields] = type("CompactRecord", (CompactObjectParser,), {
+                    "__slots__": fields,
+                    "_CompactObjectParser__fields": fields,
+                    "_CompactObjectParser__field_set": frozenset(fields),
+                    "_CompactObjectParser__interned_fields": frozenset(fields) - cls.UNIQUE_FIELDS,
+                })
+
+        return cls.__classes[fields]
+
+    @classmethod
+    def intern(cls, value):
+        """Returns value with its short strings, small lists and small dicts of such values (nested ones included)
+          replaced by shared copies."""
+        return cls.__intern(value)
+
+    @classmethod
+    def clear(cls):
+        """Empties the intern table (the records already created keep their values)."""
+        with cls.__lock:
+            cls.__interned.clear()
+
+    @classmethod
+    def get_num_interned(cls):
+        """Returns the number of values in the intern table."""
+        return len(cls.__interned)
+
+    @classmethod
+    def __intern(cls, value):
+        """ [Hidden method]
+        Interns value (cf intern): the keys of the interned values are built from their items in one go (no recursion
+          over the strings of a list or dict).
+        """
+        value_type = type(value)
+        if value_type is str:
+            if len(value) > cls.INTERN_MAX_LENGTH:
+                return value
+            key = value
+        elif value_type is list or value_type is dict:
+            items = value.values() if value_type is dict else value
+            item_types = frozenset(map(type, items))
+            if not cls.SCALAR_TYPES.issuperset(item_types):
+                # Lists and dicts holding lists or dicts: their items are interned, not the list or dict itself
+                if value_type is dict:
+                    return {name: cls.__intern(item) for name, item in value.items()}
+                return [cls.__intern(item) for item in value]
+            if len(value) > cls.INTERN_MAX_ITEMS or (
+                    str in item_types and (len(item_types) > 1 or max(map(len, items)) > cls.INTERN_MAX_LENGTH)
+            ):
+                return value
+            # The types of the items tell 1, 1.0 and True apart
+            key = (
+                value_type,
+                tuple(value.items()) if value_type is dict else tuple(value),
+                None if item_types == cls.STRING_TYPE else tuple(map(type, items)),
+            )
+        else:
+            return value
+
+        interned = cls.__interned.get(key)
+        if interned is not None:
+            try:
+                cls.__interned.move_to_end(key)
+            except KeyError:
+                # Dropped by another thread in the meantime
+                pass
+            return interned
+
+        # Shared containers are read-only copies (the row they come from may still be modified)
+        if value_type is list:
+            value = FrozenList(value)
+        elif value_type is dict:
+            value = FrozenDict(value)
+        with cls.__lock:
+            interned = cls.__interned.setdefault(key, value)
+            while len(cls.__interned) > cls.MAX_INTERNED:
+                cls.__interned.popitem(last=False)
+
+        return interned
+
+    def __init__(self, **kwargs):
+        object.__setattr__(self, "_CompactObjectParser__extra", None)
+        self.update(kwargs)
+
+    def __repr__(self):
+        return json.dumps(dict(self.items()))
+
+    def __reduce__(self):
+        # Record classes are created on the fly: pickle the fields to create the class again
+        return _rebuild_compact_record, (self.__fields, dict(self.items()))
+
+    def __getattr__(self, key):
+        # Only called when the attribute is not found (field not set or extra key)
+        if key.startswith("_") or not self.__extra or key not in self.__extra:
+            raise AttributeError(key)
+        return self.__extra[key]
+
+    def __setattr__(self, key, value):
+        self.update({key: value})
+
+    def __getitem__(self, key):
+        if key in self.__field_set:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.__extra and key in self.__extra:
+            return self.__extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def update(self, new_dict):
+        for key, value in new_dict.items():
+            if key in self.__interned_fields:
+                object.__setattr__(self, key, self.intern(value))
+            elif key in self.__field_set:
+                object.__setattr__(self, key, value)
+            else:
+                if self.__extra is None:
+                    object.__setattr__(self, "_CompactObjectParser__extra", {})
+                self.__extra[key] = value
+
+    def keys(self):
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def items(self):
+        missing = object()
+        items = [(field, getattr(self, field, missing)) for field in self.__fields]
+        items = [(field, value) for field, value in items if value is not missing]
+        if self.__extra:
+            items.extend(self.__extra.items())
+
+        return items
+
+
+def _rebuild_compact_record(fields, items):
+    """Creates a record again from its fields and items (cf CompactObjectParser.__reduce__)."""
+    return CompactObjectParser.for_fields(fields)(**items)
@@ -0,0 +1,92 @@
+import queue
+import threading
+
+from nanga_ad_library.utils.request_handler import extract_after_token
+
+"""
+Fetch the next pages of a cursor in a background thread while the current page is consumed.
+"""
+
+
+class PagePrefetcher:
+    """
+    Follows the 'after' tokens of a cursor in a background thread and stores the next responses in a bounded queue.
+        Usage example:
+            >>> prefetcher = PagePrefetcher(fetch_page, after_token, depth=2)
+            >>> response = prefetcher.next_response()  # Blocks until the next page is available
+
+    Pages are handed over in the order they were requested. When a request fails, the error is stored at the position
+      of the page that could not be fetched and raised by next_response() when this page is read.
+    """
+
+    # Time (in seconds) to wait before checking again if the prefetcher has been stopped
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, fetch_page, after_token, depth):
+        """
+        Initiates the prefetcher and starts the background thread.
+
+        Args:
+            fetch_page: Callable taking an 'after' token and returning the json response of the matching page.
+            after_token: The token of the first page to fetch.
+            depth: The maximum number of pages fetched in advance (and stored in memory).
+        """
+        self.__fetch_page = fetch_page
+        self.__responses = queue.Queue(maxsize=max(int(depth), 1))
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, args=(after_token,), daemon=True)
+        self.__thread.start()
+
+    def __run(self, after_token):
+        """ [Hidden method]
+        Background loop: query the pages one after another until the last one (or until stopped).
+        """
+        while after_token and not self.__stopped.is_set():
+            try:
+                response = self.__fetch_page(after_token)
+            except Exception as error:
+                # Store the error where the page should have been and stop prefetching
+                self.__put(error)
+                return
+            after_token = extract_after_token(response)
+            self.__put(response)
+
+    def __put(self, item):
+        """ [Hidden method]
+        Add an item to the bounded queue, waiting for some room unless the prefetcher is stopped.
+        """
+        while not self.__stopped.is_set():
+            try:
+                self.__responses.put(item, timeout=self.POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def is_alive(self):
+        """Returns whether the prefetcher can still provide new responses (never once it was stopped)."""
+        if self.__stopped.is_set():
+            return False
+
+        return self.__thread.is_alive() or not self.__responses.empty()
+
+    def next_response(self):
+        """
+        Returns the next prefetched response (waits for it if it is not available yet).
+
+        Raises:
+            The error met while fetching this page (if any).
+        """
+        response = self.__responses.get()
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    def stop(self):
+        """Stops the background thread and drops the responses fetched in advance."""
+        self.__stopped.set()
+        while not self.__responses.empty():
+            try:
+                self.__responses.get_nowait()
+            except queue.Empty:
+                break
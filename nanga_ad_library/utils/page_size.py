@@ -0,0 +1,125 @@
+"""
+Adapt the number of records requested per page ('limit' param) to the weight of the query.
+"""
+
+
+class AdaptivePageSize:
+    """
+    Controls the 'limit' param of a cursor:
+        - it grows while the pages are fast and light,
+        - it shrinks when the pages get slow or heavy,
+        - it is halved (and the same page is requested again) when the API asks to reduce the amount of data, down to
+          min_limit (the error is raised if the API still rejects min_limit).
+    Once a limit was rejected by the API, the limit grows only halfway to this rejected limit (to avoid oscillating).
+        Usage example:
+            >>> page_size = AdaptivePageSize(initial_limit=25)
+            >>> page_size.get_limit()
+            25
+            >>> page_size.update(platform_response, latency=0.4)  # Returns True if the page has to be requested again
+    """
+
+    DEFAULT_LIMIT = 25
+    MIN_LIMIT = 1
+    MAX_LIMIT = 500
+
+    # Thresholds for a healthy page: latency (in seconds) and size of the response body (in bytes)
+    TARGET_LATENCY = 5
+    TARGET_RESPONSE_SIZE = 2 * 1024 * 1024
+
+    # Factors applied to the limit when pages are healthy (growth) and when they are too slow or too heavy (shrink)
+    GROWTH_FACTOR = 2
+    SHRINK_FACTOR = 0.75
+
+    def __init__(self, initial_limit=None, min_limit=None, max_limit=None):
+        """
+        Initiates the controller.
+
+        Args:
+            initial_limit: The limit of the first page (if empty, DEFAULT_LIMIT).
+            min_limit: The limit is never lower than min_limit.
+            max_limit: The limit is never higher than max_limit.
+        """
+        self.__min_limit = min_limit or self.MIN_LIMIT
+        self.__max_limit = max_limit or self.MAX_LIMIT
+        self.__limit = self.__bound(initial_limit or self.DEFAULT_LIMIT)
+        self.__rejected_limit = None
+        self.__history = []
+
+    def __bound(self, limit):
+        """ [Hidden method]
+        Keeps the limit between min_limit and max_limit.
+        """
+        return int(max(self.__min_limit, min(self.__max_limit, limit)))
+
+    @staticmethod
+    def is_too_much_data_error(platform_response):
+        """
+        Checks if the API rejected the request because too much data was asked.
+
+        Args:
+            platform_response: A PlatformResponse object.
+
+        Returns:
+            Whether the page has to be requested again with a lower limit.
+        """
+        if platform_response.is_success():
+            return False
+
+        body = platform_response.json()
+        error = body.get("error") if isinstance(body, dict) else None
+        message = (error or {}).get("message") or ""
+
+        return "reduce the amount of data" in message.lower()
+
+    def get_limit(self):
+        return self.__limit
+
+    def get_history(self):
+        """
+        Returns the requested page sizes: a list of dicts with keys limit, latency, size and success.
+        """
+        return self.__history
+
+    def update(self, platform_response, latency):
+        """
+        Updates the limit using the last response.
+
+        Args:
+            platform_response: The PlatformResponse of the last request.
+            latency: Duration of the last request (in seconds).
+
+        Returns:
+            True if the same page has to be requested again (with a lower limit), else False.
+
+        Raises:
+            PlatformRequestError (cf PlatformResponse.raise_for_status) if the API asks to reduce the amount of data
+              while the limit is already min_limit.
+        """
+        size = len(platform_response.content() or "")
+        too_much_data = self.is_too_much_data_error(platform_response)
+        self.__history.append({
+            "limit": self.__limit,
+            "latency": latency,
+            "size": size,
+            "success": not too_much_data
+        })
+
+        if too_much_data:
+            # Already at the minimum: the page cannot be requested with less data
+            if self.__limit <= self.__min_limit:
+                platform_response.raise_for_status()
+            self.__rejected_limit = self.__limit
+            self.__limit = self.__bound(self.__limit // 2)
+            return True
+
+        if platform_response.is_success():
+            if latency > self.TARGET_LATENCY or size > self.TARGET_RESPONSE_SIZE:
+                self.__limit = self.__bound(self.__limit * self.SHRINK_FACTOR)
+            elif latency < self.TARGET_LATENCY / 2 and size < self.TARGET_RESPONSE_SIZE / 2:
+                if self.__rejected_limit:
+                    halfway_limit = (self.__limit + self.__rejected_limit) // 2
+                    self.__limit = self.__bound(min(halfway_limit, self.__rejected_limit - 1))
+                else:
+                    self.__limit = self.__bound(self.__limit * self.GROWTH_FACTOR)
+
+        return False
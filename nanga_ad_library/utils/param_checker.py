@@ -1,9 +1,19 @@
-from dateutil import parser
+from datetime import date
 
 """
 Checks parameters validity and return transformed parameter when needed.
 """
 
+ISO_DATE_FORMAT = "%Y-%m-%d"
+
+
+def _is_accepted(value, accepted_values):
+    """Returns whether value is one of the accepted values (False for unhashable values looked up in a set or a dict)."""
+    try:
+        return value in accepted_values
+    except TypeError:
+        return False
+
 
 def check_param_value(param: str, value: str, accepted_values: list, is_list: bool):
     """
@@ -12,22 +22,20 @@ def check_param_value(param: str, value: str, accepted_values: list, is_list: bo
     Args:
         param: Parameter name (used to query platform API).
         value: Parameter value.
-        accepted_values: List of accepted values for this param.
+        accepted_values: Accepted values for this param (a set or a dict makes the lookups faster).
         is_list: Indicates if the param value is expected to be a list.
             If True checks that all elements are one of the expected value.
 
     Raises:
         ValueError if parameter value is not available.
     """
-    # Stringify the list of accepted values (to display in error if needed)
-    accepted_values_str = "\n\t- ".join(accepted_values)
-
     # For lists, check that all elements are of one of the expected types
     if is_list:
         # Check if value really is a list
         if isinstance(value, list):
             # Check that all elements are of one of the expected types
-            if accepted_values and not all([x in accepted_values for x in value]):
+            if accepted_values and not all(_is_accepted(x, accepted_values) for x in value):
+                accepted_values_str = "\n\t- ".join(accepted_values)
                 # TO UPDATE
                 raise ValueError(
                     f"""{value} is not a valid value for parameter {param}.\n"""
@@ -41,7 +49,8 @@ def check_param_value(param: str, value: str, accepted_values: list, is_list: bo
                 f"""It should be a list."""
             )
     # Else check that value is of one of the expected types
-    elif accepted_values and value not in accepted_values:
+    elif accepted_values and not _is_accepted(value, accepted_values):
+        accepted_values_str = "\n\t- ".join(accepted_values)
         # TO UPDATE
         raise ValueError(
             f"""'{value}' is not a valid value for parameter {param}.\n"""
@@ -92,7 +101,7 @@ def check_param_type(param: str, value: str, types: tuple, is_list: bool):
         )
 
 
-def enforce_date_param_format(param: str, value: str, date_format="%Y-%m-%d"):
+def enforce_date_param_format(param: str, value: str, date_format=ISO_DATE_FORMAT):
     """
     Checks that the parameter value is a valid date and format it using date_format.
 
@@ -108,8 +117,18 @@ def enforce_date_param_format(param: str, value: str, date_format="%Y-%m-%d"):
         ValueError if parameter value is not available.
     """
 
+    # Fast path for dates already in the expected ISO format (YYYY-MM-DD), the generic parser being much slower
+    if date_format == ISO_DATE_FORMAT and isinstance(value, str) and len(value) == 10 and value[4] == value[7] == "-":
+        try:
+            date.fromisoformat(value)
+            return value
+        except ValueError:
+            pass
+
     try:
         # Try to parse the given date string (used format is not known but needs to be standard)
+        # (dateutil is imported only when needed: it is slow to import)
+        from dateutil import parser
         dt = parser.parse(value)
 
         return dt.strftime(date_format)
@@ -120,3 +139,117 @@ def enforce_date_param_format(param: str, value: str, date_format="%Y-%m-%d"):
             f"""'{value}' is not a valid value for parameter {param}.\n"""
             f"""It should be a date string using standard format."""
         )
+
+
+class ParamSchema:
+    """
+    Validation schema of the parameters of an API, compiled once from their description (cf MetaParam members):
+        - the parameters available are looked up in precomputed views (all of them for political ads requests, those
+          not restricted to political ads otherwise),
+        - the accepted values of each parameter are stored in a dict (hash lookups, error messages keeping the order of
+          the values),
+        - dates already in ISO format skip the generic date parser (cf enforce_date_param_format).
+        Usage example:
+            >>> schema = ParamSchema([member.value for member in MetaParam], "Meta Ad Library API", doc_url)
+            >>> value = schema.validate("ad_delivery_date_min", "2025-05-06", political=False)
+
+    Errors are the ones of check_param_value, check_param_type and enforce_date_param_format.
+    """
+
+    def __init__(self, params, api_name, doc_url):
+        """
+        Args:
+            params: The descriptions of the parameters (dicts with the name, class, only_political, mandatory_level and
+                exp_type keys).
+            api_name: The name of the API (displayed in errors).
+            doc_url: The url of the documentation of the parameters (displayed in errors).
+        """
+        self.__api_name = api_name
+        self.__doc_url = doc_url
+
+        compiled_params = {}
+        self.__mandatory_params = {}
+        for param in params:
+            expected_type = param.get("exp_type") or {}
+            values_class = param.get("class")
+            compiled_params[param.get("name")] = {
+                "accepted_values": dict.fromkeys(member.value for member in values_class) if values_class else None,
+                "only_political": bool(param.get("only_political")),
+                "is_date": bool(expected_type.get("is_date")),
+                "date_format": expected_type.get("date_format"),
+                "is_list": expected_type.get("is_list"),
+                "t_types": expected_type.get("t_types"),
+                "max_len": expected_type.get("max_len"),
+            }
+            if param.get("mandatory_level"):
+                self.__mandatory_params.setdefault(str(param.get("mandatory_level")), []).append(param.get("name"))
+
+        # One view for the requests targeting political ads, one for the others
+        self.__views = {
+            True: compiled_params,
+            False: {name: param for name, param in compiled_params.items() if not param["only_political"]},
+        }
+
+    def get_param_names(self, political):
+        """Returns the names of the parameters available (for political ads requests or not)."""
+        return list(self.__views[bool(political)])
+
+    def get_mandatory_params(self):
+        """Returns the names of the mandatory parameters by mandatory level (at least one per level is required)."""
+        return self.__mandatory_params
+
+    def validate(self, param_name, param_value, political):
+        """
+        Checks that a parameter value is valid.
+
+        Args:
+            param_name: The parameter name.
+            param_value: The parameter value.
+            political: Whether the request is targeting only political ads.
+
+        Returns:
+            The value of the parameter, updated if needed (dates are formatted).
+
+        Raises:
+            ValueError if the parameter is not available or its value is not valid.
+        """
+        param = self.__views[bool(political)].get(param_name)
+        if param is None:
+            available_params_str = "\n\t- ".join(self.get_param_names(political))
+            # To update
+            raise ValueError(
+                f"""'{param_name}' is not a valid parameter for {self.__api_name}.\n"""
+                f"""Available parameters are: """
+                f"""(cf {self.__doc_url})\n"""
+                f"""\t- {available_params_str}"""
+            )
+
+        # When limited options, check that provided value is accepted
+        if param["accepted_values"] is not None:
+            check_param_value(
+                param=param_name, value=param_value, accepted_values=param["accepted_values"],
+                is_list=param["is_list"]
+            )
+        # When param is expected to be a date check it is and apply format
+        elif param["is_date"]:
+            param_value = enforce_date_param_format(
+                param=param_name, value=param_value, date_format=param["date_format"]
+            )
+        # When types specs are given, check the provided value complies
+        else:
+            check_param_type(param=param_name, value=param_value, types=param["t_types"], is_list=param["is_list"])
+            # If param has a maximal size: ensure it's shorter than the limit
+            max_len = param["max_len"]
+            try:
+                exceed_max_len = isinstance(max_len, int) and len(param_value) > max_len
+            except TypeError:
+                exceed_max_len = True
+            if exceed_max_len:
+                # To update
+                raise ValueError(
+                    f"""{param_value} is not a valid value for {param_name} parameter.\n"""
+                    f"""It's size is capped to {max_len}. """
+                    f"""(cf {self.__doc_url})"""
+                )
+
+        return param_value
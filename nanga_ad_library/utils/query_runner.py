@@ -0,0 +1,179 @@
+import queue
+import asyncio
+import threading
+
+"""
+Run the queries of several libraries concurrently and hand over their pages as soon as they are available.
+"""
+
+
+class QueryRunner:
+    """
+    Runs the queries of several libraries in worker threads (at most max_concurrency queries at the same time) and
+      hands over their pages in the order they arrive.
+        Usage example:
+            >>> runner = QueryRunner(libraries, max_concurrency=8)
+            >>> for rank, page in runner.iter_pages():  # rank: the index of the library the page comes from
+            >>>     print(rank, len(page))
+
+    Each query is paginated with its own cursor (cf ResultCursor.iter_pages). Pages are stored in a bounded queue:
+      when it is full, the workers wait before querying the next pages. The first error met by a query stops the
+      runner and is raised by iter_pages().
+    """
+
+    # Time (in seconds) to wait before checking again if the runner has been stopped
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, libraries, max_concurrency):
+        """
+        Initiates the runner and starts the worker threads.
+
+        Args:
+            libraries: The NangaAdLibrary objects whose results should be queried.
+            max_concurrency: Maximum number of queries running at the same time.
+        """
+        self.__libraries = queue.Queue()
+        for rank, library in enumerate(libraries):
+            self.__libraries.put((rank, library))
+        self.__pages = queue.Queue(maxsize=max_concurrency)
+        self.__stopped = threading.Event()
+        self.__workers = [
+            threading.Thread(target=self.__work, name=f"nanga-query-runner-{k}", daemon=True)
+            for k in range(min(max_concurrency, len(libraries)))
+        ]
+        for worker in self.__workers:
+            worker.start()
+
+    def __work(self):
+        """ [Hidden method]
+        Worker loop: run the queries one after another until there is no query left (or until stopped).
+        """
+        while not self.__stopped.is_set():
+            try:
+                rank, library = self.__libraries.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                for page in library.get_results().iter_pages():
+                    if not self.__put((rank, page)):
+                        return
+            except Exception as error:
+                self.__put((rank, error))
+                return
+        # Signal the end of the worker
+        self.__put(None)
+
+    def __put(self, item):
+        """ [Hidden method]
+        Add an item to the bounded queue, waiting for some room unless the runner is stopped.
+
+        Returns:
+            Whether the item was added.
+        """
+        while not self.__stopped.is_set():
+            try:
+                self.__pages.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def iter_pages(self):
+        """
+        Yields the pages of all the queries as soon as they are available.
+
+        Yields:
+            Tuples (rank of the library, list of records).
+
+        Raises:
+            The first error met by a query (the runner is then stopped).
+        """
+        running_workers = len(self.__workers)
+        try:
+            while running_workers:
+                item = self.__pages.get()
+                if item is None:
+                    running_workers -= 1
+                    continue
+                rank, page = item
+                if isinstance(page, Exception):
+                    raise page
+                yield rank, page
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stops the workers (they stop after their current request) and drops the pages not handed over yet."""
+        self.__stopped.set()
+        while not self.__pages.empty():
+            try:
+                self.__pages.get_nowait()
+            except queue.Empty:
+                break
+
+
+class AsyncQueryRunner:
+    """
+    Asyncio counterpart of QueryRunner: the queries of several async libraries run in worker tasks.
+        Usage example:
+            >>> runner = AsyncQueryRunner(libraries, max_concurrency=8)
+            >>> async for rank, page in runner.iter_pages():
+            >>>     print(rank, len(page))
+    """
+
+    def __init__(self, libraries, max_concurrency):
+        """
+        Initiates the runner (the worker tasks are started by iter_pages()).
+
+        Args:
+            libraries: The AsyncNangaAdLibrary objects whose results should be queried.
+            max_concurrency: Maximum number of queries running at the same time.
+        """
+        self.__libraries = list(enumerate(libraries))
+        self.__max_concurrency = max_concurrency
+
+    async def __work(self, libraries, pages):
+        """ [Hidden method]
+        Worker task: run the queries one after another until there is no query left.
+        """
+        while libraries:
+            rank, library = libraries.pop(0)
+            try:
+                cursor = await library.get_results()
+                async for page in cursor.iter_pages():
+                    await pages.put((rank, page))
+            except Exception as error:
+                await pages.put((rank, error))
+                return
+        # Signal the end of the worker
+        await pages.put(None)
+
+    async def iter_pages(self):
+        """
+        Yields the pages of all the queries as soon as they are available (cf QueryRunner.iter_pages).
+
+        Yields:
+            Tuples (rank of the library, list of records).
+        """
+        libraries = list(self.__libraries)
+        pages = asyncio.Queue(maxsize=self.__max_concurrency)
+        workers = [
+            asyncio.create_task(self.__work(libraries, pages))
+            for _ in range(min(self.__max_concurrency, len(libraries)))
+        ]
+        running_workers = len(workers)
+        try:
+            while running_workers:
+                item = await pages.get()
+                if item is None:
+                    running_workers -= 1
+                    continue
+                rank, page = item
+                if isinstance(page, Exception):
+                    raise page
+                yield rank, page
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
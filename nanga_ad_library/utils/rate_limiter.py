@@ -0,0 +1,159 @@
+import json
+import time
+import threading
+
+from nanga_ad_library.exceptions import PlatformRateLimitError
+
+"""
+Slow down the requests before reaching the rate limits of the platform (using the usage headers of its responses).
+"""
+
+
+class UsageRateLimiter:
+    """
+    Token bucket whose rate follows the usage reported by Meta in the headers of each response
+      (cf https://developers.facebook.com/docs/graph-api/overview/rate-limiting):
+        - below slowdown_threshold (percentage of the limit), requests are not delayed,
+        - above it, the rate decreases linearly from max_rate (at the threshold) to MIN_RATE (at 100%),
+        - when Meta reports an estimated time to regain access, requests wait until then,
+        - a request that would wait longer than max_wait raises a PlatformRateLimitError instead.
+        Usage example:
+            >>> limiter = UsageRateLimiter()
+            >>> time.sleep(limiter.reserve())  # Before each request
+            >>> limiter.update(response.headers)  # After each response
+            >>> limiter.get_headroom()  # Percentage of the limits still available
+
+    reserve() is thread-safe: the limiter can be shared by all the sessions querying the same app.
+    """
+
+    USAGE_HEADERS = ["x-app-usage", "x-business-use-case-usage", "x-ad-account-usage"]
+    USAGE_METRICS = ["call_count", "total_cputime", "total_time", "acc_id_util_pct"]
+
+    # Usage (in %) above which requests are slowed down
+    SLOWDOWN_THRESHOLD = 75
+
+    # Rates (in requests per second) at the slowdown threshold and when the usage reaches 100%
+    MAX_RATE = 2
+    MIN_RATE = 1 / 60
+
+    # Number of requests that can be made at once when slowing down
+    BURST = 1
+
+    # Maximum time (in seconds) a request waits for (cf RetryPolicy.MAX_DELAY)
+    MAX_WAIT = 300
+
+    def __init__(self, slowdown_threshold=None, max_rate=None, max_wait=None):
+        """
+        Args:
+            slowdown_threshold: Usage (in %) above which requests are slowed down.
+            max_rate: Rate (in requests per second) allowed when the usage reaches the slowdown threshold.
+            max_wait: Maximum time (in seconds) a request waits for before being made.
+        """
+        self.__slowdown_threshold = slowdown_threshold or self.SLOWDOWN_THRESHOLD
+        self.__max_rate = max_rate or self.MAX_RATE
+        self.__max_wait = max_wait or self.MAX_WAIT
+        self.__lock = threading.Lock()
+        self.__usage = {}
+        self.__blocked_until = 0
+        self.__tokens = self.BURST
+        self.__last_refill = time.monotonic()
+
+    @classmethod
+    def parse_usage_headers(cls, headers):
+        """
+        Extracts the usage metrics from the headers of a response.
+
+        Returns:
+            A tuple (dict {"{header}.{metric}": percentage}, estimated time to regain access in seconds).
+        """
+        usage, regain_access = {}, 0
+        for header in cls.USAGE_HEADERS:
+            try:
+                value = json.loads(headers.get(header) or "null")
+            except (TypeError, ValueError):
+                continue
+            # Business use case usage is a dict of lists (one list of usages per business)
+            if isinstance(value, dict) and all(isinstance(item, list) for item in value.values()):
+                items = [item for items in value.values() for item in items]
+            else:
+                items = [value]
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                for metric in cls.USAGE_METRICS:
+                    if isinstance(item.get(metric), (int, float)):
+                        key = f"{header}.{metric}"
+                        usage[key] = max(usage.get(key, 0), item[metric])
+                # Meta provides this estimation in minutes
+                regain_access = max(regain_access, 60 * (item.get("estimated_time_to_regain_access") or 0))
+
+        return usage, regain_access
+
+    def update(self, headers):
+        """Updates the usage with the headers of a response."""
+        usage, regain_access = self.parse_usage_headers(headers or {})
+        with self.__lock:
+            if usage:
+                self.__usage = usage
+            if regain_access:
+                self.__blocked_until = max(self.__blocked_until, time.monotonic() + regain_access)
+
+    def get_usage_details(self):
+        return dict(self.__usage)
+
+    def get_usage(self):
+        """Returns the highest usage (in % of the limit) reported by the last response."""
+        return max(self.__usage.values(), default=0)
+
+    def get_headroom(self):
+        """Returns the percentage of the limits still available (0 when a limit is reached)."""
+        return max(100 - self.get_usage(), 0)
+
+    def get_rate(self):
+        """Returns the current rate (in requests per second), None when requests are not slowed down."""
+        usage = self.get_usage()
+        if usage < self.__slowdown_threshold:
+            return None
+        remaining = max(100 - usage, 0) / (100 - self.__slowdown_threshold)
+
+        return max(self.__max_rate * remaining, self.MIN_RATE)
+
+    def reserve(self):
+        """
+        Reserves the next request.
+
+        Returns:
+            The time (in seconds) to wait before making the request (at most max_wait).
+
+        Raises:
+            PlatformRateLimitError if the request would have to wait longer than max_wait (it is not reserved).
+        """
+        with self.__lock:
+            now = time.monotonic()
+            wait = max(self.__blocked_until - now, 0)
+            rate = self.get_rate()
+            if rate is None:
+                self.__check_wait(wait)
+                self.__tokens, self.__last_refill = self.BURST, now
+                return wait
+
+            # Refill the bucket and take a token (a negative balance is the queue of reserved requests)
+            self.__tokens = min(self.__tokens + (now - self.__last_refill) * rate, self.BURST)
+            self.__last_refill = now
+            if self.__tokens < 1:
+                wait = max(wait, (1 - self.__tokens) / rate)
+            self.__check_wait(wait)
+            self.__tokens -= 1
+
+            return wait
+
+    def __check_wait(self, wait):
+        """ [Hidden method]
+        Raises a PlatformRateLimitError if wait exceeds max_wait.
+        """
+        if wait > self.__max_wait:
+            raise PlatformRateLimitError(
+                f"""The rate limits of the platform require waiting {wait:.0f} seconds before the next request """
+                f"""(more than {self.__max_wait} seconds).""",
+                wait
+            )
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+
+"""
+Share one in-flight API call between the identical requests made at the same time (single-flight).
+"""
+
+
+class RequestCoalescer:
+    """
+    Runs at most one call per request key at a time: the callers asking for a request already in flight wait for it
+      and get its result instead of making the same call.
+        Usage example:
+            >>> coalescer = RequestCoalescer()
+            >>> response = coalescer.run(key, lambda: session.request(...), lambda response: response.ok)
+
+    Only the results accepted by is_shared are handed to the waiting callers: when the call fails (error or result
+      not shared, an error response for instance), each waiting caller makes its own call.
+    Results are shared as is: callers must not modify them. The key is released as soon as the call is over, the next
+      identical request makes a new call (cf ResponseCache to reuse the results over time).
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+        self.__num_coalesced = 0
+
+    def get_num_coalesced(self):
+        """Returns the number of requests answered by a call made for another caller."""
+        return self.__num_coalesced
+
+    def run(self, key, function, is_shared=None):
+        """
+        Calls function (taking no argument) unless a call with the same key is in flight.
+
+        Args:
+            key: The key of the request (the identical requests of the same user have the same key).
+            function: The function making the call.
+            is_shared: Function telling whether a result can be handed to the waiting callers (default: all results).
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            The error raised by the call (made by the caller itself).
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self.__calls[key] = {"done": threading.Event(), "result": None, "shared": False}
+
+        # Wait for the call made by another caller (and make the call if its result cannot be shared)
+        if not is_leader:
+            call["done"].wait()
+            if not call["shared"]:
+                return function()
+            with self.__lock:
+                self.__num_coalesced += 1
+            return call["result"]
+
+        # Make the call and share its result
+        try:
+            call["result"] = function()
+            call["shared"] = is_shared is None or bool(is_shared(call["result"]))
+            return call["result"]
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+            call["done"].set()
+
+
+class AsyncRequestCoalescer:
+    """
+    Asyncio counterpart of RequestCoalescer: the callers of the same event loop asking for a request already in flight
+      await it instead of making the same call (only the results accepted by is_shared are handed to them).
+        Usage example:
+            >>> coalescer = AsyncRequestCoalescer()
+            >>> response = await coalescer.run(key, lambda: client.request(...), lambda response: response.is_success)
+    """
+
+    def __init__(self):
+        self.__calls = {}
+        self.__num_coalesced = 0
+
+    def get_num_coalesced(self):
+        """Returns the number of requests answered by a call made for another caller."""
+        return self.__num_coalesced
+
+    async def run(self, key, coroutine_function, is_shared=None):
+        """
+        Awaits coroutine_function() (taking no argument) unless a call with the same key is in flight in this loop.
+
+        Args:
+            key: The key of the request (the identical requests of the same user have the same key).
+            coroutine_function: The function returning the coroutine making the call.
+            is_shared: Function telling whether a result can be handed to the waiting callers (default: all results).
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            The error raised by the call (made by the caller itself).
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        # Await the call made by another caller (shielded: cancelling a waiting caller does not cancel the call), and
+        #   make the call if its result cannot be shared
+        future = self.__calls.get(loop_key)
+        if future is not None:
+            shared, result = await asyncio.shield(future)
+            if not shared:
+                return await coroutine_function()
+            self.__num_coalesced += 1
+            return result
+
+        # Make the call and share its result (the waiting callers make their own call if it fails)
+        future = self.__calls[loop_key] = loop.create_future()
+        shared, result = False, None
+        try:
+            result = await coroutine_function()
+            shared = is_shared is None or bool(is_shared(result))
+            return result
+        finally:
+            del self.__calls[loop_key]
+            future.set_result((shared, result if shared else None))
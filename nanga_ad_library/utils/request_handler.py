@@ -1,11 +1,19 @@
 import os
 import json
 import random
+import hashlib
 
 from enum import Enum
+from types import MappingProxyType
+from urllib.parse import urlencode
 
 from nanga_ad_library.exceptions import PlatformRequestError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 """
 Useful classes and functions to make http requests and handle their responses.
 """
@@ -15,12 +23,18 @@ class PlatformResponse:
 
     """
     Encapsulates a http response from the nanga Ad Library API.
+
+    The body is kept as received (raw bytes, without charset detection) and decoded only once: json() parses it on
+      its first call (with orjson if installed) and returns the same object afterward.
     """
 
+    # Marks a body whose json has not been parsed yet
+    __NOT_PARSED = object()
+
     def __init__(self, body=None, http_status=None, headers=None, call=None):
         """Initializes the object's internal data.
         Args:
-            body (optional): The response body as text.
+            body (optional): The response body as bytes (or text).
             http_status (optional): The http status code.
             headers (optional): The http headers.
             call (optional): The original call that was made.
@@ -29,17 +43,26 @@ class PlatformResponse:
         self.__http_status = http_status
         self.__headers = headers or {}
         self.__call = call
+        self.__json = self.__NOT_PARSED
+
+    def content(self):
+        """Returns the raw response body (as received)."""
+        return self.__body
 
     def body(self):
-        """Returns the response body."""
+        """Returns the response body as text."""
+        if isinstance(self.__body, (bytes, bytearray)):
+            return self.__body.decode("utf-8", errors="replace")
         return self.__body
 
     def json(self):
-        """Returns the response body -- in json if possible."""
-        try:
-            return json.loads(self.__body)
-        except (TypeError, ValueError):
-            return self.__body
+        """Returns the response body -- in json if possible (parsed once)."""
+        if self.__json is self.__NOT_PARSED:
+            try:
+                self.__json = json_loads(self.__body)
+            except (TypeError, ValueError):
+                self.__json = self.body()
+        return self.__json
 
     def headers(self):
         """Return the response headers."""
@@ -68,7 +91,7 @@ class PlatformResponse:
                 self.__call,
                 self.status(),
                 self.headers(),
-                self.body(),
+                self.json(),
             )
 
 
@@ -130,6 +153,19 @@ class UserAgent:
 
 
 # ~~~~  Other useful functions  ~~~~
+def json_loads(data):
+    """
+    Parses a json document (bytes or text), using orjson when installed (much faster on large pages).
+
+    Raises:
+        ValueError (or TypeError) if data is not a valid json document.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
+
+
 def json_encode_top_level_param(params):
     """
     Encodes certain types of values in the `params` dictionary into JSON format.
@@ -160,4 +196,87 @@ def json_encode_top_level_param(params):
     return params
 
 
+class CompiledQuery:
+    """
+    The params of a query encoded once (cf json_encode_top_level_param) and reused by all its requests:
+        - get_params() returns them as an immutable mapping, ready to be merged into the session params,
+        - with_params() returns the query with a few params changed (only the new values are encoded),
+        - get_query_string() returns them urlencoded (built once).
+        Usage example:
+            >>> query = CompiledQuery(payload)
+            >>> session.update_params(query.get_params())
+            >>> session.update_params({"after": after_token})  # Pages only apply the 'after' delta
+
+    Encoded params are strings (or numbers): they cannot be modified through the mapping.
+    """
+
+    def __init__(self, params, encoded=False):
+        """
+        Args:
+            params: The params of the query.
+            encoded: Whether the params are already encoded (cf json_encode_top_level_param).
+        """
+        self.__params = MappingProxyType(params if encoded else json_encode_top_level_param(params))
+        self.__query_string = None
+
+    def get_params(self):
+        """Returns the encoded params (read-only mapping)."""
+        return self.__params
+
+    def with_params(self, params):
+        """
+        Returns the query with the given params added or replaced (the same query if they do not change anything).
+        """
+        delta = json_encode_top_level_param(params)
+        if all(param in self.__params and self.__params[param] == value for param, value in delta.items()):
+            return self
+
+        return CompiledQuery(dict(self.__params, **delta), encoded=True)
+
+    def get_query_string(self, params=None):
+        """
+        Returns the urlencoded params (with the given params added or replaced, if any).
+        """
+        if params:
+            return self.with_params(params).get_query_string()
+        if self.__query_string is None:
+            self.__query_string = urlencode(self.__params)
+
+        return self.__query_string
+
+
+def extract_after_token(response):
+    """
+    Extracts the token to use to query the next page of results from an API response.
+
+    Args:
+        response: The json response of the API (a dict).
+
+    Returns:
+        The 'after' token if there is a next page, else None.
+    """
+    paging = response.get("paging") if isinstance(response, dict) else None
+    if paging and "next" in paging and "after" in paging.get("cursors", {}):
+        return paging["cursors"]["after"]
+
+    return None
+
+
+def get_request_key(method, url, params=None, ignored_params=("access_token", "appsecret_proof")):
+    """
+    Computes the key identifying a request regardless of its authentication params (two users asking for the same
+      query and page get the same key).
+
+    Args:
+        method: The http method of the request.
+        url: The url of the request.
+        params: The params of the request (the 'after' token included).
+        ignored_params: The params left out of the key.
+
+    Returns:
+        A sha256 hex digest.
+    """
+    params = {key: value for key, value in (params or {}).items() if key not in ignored_params}
+    request = json.dumps({"method": method.upper(), "url": url, "params": params}, sort_keys=True, default=str)
 
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
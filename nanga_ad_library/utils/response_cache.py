@@ -0,0 +1,143 @@
+import json
+import time
+import sqlite3
+import threading
+
+from nanga_ad_library.utils.request_handler import get_request_key
+
+"""
+Store the responses of the API calls on disk to answer the same calls locally (until they expire).
+"""
+
+
+class ResponseCache:
+    """
+    SQLite cache of successful http responses, keyed on the normalized request:
+        - method, url and params (the authentication params being stripped, the 'after' token being kept),
+        - entries expire after ttl seconds,
+        - when more than max_entries are stored, the least recently used entries are evicted.
+        Usage example:
+            >>> cache = ResponseCache("responses.db", ttl=3600)
+            >>> key = cache.key("GET", url, params)
+            >>> entry = cache.get(key)  # None if missing or expired, else (status, headers, content)
+            >>> cache.put(key, response.status_code, response.headers, response.content)
+            >>> cache.get_stats()  # {"hits": ..., "misses": ..., "entries": ...}
+
+    The cache can be shared by several sessions (and threads): each operation opens its own connection.
+    """
+
+    # Headers not stored (the content is stored decoded)
+    DROPPED_HEADERS = frozenset(["content-encoding", "content-length", "transfer-encoding"])
+
+    # Default time to live (in seconds) and maximum number of entries
+    TTL = 3600
+    MAX_ENTRIES = 10000
+
+    def __init__(self, path, ttl=None, max_entries=None):
+        """
+        Args:
+            path: Path of the SQLite database storing the responses.
+            ttl: Time (in seconds) after which an entry expires.
+            max_entries: Maximum number of entries kept (least recently used entries are evicted first).
+        """
+        self.__path = path
+        self.__ttl = ttl or self.TTL
+        self.__max_entries = max_entries or self.MAX_ENTRIES
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+        # Create the table on initialization (not on each operation)
+        connection = sqlite3.connect(self.__path)
+        try:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, status INTEGER, headers TEXT, "
+                    "content BLOB, created_at REAL, accessed_at REAL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        finally:
+            connection.close()
+
+    @staticmethod
+    def key(method, url, params=None):
+        """Computes the cache key of a request, regardless of its authentication params (cf get_request_key)."""
+        return get_request_key(method, url, params)
+
+    def get_path(self):
+        return self.__path
+
+    def get_ttl(self):
+        return self.__ttl
+
+    def get(self, key):
+        """
+        Returns the response stored with key (and counts a hit or a miss).
+
+        Returns:
+            A tuple (http status, dict of headers, content as bytes), None if missing or expired.
+        """
+        now = time.time()
+        connection = sqlite3.connect(self.__path)
+        try:
+            with connection:
+                row = connection.execute(
+                    "SELECT status, headers, content FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, now - self.__ttl)
+                ).fetchone()
+                if row:
+                    connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        finally:
+            connection.close()
+
+        with self.__lock:
+            if row:
+                self.__hits += 1
+            else:
+                self.__misses += 1
+
+        return (row[0], json.loads(row[1]), bytes(row[2])) if row else None
+
+    def put(self, key, status, headers, content):
+        """Stores a response, then drops the expired entries and the least recently used ones beyond max_entries."""
+        now = time.time()
+        headers = {
+            name: value for name, value in (headers or {}).items() if name.lower() not in self.DROPPED_HEADERS
+        }
+        connection = sqlite3.connect(self.__path)
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, status, headers, content, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, status, json.dumps(headers), sqlite3.Binary(content or b""), now, now)
+                )
+                connection.execute("DELETE FROM responses WHERE created_at < ?", (now - self.__ttl,))
+                connection.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.__max_entries,)
+                )
+        finally:
+            connection.close()
+
+    def clear(self):
+        """Removes all the entries (and resets the hits and misses counters)."""
+        connection = sqlite3.connect(self.__path)
+        try:
+            with connection:
+                connection.execute("DELETE FROM responses")
+        finally:
+            connection.close()
+        with self.__lock:
+            self.__hits, self.__misses = 0, 0
+
+    def get_stats(self):
+        """Returns the number of hits and misses since the cache was created and the number of entries stored."""
+        connection = sqlite3.connect(self.__path)
+        try:
+            entries = connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        finally:
+            connection.close()
+
+        return {"hits": self.__hits, "misses": self.__misses, "entries": entries}
@@ -0,0 +1,85 @@
+import random
+
+from nanga_ad_library.utils.page_size import AdaptivePageSize
+from nanga_ad_library.utils.rate_limiter import UsageRateLimiter
+
+"""
+Decide whether a failed API call should be made again (and when), using the error codes of the platform.
+"""
+
+
+class RetryPolicy:
+    """
+    Retries the calls failing with a transient or rate limiting Graph API error
+      (cf https://developers.facebook.com/docs/graph-api/guides/error-handling), waiting between two attempts:
+        - a "decorrelated jitter" delay: random between base_delay and 3 times the previous delay (up to max_delay),
+        - or the estimated time to regain access reported by Meta (if longer): when it exceeds max_delay, the call is not
+          made again (the rate limiting error is raised at once instead of blocking the caller).
+        Usage example:
+            >>> policy = RetryPolicy(max_retries=5)
+            >>> delay = policy.get_delay(response, attempt=0)  # None if the call should not be made again
+
+    The call is made again with the same session params (the 'after' token of a cursor does not move).
+    """
+
+    # Transient errors (1, 2), rate limiting errors (4, 17, 32, 341, 613) and business use case rate limits (80000+)
+    RETRYABLE_CODES = frozenset([1, 2, 4, 17, 32, 341, 613])
+    BUSINESS_USE_CASE_CODES = range(80000, 80100)
+
+    MAX_RETRIES = 5
+
+    # Delays in seconds
+    BASE_DELAY = 1
+    MAX_DELAY = 300
+
+    def __init__(self, max_retries=None, base_delay=None, max_delay=None):
+        """
+        Args:
+            max_retries: Maximum number of times a call is made again (0 to disable retries).
+            base_delay: Minimum delay (in seconds) between two attempts.
+            max_delay: Maximum delay (in seconds) between two attempts (time to regain access included).
+        """
+        self.__max_retries = self.MAX_RETRIES if max_retries is None else max_retries
+        self.__base_delay = base_delay or self.BASE_DELAY
+        self.__max_delay = max_delay or self.MAX_DELAY
+
+    def get_max_retries(self):
+        return self.__max_retries
+
+    @classmethod
+    def is_retryable(cls, response):
+        """
+        Returns whether a PlatformResponse failed with an error worth retrying (asking for less data is not a transient
+          error, cf AdaptivePageSize).
+        """
+        if response.is_success() or AdaptivePageSize.is_too_much_data_error(response):
+            return False
+        body = response.json()
+        error = body.get("error") if isinstance(body, dict) else None
+        if not isinstance(error, dict):
+            return False
+        code = error.get("code")
+
+        return bool(error.get("is_transient")) or code in cls.RETRYABLE_CODES or code in cls.BUSINESS_USE_CASE_CODES
+
+    def get_delay(self, response, attempt, previous_delay=None):
+        """
+        Computes the delay before making a failed call again.
+
+        Args:
+            response: The PlatformResponse of the failed call.
+            attempt: The number of retries already made for this call.
+            previous_delay: The delay waited before the previous retry (if any).
+
+        Returns:
+            The delay in seconds (at most max_delay), None if the call should not be made again.
+        """
+        if attempt >= self.__max_retries or not self.is_retryable(response):
+            return None
+
+        delay = min(random.uniform(self.__base_delay, 3 * (previous_delay or self.__base_delay)), self.__max_delay)
+        _, regain_access = UsageRateLimiter.parse_usage_headers(response.headers() or {})
+        if regain_access > self.__max_delay:
+            return None
+
+        return max(delay, regain_access)
@@ -0,0 +1,428 @@
+import os
+import abc
+import csv
+import gzip
+import json
+import queue
+import threading
+
+from nanga_ad_library.utils.columnar import ArrowBatchBuilder, import_pyarrow
+
+"""
+Persist the pages of a cursor in files while they are received (instead of dumping all the results at the end).
+"""
+
+
+class FileSink(abc.ABC):
+    """
+    Base class of the sinks a cursor streams its pages into (cf ResultCursor.write_to):
+        - pages are serialized and written by a background thread: write_page() only waits when queue_size pages are
+          already waiting to be written,
+        - the file is flushed after each page,
+        - files are written under a temporary name and renamed once complete (a file is never seen half written),
+        - with max_records or max_bytes, a new file is started once the current one reaches the limit (pages are not
+          split): path must then contain a "{part}" placeholder (numbered from 0).
+        Usage example:
+            >>> with NdjsonSink("ads-{part:04d}.ndjson.gz", max_records=100000) as sink:
+            >>>     cursor.write_to(sink)
+            >>> print(sink.get_paths())
+
+    The error met by the background thread (if any) is raised by the next call to write_page() or close(). The file
+      being written is then closed and kept under its temporary name (with the pages written before the error, cf
+      get_failed_path).
+    Subclasses implement open_file(path), write_records(records), flush_file() and close_file() (abstract methods: a
+      sink missing one of them cannot be created).
+    """
+
+    QUEUE_SIZE = 4
+
+    # Suffix of the files being written
+    TEMPORARY_SUFFIX = ".tmp"
+
+    def __init__(self, path, max_records=None, max_bytes=None, queue_size=None):
+        """
+        Args:
+            path: Path of the file, with a "{part}" placeholder when files are rotated (str.format syntax).
+            max_records: Number of records after which a new file is started.
+            max_bytes: Size (in bytes) after which a new file is started.
+            queue_size: Maximum number of pages waiting to be written.
+        """
+        if (max_records or max_bytes) and "{part" not in path:
+            # To update
+            raise ValueError(
+                f"""The path of a rotating sink must contain a '{{part}}' placeholder (got '{path}')."""
+            )
+
+        self.__path = path
+        self.__max_records = max_records
+        self.__max_bytes = max_bytes
+        self.__pages = queue.Queue(maxsize=queue_size or self.QUEUE_SIZE)
+        self.__error = None
+        self.__closed = False
+
+        # Files written (and file being written)
+        self.__paths = []
+        self.__part = 0
+        self.__part_path = None
+        self.__part_records = 0
+        self.__num_records = 0
+        self.__failed_path = None
+
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_paths(self):
+        """Returns the paths of the files completely written."""
+        return list(self.__paths)
+
+    def get_num_records(self):
+        """Returns the number of records written."""
+        return self.__num_records
+
+    def get_failed_path(self):
+        """Returns the path of the file whose writing failed (None if no error was met)."""
+        return self.__failed_path
+
+    def write_page(self, records):
+        """
+        Hands a page of records (ObjectParser objects or dicts) over to the background thread.
+
+        Raises:
+            The error met by the background thread while writing the previous pages (if any).
+        """
+        self.__raise_error()
+        if self.__closed:
+            raise ValueError("The sink is closed.")
+        if records:
+            self.__pages.put(list(records))
+
+    def close(self):
+        """Writes the pages handed over, completes the current file and stops the background thread."""
+        if not self.__closed:
+            self.__closed = True
+            self.__pages.put(None)
+            self.__thread.join()
+        self.__raise_error()
+
+    def __raise_error(self):
+        """ [Hidden method]
+        Raises the error of the background thread (once).
+        """
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def __run(self):
+        """ [Hidden method]
+        Background loop: writes the pages one after another until the sink is closed.
+        """
+        failed = False
+        while True:
+            records = self.__pages.get()
+            if records is None:
+                break
+            if failed:
+                continue
+            try:
+                self.__write(records)
+            except Exception as error:
+                self.__error, failed = error, True
+                self.__keep_part()
+        if not failed and self.__part_path:
+            try:
+                self.__complete_part()
+            except Exception as error:
+                self.__error = error
+                self.__keep_part()
+
+    def __write(self, records):
+        """ [Hidden method]
+        Writes a page in the current file (started if needed) and completes the file when it reaches the limits.
+        """
+        if self.__part_path is None:
+            self.__part_path = self.__path.format(part=self.__part) if "{part" in self.__path else self.__path
+            self.open_file(self.__part_path + self.TEMPORARY_SUFFIX)
+        self.write_records(records)
+        self.flush_file()
+        self.__part_records += len(records)
+        self.__num_records += len(records)
+
+        if (self.__max_records and self.__part_records >= self.__max_records) or (
+                self.__max_bytes and os.path.getsize(self.__part_path + self.TEMPORARY_SUFFIX) >= self.__max_bytes
+        ):
+            self.__complete_part()
+
+    def __complete_part(self):
+        """ [Hidden method]
+        Closes the current file and gives it its final name.
+        """
+        self.close_file()
+        os.replace(self.__part_path + self.TEMPORARY_SUFFIX, self.__part_path)
+        self.__paths.append(self.__part_path)
+        self.__part += 1
+        self.__part_path, self.__part_records = None, 0
+
+    def __keep_part(self):
+        """ [Hidden method]
+        Closes the file being written (after an error) and keeps it under its temporary name: the pages written before
+          the error are not lost.
+        """
+        if self.__part_path:
+            try:
+                self.close_file()
+            except Exception:
+                pass
+            if os.path.exists(self.__part_path + self.TEMPORARY_SUFFIX):
+                self.__failed_path = self.__part_path + self.TEMPORARY_SUFFIX
+            self.__part_path = None
+
+    @abc.abstractmethod
+    def open_file(self, path):
+        """Opens a new file (called by the background thread)."""
+
+    @abc.abstractmethod
+    def write_records(self, records):
+        """Writes a list of records in the current file (called by the background thread)."""
+
+    @abc.abstractmethod
+    def flush_file(self):
+        """Flushes the current file after a page (called by the background thread)."""
+
+    @abc.abstractmethod
+    def close_file(self):
+        """Closes the current file (called by the background thread)."""
+
+
+class NdjsonSink(FileSink):
+    """
+    Writes one json object per line (gzip compressed by default).
+        Usage example:
+            >>> with NdjsonSink("ads.ndjson.gz") as sink:
+            >>>     cursor.write_to(sink)
+
+    Each page ends with a gzip sync point: the pages written so far can be read even if the crawl stops abruptly.
+    """
+
+    def __init__(self, path, compress=True, **kwargs):
+        """
+        Args:
+            path: Path of the file (cf FileSink).
+            compress: Whether the file is gzip compressed.
+            **kwargs: Rotation and queue options (cf FileSink).
+        """
+        self.__compress = compress
+        self.__file = None
+        self.__stream = None
+        super().__init__(path, **kwargs)
+
+    def open_file(self, path):
+        self.__file = open(path, "wb")
+        self.__stream = gzip.GzipFile(fileobj=self.__file, mode="wb") if self.__compress else self.__file
+
+    def write_records(self, records):
+        self.__stream.write("".join(
+            json.dumps(dict(record.items()), ensure_ascii=False) + "\n" for record in records
+        ).encode("utf-8"))
+
+    def flush_file(self):
+        self.__stream.flush()
+        self.__file.flush()
+
+    def close_file(self):
+        if self.__stream is not self.__file:
+            self.__stream.close()
+        self.__file.close()
+
+
+class CsvSink(FileSink):
+    """
+    Writes one row per record, with a header (lists and dicts are written as json strings).
+        Usage example:
+            >>> with CsvSink("ads-{part}.csv", fields=["id", "page_name", "spend"], max_records=100000) as sink:
+            >>>     cursor.write_to(sink)
+
+    Without fields, the columns are the fields of the first page (the fields appearing afterwards are not written).
+    """
+
+    def __init__(self, path, fields=None, **kwargs):
+        """
+        Args:
+            path: Path of the file (cf FileSink).
+            fields: The fields written as columns (default: the fields of the first page).
+            **kwargs: Rotation and queue options (cf FileSink).
+        """
+        self.__fields = list(fields) if fields else None
+        self.__file = None
+        self.__writer = None
+        super().__init__(path, **kwargs)
+
+    def open_file(self, path):
+        self.__file = open(path, "w", newline="", encoding="utf-8")
+        self.__writer = None
+
+    def write_records(self, records):
+        rows = [dict(record.items()) for record in records]
+        if self.__fields is None:
+            self.__fields = list(dict.fromkeys(field for row in rows for field in row))
+        if self.__writer is None:
+            self.__writer = csv.DictWriter(self.__file, fieldnames=self.__fields, extrasaction="ignore")
+            self.__writer.writeheader()
+        self.__writer.writerows(
+            {
+                field: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+                for field, value in row.items()
+            }
+            for row in rows
+        )
+
+    def flush_file(self):
+        self.__file.flush()
+
+    def close_file(self):
+        self.__file.close()
+
+
+class ParquetSink(FileSink):
+    """
+    Writes the records in Parquet files, with one row group per row_group_size records (cf ArrowBatchBuilder for the
+      column types).
+        Usage example:
+            >>> with ParquetSink("ads-{part}.parquet", row_group_size=50000, max_records=1000000) as sink:
+            >>>     cursor.write_to(sink)
+
+    Records are written (and flushed) by row groups: the records of an incomplete row group are kept in memory until
+      the group is complete or the file is closed.
+    Without schema, the schema of a file starts with the fields of its first row group and grows with the next ones:
+      the fields missing from a row group are written as nulls, and when a row group brings new fields (or the first
+      values of a column that only had nulls), the row groups already written are copied into a file with the extended
+      schema. With a schema, a row group that does not match it raises a ValueError.
+
+    Raises:
+        ImportError if pyarrow is not installed.
+    """
+
+    ROW_GROUP_SIZE = 10000
+    COMPRESSION = "snappy"
+
+    def __init__(self, path, row_group_size=None, schema=None, compression=None, **kwargs):
+        """
+        Args:
+            path: Path of the file (cf FileSink).
+            row_group_size: Number of records of each row group.
+            schema: The pyarrow.Schema of the files (default: built from the row groups, cf class description).
+            compression: Parquet compression codec.
+            **kwargs: Rotation and queue options (cf FileSink).
+        """
+        self.__pyarrow = import_pyarrow()
+        self.__row_group_size = row_group_size or self.ROW_GROUP_SIZE
+        self.__fixed_schema = schema
+        self.__schema = schema
+        self.__compression = compression or self.COMPRESSION
+        # The types of the columns are the same in all the files (cf ArrowBatchBuilder)
+        self.__builder = ArrowBatchBuilder(batch_size=self.__row_group_size)
+        self.__path = None
+        self.__writer = None
+        super().__init__(path, **kwargs)
+
+    def open_file(self, path):
+        self.__path = path
+        self.__schema = self.__fixed_schema
+        self.__writer = None
+
+    def write_records(self, records):
+        for batch in self.__builder.add(records):
+            self.__write_batch(batch)
+
+    def flush_file(self):
+        # Row groups are written once complete
+        pass
+
+    def close_file(self):
+        try:
+            for batch in self.__builder.flush():
+                self.__write_batch(batch)
+        finally:
+            # The row groups already written are kept even if the last one failed
+            if self.__writer is None:
+                self.__writer = self.__new_writer(self.__schema or self.__pyarrow.schema([]))
+            self.__writer.close()
+
+    def __new_writer(self, schema):
+        """ [Hidden method]
+        Opens the Parquet writer of the current file.
+        """
+        return self.__pyarrow.parquet.ParquetWriter(self.__path, schema, compression=self.__compression)
+
+    def __write_batch(self, batch):
+        """ [Hidden method]
+        Writes a batch as a row group, casting its columns to the schema of the file (extended if needed).
+        """
+        if self.__schema is None:
+            self.__schema = batch.schema
+        if self.__writer is None:
+            self.__writer = self.__new_writer(self.__schema)
+        conformed_batch = self.__conform(batch)
+        if conformed_batch is None and self.__fixed_schema is None:
+            self.__extend_schema(batch.schema)
+            conformed_batch = self.__conform(batch)
+        if conformed_batch is None:
+            # To update
+            raise ValueError(
+                f"""The fields of the records ({batch.schema}) do not match the schema of the Parquet file """
+                f"""({self.__schema}): provide the 'schema' of the sink."""
+            )
+        self.__writer.write_batch(conformed_batch, row_group_size=len(batch))
+
+    def __extend_schema(self, schema):
+        """ [Hidden method]
+        Extends the schema of the current file with the fields (and types) of another schema, copying the row groups
+          already written into a file with the extended schema. The schema is left unchanged if they do not match.
+        """
+        pyarrow = self.__pyarrow
+        try:
+            extended_schema = pyarrow.unify_schemas([self.__schema, schema], promote_options="permissive")
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            return
+
+        self.__writer.close()
+        previous_path = f"{self.__path}.previous"
+        os.replace(self.__path, previous_path)
+        self.__schema = extended_schema
+        self.__writer = self.__new_writer(extended_schema)
+        previous_file = pyarrow.parquet.ParquetFile(previous_path)
+        try:
+            for k in range(previous_file.num_row_groups):
+                for batch in previous_file.read_row_group(k).combine_chunks().to_batches():
+                    self.__writer.write_batch(self.__conform(batch), row_group_size=len(batch))
+        finally:
+            previous_file.close()
+        os.remove(previous_path)
+
+    def __conform(self, batch):
+        """ [Hidden method]
+        Returns the batch with the columns of the schema (in its order and types), None if it does not match.
+        """
+        if batch.schema.equals(self.__schema):
+            return batch
+
+        pyarrow = self.__pyarrow
+        if set(batch.schema.names) - set(self.__schema.names):
+            return None
+        columns = []
+        for field in self.__schema:
+            index = batch.schema.get_field_index(field.name)
+            if index < 0:
+                columns.append(pyarrow.nulls(len(batch), field.type))
+                continue
+            try:
+                columns.append(batch.column(index).cast(field.type))
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError):
+                return None
+
+        return pyarrow.RecordBatch.from_arrays(columns, schema=self.__schema)
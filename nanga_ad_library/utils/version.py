@@ -1,4 +1,3 @@
-import os
 import re
 import warnings
 
@@ -117,24 +116,15 @@ def get_default_api_version(api_name: str):
 
 def get_sdk_version():
     """
-    Retrieve the version of the SDK from __init__ file.
+    Retrieve the version of the SDK (__version__ of the package, set before its modules are imported).
 
     Returns:
         The stored version of the SDK.
     """
 
-    # Retrieve __init__ repo file
-    this_dir = os.path.dirname(__file__)
-    package_init_filename = os.path.join(this_dir, '../__init__.py')
-
-    # Extract __version__ from the init file
-    version = None
-    with open(package_init_filename, 'r') as handle:
-        file_content = handle.read()
-        version = "v" + re.search(
-            r'^__version__\s*=\s*[\'"]([^\'"]*)[\'"]',
-            file_content, re.MULTILINE
-        ).group(1)
+    from nanga_ad_library import __version__
+
+    version = f"v{__version__}" if __version__ else None
 
     # Check that the stored version is valid
     if not version:
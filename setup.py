@@ -17,6 +17,12 @@ PACKAGES = find_packages()
 INCLUDE_MANIFEST = True  # Inclure les fichiers définis dans MANIFEST.in
 PACKAGE_LICENSE = "GNU General Public License v3 (GPLv3) (gpl-3.0)"
 PACKAGE_DESCRIPTION = "The Nanga Ad Library developed by the ⭐️ Spark Tech team"
+PACKAGE_EXTRAS_REQUIRE = {
+    "async": ["httpx >= 0.27.0"],
+    "fast": ["orjson >= 3.8.0"],
+    "arrow": ["pyarrow >= 14.0.0"],
+    "pandas": ["pyarrow >= 14.0.0", "pandas >= 1.5.0"],
+}
 
 with open(readme_filename) as f:
     PACKAGE_LONG_DESCRIPTION = f.read()
@@ -49,6 +55,7 @@ setup(
     description=PACKAGE_DESCRIPTION,
     long_description=PACKAGE_LONG_DESCRIPTION,
     install_requires=PACKAGE_INSTALL_REQUIRES,
+    extras_require=PACKAGE_EXTRAS_REQUIRE,
     long_description_content_type="text/markdown",
     dependency_links=DEPENDENCY_LINKS
 )
\ No newline at end of file
@@ -0,0 +1,192 @@
+import io
+import json
+import time
+
+import pytest
+import requests
+
+from urllib.parse import urlsplit, parse_qsl
+from requests.models import Response
+
+"""
+Mocked Graph API transport shared by the tests: requests.Session.request (and httpx.AsyncClient.request) is replaced
+  by a fake API serving pages of ads (no network). Playwright can be replaced by a fake driver (no browser).
+"""
+
+# Number of ads returned by each query
+NUM_ADS = 12
+
+# Default number of ads per page (when the payload has no 'limit')
+PAGE_SIZE = 5
+
+PAYLOAD = {
+    "search_terms": "shoes",
+    "ad_reached_countries": ["FR"],
+    "fields": ["id", "page_name", "ad_delivery_start_time"],
+}
+
+
+class FakeGraphAPI:
+    """
+    Serves the Meta Ad Library pages of any query (NUM_ADS ads named after the search terms), the heavy fields of
+      nodes ('ids' param) and batch requests. Every request is recorded in calls (method, url and params).
+    Responses queued in errors (status, json body and optionally headers) are returned (one per request) before the normal responses, and the
+      requests made with an access token of invalid_tokens get an OAuth error. The items of a batch request whose
+      search terms are in batch_errors get the error (status, json body) stored for them (once). Each request takes
+      delay seconds.
+    """
+
+    INVALID_TOKEN_ERROR = {"error": {"message": "Invalid OAuth access token.", "type": "OAuthException", "code": 190}}
+
+    def __init__(self):
+        self.calls = []
+        self.errors = []
+        self.invalid_tokens = set()
+        self.batch_errors = {}
+        self.delay = 0
+
+    def request(self, session, method, url, params=None, data=None, **kwargs):
+        params = dict(params or data or {})
+        self.calls.append((method, url, params))
+        if self.delay:
+            time.sleep(self.delay)
+        headers = []
+        if params.get("access_token") in self.invalid_tokens:
+            status, body = 400, self.INVALID_TOKEN_ERROR
+        elif self.errors:
+            status, body, *headers = self.errors.pop(0)
+        elif "batch" in params:
+            status, body = 200, [
+                self.batch_item(dict(parse_qsl(urlsplit(item["relative_url"]).query)))
+                for item in json.loads(params["batch"])
+            ]
+        elif "ids" in params:
+            fields = params["fields"].split(",")
+            status, body = 200, {
+                ad_id: {"id": ad_id, **{field: f"{field}-{ad_id}" for field in fields}}
+                for ad_id in params["ids"].split(",")
+            }
+        else:
+            status, body = 200, self.page(params)
+
+        response = Response()
+        response.status_code = status
+        response.url = url
+        response.request = requests.Request(method, url, params=params).prepare()
+        response.headers["content-type"] = "application/json"
+        response.headers.update(*headers)
+        response._content = json.dumps(body).encode()
+        response.raw = io.BytesIO(response._content)
+
+        return response
+
+    def batch_item(self, params):
+        """Returns the response of a batch item (cf batch_errors)."""
+        status, body = self.batch_errors.pop(params.get("search_terms"), (200, self.page(params)))
+
+        return {"code": status, "body": json.dumps(body)}
+
+    @staticmethod
+    def page(params):
+        """Returns the page of the query starting after the 'after' token."""
+        start = int(params.get("after") or 0)
+        limit = int(params.get("limit") or PAGE_SIZE)
+        term = params.get("search_terms")
+        body = {"data": [
+            {"id": f"{term}-{k}", "page_name": term, "ad_delivery_start_time": "2025-01-01"}
+            for k in range(start, min(start + limit, NUM_ADS))
+        ]}
+        if start + limit < NUM_ADS:
+            body["paging"] = {"cursors": {"after": str(start + limit)}, "next": "next-page-url"}
+
+        return body
+
+    def get_calls(self, param):
+        """Returns the params of the requests having the given param."""
+        return [params for _, _, params in self.calls if param in params]
+
+
+@pytest.fixture
+def graph_api(monkeypatch):
+    """Replaces the http transport of the sync sessions by a FakeGraphAPI."""
+    api = FakeGraphAPI()
+    monkeypatch.setattr(requests.Session, "request", lambda session, *args, **kwargs: api.request(
+        session, *args, **kwargs
+    ))
+
+    return api
+
+
+@pytest.fixture
+def async_graph_api(monkeypatch):
+    """Replaces the http transport of the async sessions by a FakeGraphAPI."""
+    httpx = pytest.importorskip("httpx")
+    api = FakeGraphAPI()
+
+    async def request(client, method, url, params=None, data=None, **kwargs):
+        response = api.request(client, method, url, params=params, data=data)
+        return httpx.Response(
+            response.status_code, headers=dict(response.headers), content=response.content,
+            request=httpx.Request(method, url, params=params)
+        )
+
+    monkeypatch.setattr(httpx.AsyncClient, "request", request)
+
+    return api
+
+
+@pytest.fixture
+def payload():
+    return json.loads(json.dumps(PAYLOAD))
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        return FakeContext()
+
+    async def close(self):
+        self.connected = False
+
+
+class FakeContext:
+    async def close(self):
+        pass
+
+
+class FakeChromium:
+    def __init__(self, launches):
+        self.launches = launches
+
+    async def launch(self, **kwargs):
+        self.launches.append(kwargs)
+        return FakeBrowser()
+
+
+class FakePlaywright:
+    def __init__(self, launches):
+        self.chromium = FakeChromium(launches)
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def launches(monkeypatch):
+    """Replaces Playwright by a fake driver and returns the list of the browsers launched."""
+    pytest.importorskip("playwright")
+    from nanga_ad_library.ad_downloaders import playwright_runtime, MetaAdDownloader, PlaywrightRuntime
+
+    launches = []
+    monkeypatch.setattr(playwright_runtime, "async_playwright", lambda: FakePlaywright(launches))
+    monkeypatch.setattr(MetaAdDownloader, "CONTEXT_DELAY", 0)
+    yield launches
+    PlaywrightRuntime.get_shared().close()
@@ -0,0 +1,91 @@
+import asyncio
+import os
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary, AsyncNangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError
+
+"""
+Async cursors hand over the same records as the sync ones (cf AsyncResultCursor).
+"""
+
+ALL_IDS = [f"shoes-{k}" for k in range(12)]
+
+
+def sync_ids(payload, **kwargs):
+    return [record.get("id") for record in NangaAdLibrary.init("meta", payload=payload, **kwargs).get_results()]
+
+
+async def collect_ids(payload, **kwargs):
+    async with AsyncNangaAdLibrary.init("meta", access_token="token", payload=payload, **kwargs) as library:
+        cursor = await library.get_results()
+        return [record.get("id") async for record in cursor]
+
+
+@pytest.mark.parametrize("options", [{}, {"prefetch_pages": 2}, {"adaptive_page_size": True}])
+def test_async_cursor_hands_over_the_records_of_the_sync_one(graph_api, async_graph_api, payload, options):
+    ids = asyncio.run(collect_ids(payload, **options))
+
+    assert ids == sync_ids(payload, access_token="token", **options) == ALL_IDS
+    assert [params.get("after") for params in async_graph_api.get_calls("search_terms")] == [
+        params.get("after") for params in graph_api.get_calls("search_terms")
+    ]
+
+
+def test_async_cursor_hands_over_the_pages_of_the_sync_one(async_graph_api, payload):
+    async def collect_pages():
+        async with AsyncNangaAdLibrary.init("meta", access_token="token", payload=payload) as library:
+            cursor = await library.get_results()
+            return [[record.get("id") for record in page] async for page in cursor.iter_pages()]
+
+    assert asyncio.run(collect_pages()) == [ALL_IDS[:5], ALL_IDS[5:10], ALL_IDS[10:]]
+
+
+def test_async_cursor_loads_the_heavy_fields(async_graph_api, payload):
+    payload["fields"] = payload["fields"] + ["demographic_distribution"]
+
+    async def load_heavy_fields():
+        async with AsyncNangaAdLibrary.init(
+            "meta", access_token="token", payload=payload, lazy_heavy_fields=True
+        ) as library:
+            cursor = await library.get_results()
+            await cursor.load()
+            return await cursor.load_heavy_fields()
+
+    records = asyncio.run(load_heavy_fields())
+
+    assert [record.get("demographic_distribution") for record in records] == [
+        f"demographic_distribution-shoes-{k}" for k in range(5)
+    ]
+    assert "demographic_distribution" not in async_graph_api.get_calls("search_terms")[0]["fields"]
+
+
+def test_async_failed_page_raises_and_keeps_the_checkpoint(async_graph_api, payload, tmp_path):
+    path = str(tmp_path / "crawl.json")
+    ids = []
+
+    async def crawl():
+        async with AsyncNangaAdLibrary.init(
+            "meta", access_token="token", payload=payload, checkpoint_path=path
+        ) as library:
+            cursor = await library.get_results()
+            async_graph_api.errors = [(400, async_graph_api.INVALID_TOKEN_ERROR)]
+            async for record in cursor:
+                ids.append(record.get("id"))
+
+    with pytest.raises(PlatformRequestError):
+        asyncio.run(crawl())
+
+    assert ids == ALL_IDS[:5] and os.path.exists(path)
+    assert ids + asyncio.run(collect_ids(payload, checkpoint_path=path)) == ALL_IDS
+    assert not os.path.exists(path)
+
+
+def test_async_crawl_state_is_shared_with_the_sync_one(graph_api, async_graph_api, payload, tmp_path):
+    path = str(tmp_path / "crawl.db")
+
+    first_ids = asyncio.run(collect_ids(payload, incremental_path=path))
+
+    assert first_ids == ALL_IDS
+    assert sync_ids(payload, access_token="token", incremental_path=path) == []
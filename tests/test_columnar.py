@@ -0,0 +1,59 @@
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.utils import ArrowBatchBuilder
+
+pyarrow = pytest.importorskip("pyarrow")
+
+"""
+Columnar export of the records (cf ArrowBatchBuilder).
+"""
+
+
+def build_table(*pages):
+    builder = ArrowBatchBuilder()
+    return ArrowBatchBuilder.concat([batch for page in pages for batch in builder.add(page)])
+
+
+def test_cursor_is_exported_as_typed_columns(graph_api, payload):
+    table = NangaAdLibrary.init("meta", access_token="token", payload=payload).get_results().to_arrow()
+
+    assert table.num_rows == 12
+    assert table.column("id").to_pylist() == [f"shoes-{k}" for k in range(12)]
+    assert pyarrow.types.is_timestamp(table.schema.field("ad_delivery_start_time").type)
+    assert pyarrow.types.is_dictionary(table.schema.field("page_name").type)
+
+
+def test_json_column_stays_json_on_the_next_pages():
+    table = build_table(
+        [{"id": "1", "spend": "n/a"}, {"id": "2", "spend": {"lower_bound": "0"}}],
+        [{"id": "3", "spend": {"lower_bound": "100"}}],
+    )
+
+    assert table.column("spend").to_pylist() == ['"n/a"', '{"lower_bound": "0"}', '{"lower_bound": "100"}']
+
+
+def test_next_pages_are_cast_to_the_type_of_the_first_one():
+    table = build_table(
+        [{"id": "1", "spend": {"lower_bound": "0", "upper_bound": "99"}, "impressions": None}],
+        [{"id": "2", "spend": {"lower_bound": "100"}, "impressions": {"lower_bound": "5"}}],
+        [{"id": "3", "spend": {"lower_bound": "200", "upper_bound": "299"}}],
+    )
+
+    assert table.column("spend").to_pylist() == [
+        {"lower_bound": "0", "upper_bound": "99"},
+        {"lower_bound": "100", "upper_bound": None},
+        {"lower_bound": "200", "upper_bound": "299"},
+    ]
+    assert table.column("impressions").to_pylist() == [None, {"lower_bound": "5"}, None]
+
+
+def test_values_that_cannot_be_cast_become_nulls():
+    builder = ArrowBatchBuilder()
+    builder.add([{"id": "1", "ad_delivery_start_time": "2025-01-01"}])
+
+    with pytest.warns(UserWarning):
+        batch, = builder.add([{"id": "2", "ad_delivery_start_time": "unknown"}])
+
+    assert batch.column(1).type == builder.get_types()["ad_delivery_start_time"]
+    assert batch.column(1).to_pylist() == [None]
@@ -0,0 +1,56 @@
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError
+from nanga_ad_library.utils import CrawlState
+
+"""
+Incremental crawling: high-water mark and content hashes of the ads already handed over (cf CrawlState).
+"""
+
+ALL_IDS = [f"shoes-{k}" for k in range(12)]
+
+
+def init_library(payload, path, **kwargs):
+    return NangaAdLibrary.init("meta", access_token="token", payload=payload, incremental_path=path, **kwargs)
+
+
+def test_next_run_only_hands_over_new_ads(graph_api, payload, tmp_path):
+    path = str(tmp_path / "crawl.db")
+
+    first_ids = [record.get("id") for record in init_library(payload, path).get_results()]
+    library = init_library(payload, path)
+    next_ids = [record.get("id") for record in library.get_results()]
+
+    assert first_ids == ALL_IDS and next_ids == []
+    state = library.load_crawl_state()
+    assert state.get_high_water_mark() == "2025-01-01" and state.get_num_seen_ads() == 12
+    assert graph_api.get_calls("search_terms")[-1].get("ad_delivery_date_min") == "2025-01-01"
+
+
+def test_changed_ads_are_handed_over_again(tmp_path):
+    rows = [{"id": "1", "page_name": "a", "ad_delivery_start_time": "2025-01-02"}, {"id": "2", "page_name": "b"}]
+    state = CrawlState(str(tmp_path / "crawl.db"), "query")
+    state.filter_rows(rows)
+    state.complete()
+
+    next_state = CrawlState(str(tmp_path / "crawl.db"), "query")
+    kept = next_state.filter_rows([dict(rows[0], page_name="c"), rows[1], {"id": "3"}])
+
+    assert [row["id"] for row in kept] == ["1", "3"]
+    assert next_state.get_date_min("2024-12-31") == "2025-01-02"
+    assert next_state.get_date_min("2025-02-01") == "2025-02-01"
+
+
+def test_failed_page_does_not_save_the_crawl_state(graph_api, payload, tmp_path):
+    path = str(tmp_path / "crawl.db")
+    cursor = init_library(payload, path, max_error_retries=0).get_results()
+    graph_api.errors = [(500, {"error": {"message": "Service unavailable", "code": 1}})]
+
+    with pytest.raises(PlatformRequestError):
+        list(cursor)
+
+    library = init_library(payload, path)
+    state = library.load_crawl_state()
+    assert state.get_high_water_mark() is None and state.get_num_seen_ads() == 0
+    assert [record.get("id") for record in library.get_results()] == ALL_IDS
@@ -0,0 +1,193 @@
+import asyncio
+import time
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary, AsyncNangaAdLibrary
+from nanga_ad_library.utils import DownloadPipeline
+
+"""
+Pagination and ad elements downloading running concurrently (cf DownloadPipeline).
+"""
+
+NUM_PAGES = 10
+PAGE_SIZE = 2
+
+
+def page(number):
+    response = {"data": [{"id": f"{number}-{k}"} for k in range(PAGE_SIZE)]}
+    if number < NUM_PAGES:
+        response["paging"] = {"cursors": {"after": str(number + 1)}, "next": "next-page-url"}
+
+    return response
+
+
+ALL_IDS = {f"{number}-{k}" for number in range(1, NUM_PAGES + 1) for k in range(PAGE_SIZE)}
+
+
+class FakePages:
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.fetched = [1]
+
+    async def fetch(self, after_token):
+        number = int(after_token)
+        self.fetched.append(number)
+        if number == self.fail_at:
+            raise ValueError(f"Page {number} failed")
+        return page(number)
+
+
+class FakeDownloader:
+    MAX_BATCH_SIZE = 1
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.allowed = asyncio.Event()
+        self.allowed.set()
+
+    async def download_from_new_batch(self, batch):
+        await self.allowed.wait()
+        if any(record.get("id") == self.fail_on for record in batch):
+            raise RuntimeError(f"Download of {self.fail_on} failed")
+        for record in batch:
+            record.update({"ad_elements": {"body": f"body-{record.get('id')}"}})
+        return batch
+
+
+async def read_all(pipeline):
+    ids = []
+    while True:
+        records = await pipeline.next_records()
+        if not records:
+            return ids
+        ids += [record.get("id") for record in records]
+
+
+def test_all_records_are_downloaded_and_handed_over():
+    async def run():
+        pipeline = DownloadPipeline(FakePages().fetch, FakeDownloader(), page(1), workers=3)
+        task = asyncio.create_task(pipeline.run())
+        records = []
+        while batch := await pipeline.next_records():
+            records += batch
+        await task
+        return records
+
+    records = asyncio.run(run())
+
+    assert {record.get("id") for record in records} == ALL_IDS and len(records) == len(ALL_IDS)
+    assert all(record.get("ad_elements") for record in records)
+
+
+def test_pages_are_not_fetched_while_the_queue_is_full():
+    async def run():
+        pages, downloader = FakePages(), FakeDownloader()
+        downloader.allowed.clear()
+        pipeline = DownloadPipeline(pages.fetch, downloader, page(1), workers=1, queue_size=2)
+        task = asyncio.create_task(pipeline.run())
+        for _ in range(50):
+            await asyncio.sleep(0)
+        fetched_while_blocked = list(pages.fetched)
+
+        downloader.allowed.set()
+        ids = await read_all(pipeline)
+        await task
+        return fetched_while_blocked, ids
+
+    fetched_while_blocked, ids = asyncio.run(run())
+
+    # 1 batch being downloaded, 2 batches queued and the producer waiting to queue the 4th one
+    assert fetched_while_blocked == [1, 2]
+    assert set(ids) == ALL_IDS
+
+
+def test_producer_error_is_raised_after_the_records_already_queued():
+    async def run():
+        pipeline = DownloadPipeline(FakePages(fail_at=3).fetch, FakeDownloader(), page(1), workers=2)
+        task = asyncio.create_task(pipeline.run())
+        ids = []
+        with pytest.raises(ValueError, match="Page 3 failed"):
+            while True:
+                ids += [record.get("id") for record in await pipeline.next_records()]
+        await asyncio.wait_for(task, timeout=1)
+        return ids, await pipeline.next_records()
+
+    ids, next_records = asyncio.run(run())
+
+    assert set(ids) == {f"{number}-{k}" for number in (1, 2) for k in range(PAGE_SIZE)}
+    assert next_records == []
+
+
+def test_download_error_is_raised_and_the_pipeline_still_ends():
+    async def run():
+        pipeline = DownloadPipeline(FakePages().fetch, FakeDownloader(fail_on="2-1"), page(1), workers=2)
+        task = asyncio.create_task(pipeline.run())
+        ids, errors = [], []
+        while True:
+            try:
+                records = await pipeline.next_records()
+            except RuntimeError as error:
+                errors.append(str(error))
+                continue
+            if not records:
+                break
+            ids += [record.get("id") for record in records]
+        await asyncio.wait_for(task, timeout=1)
+        return ids, errors
+
+    ids, errors = asyncio.run(run())
+
+    assert errors == ["Download of 2-1 failed"]
+    assert set(ids) == ALL_IDS - {"2-1"}
+
+
+def test_blocking_fetch_runs_in_a_thread():
+    def fetch(after_token):
+        return page(int(after_token))
+
+    async def run():
+        pipeline = DownloadPipeline(fetch, FakeDownloader(), page(1), blocking_fetch=True)
+        task = asyncio.create_task(pipeline.run())
+        ids = await read_all(pipeline)
+        await task
+        return ids
+
+    assert set(asyncio.run(run())) == ALL_IDS
+
+
+def test_cursor_stops_its_pipeline_on_error(graph_api, payload):
+    payload["limit"] = 1
+    graph_api.delay = 0.02
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload)
+    cursor = NangaAdLibrary(
+        library.get_session(), library.get_ad_library(), FakeDownloader(fail_on="shoes-0"), download_workers=1
+    ).get_results()
+
+    with pytest.raises(RuntimeError):
+        list(cursor)
+    num_calls = len(graph_api.calls)
+    time.sleep(0.2)
+
+    # Only the page being fetched when the pipeline was stopped is still queried
+    assert len(graph_api.calls) <= num_calls + 1 < 12
+
+
+def test_async_cursor_stops_its_pipeline_on_error(async_graph_api, payload):
+    payload["limit"] = 1
+    async_graph_api.delay = 0.01
+
+    async def run():
+        async with AsyncNangaAdLibrary.init("meta", access_token="token", payload=payload) as library:
+            cursor = await AsyncNangaAdLibrary(
+                library.get_session(), library.get_ad_library(), FakeDownloader(fail_on="shoes-0"), download_workers=1
+            ).get_results()
+            with pytest.raises(RuntimeError):
+                [record async for record in cursor]
+            num_calls = len(async_graph_api.calls)
+            await asyncio.sleep(0.1)
+            return num_calls
+
+    num_calls = asyncio.run(run())
+
+    assert len(async_graph_api.calls) == num_calls < 12
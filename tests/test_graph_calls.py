@@ -0,0 +1,73 @@
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError
+
+"""
+Requests that are not paginated: heavy fields loads ('ids' param) and Graph API batch requests.
+"""
+
+AUTH_PARAMS = {"access_token", "appsecret_proof"}
+
+
+def test_batch_requests_only_send_their_own_params(graph_api, payload):
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload)
+    payloads = [dict(payload, search_terms=f"brand{k}") for k in range(3)]
+
+    cursors = library.get_batch_results(payloads)
+
+    assert [[record.get("id") for record in cursor] for cursor in cursors] == [
+        [f"brand{k}-{i}" for i in range(12)] for k in range(3)
+    ]
+    for params in graph_api.get_calls("batch"):
+        assert set(params) - AUTH_PARAMS == {"batch", "include_headers"}
+
+
+def test_heavy_fields_and_batch_requests_do_not_share_params(graph_api, payload):
+    payload["fields"] = payload["fields"] + ["demographic_distribution"]
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, lazy_heavy_fields=True)
+
+    records = list(library.get_results())
+    library.load_heavy_fields(records)
+    library.get_batch_results([dict(payload, search_terms="other")])
+    library.load_heavy_fields([{"id": "other-0"}])
+
+    assert records[0].get("demographic_distribution") == "demographic_distribution-shoes-0"
+    assert graph_api.get_calls("ids")
+    for params in graph_api.get_calls("ids"):
+        assert set(params) - AUTH_PARAMS == {"ids", "fields"}
+    for params in graph_api.get_calls("batch"):
+        assert set(params) - AUTH_PARAMS == {"batch", "include_headers"}
+
+
+def test_batch_items_failing_with_a_transient_error_are_queried_again(graph_api, payload):
+    graph_api.batch_errors["brand1"] = (500, {"error": {"message": "Unknown error.", "code": 2, "is_transient": True}})
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, retry_base_delay=0.001)
+    payloads = [dict(payload, search_terms=f"brand{k}") for k in range(3)]
+
+    cursors = library.get_batch_results(payloads)
+
+    assert [len(list(cursor)) for cursor in cursors] == [12, 12, 12]
+    calls = [params for params in graph_api.get_calls("search_terms") if params.get("search_terms") == "brand1"]
+    assert [params.get("after") for params in calls] == [None, "5", "10"]
+
+
+def test_batch_items_asking_for_less_data_are_queried_again_with_a_lower_limit(graph_api, payload):
+    graph_api.batch_errors["brand0"] = (500, {"error": {"message": "Please reduce the amount of data.", "code": 1}})
+    payload["limit"] = 10
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, adaptive_page_size=True)
+
+    cursor, = library.get_batch_results([dict(payload, search_terms="brand0")])
+
+    assert len(list(cursor)) == 12
+    assert int(graph_api.get_calls("search_terms")[0].get("limit")) == 5
+
+
+def test_batch_items_failing_with_a_permanent_error_raise(graph_api, payload):
+    graph_api.batch_errors["brand1"] = (400, {"error": {"message": "Invalid parameter", "code": 100}})
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload)
+
+    with pytest.raises(PlatformRequestError):
+        library.get_batch_results([dict(payload, search_terms=f"brand{k}") for k in range(3)])
+
+    assert not graph_api.get_calls("search_terms")
@@ -0,0 +1,103 @@
+import json
+import threading
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.utils import JsonPageStream
+
+"""
+Pages parsed while their body is received (cf JsonPageStream).
+"""
+
+PAGE = {
+    "data": [
+        {"id": "1", "page_name": "Été ☀ 😀", "spend": {"lower_bound": "100", "upper_bound": "199"}},
+        {"id": "2", "page_name": "naïve \"quoted\" \\ name", "impressions": 123456789, "languages": ["fr", "日本語"]},
+        {"id": "3", "page_name": "", "publisher_platforms": []},
+    ],
+    "paging": {"cursors": {"after": "QVFI=="}, "next": "https://next"},
+}
+BODY = json.dumps(PAGE, ensure_ascii=False).encode("utf-8")
+
+
+def split(body, chunk_size):
+    return [body[k:k + chunk_size] for k in range(0, len(body), chunk_size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 64, len(BODY)])
+def test_rows_are_parsed_whatever_the_chunk_boundaries(chunk_size):
+    stream = JsonPageStream(split(BODY, chunk_size))
+
+    assert list(stream) == PAGE["data"]
+    assert stream.is_over() and stream.get_envelope() == {"paging": PAGE["paging"]}
+
+
+def test_multibyte_characters_split_between_chunks():
+    body = '{"data": [{"page_name": "😀😀"}]}'.encode("utf-8")
+    emoji_start = body.index("😀".encode("utf-8"))
+    chunks = [body[:emoji_start + 1], body[emoji_start + 1:emoji_start + 6], body[emoji_start + 6:]]
+
+    assert list(JsonPageStream(chunks)) == [{"page_name": "😀😀"}]
+
+
+def test_rows_are_handed_over_before_the_end_of_the_body():
+    chunks = iter(split(BODY, 16))
+    stream = JsonPageStream(chunks)
+
+    assert next(stream) == PAGE["data"][0]
+    assert not stream.is_over() and next(chunks, None) is not None
+
+
+def test_envelope_before_the_rows_and_empty_pages():
+    body = b'{"paging": {"cursors": {"after": "abc"}}, "data": [], "summary": 0}'
+
+    stream = JsonPageStream(split(body, 4))
+
+    assert list(stream) == [] and stream.get_envelope() == {"paging": {"cursors": {"after": "abc"}}, "summary": 0}
+
+
+def test_invalid_body_raises():
+    with pytest.raises(ValueError):
+        list(JsonPageStream(split(b'{"data": [{"id": "1"}, {"id": ', 4)))
+
+
+def test_response_is_released_once():
+    released = []
+    stream = JsonPageStream(split(BODY, 8), close=lambda: released.append(True))
+
+    list(stream)
+    stream.close()
+
+    assert released == [True]
+
+
+def test_streamed_page_keeps_its_request_limiter_slot_until_it_is_read(graph_api, payload):
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, stream_pages=True)
+    request_limiter = threading.BoundedSemaphore(1)
+    library.set_request_limiter(request_limiter)
+    records = library.get_results().iter_records()
+
+    [next(records) for _ in range(6)]
+    assert not request_limiter.acquire(blocking=False)
+    list(records)
+    assert request_limiter.acquire(blocking=False)
+
+
+def test_lazy_fields_of_a_streamed_page_can_be_loaded_with_a_single_request_slot(graph_api, payload):
+    payload["fields"] = payload["fields"] + ["demographic_distribution"]
+    library = NangaAdLibrary.init(
+        "meta", access_token="token", payload=payload, stream_pages=True, lazy_heavy_fields=True
+    )
+    library.set_request_limiter(threading.BoundedSemaphore(1))
+    values = []
+
+    def read_records():
+        values.extend(record.demographic_distribution for record in library.get_results().iter_records())
+
+    reader = threading.Thread(target=read_records, daemon=True)
+    reader.start()
+    reader.join(timeout=5)
+
+    assert not reader.is_alive()
+    assert values == [f"demographic_distribution-shoes-{k}" for k in range(12)]
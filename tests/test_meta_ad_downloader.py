@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from nanga_ad_library.ad_downloaders import MetaAdDownloader
+
+"""
+Concurrent scraping of the ads of a batch (the scraping of each ad is stubbed: no page is opened).
+"""
+
+ADS = [{"id": str(k), "ad_delivery_start_time": "2025-01-01"} for k in range(7)]
+
+
+@pytest.fixture
+def scraped(monkeypatch, launches):
+    """Stubs the scraping of an ad (failing for the ids in scraped["failing"]) and returns its state."""
+    state = {"failing": set(), "running": 0, "max_running": 0}
+
+    async def download_ad_elements(self, context, ad_payload):
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        # The first ads are the slowest
+        await asyncio.sleep(0.002 * (len(ADS) - int(ad_payload["id"])))
+        state["running"] -= 1
+        if ad_payload["id"] in state["failing"]:
+            raise RuntimeError(f"Page of ad {ad_payload['id']} crashed")
+        ad_payload.update({"ad_elements": {"body": f"body-{ad_payload['id']}", "spotted": False}})
+        return ad_payload
+
+    monkeypatch.setattr(MetaAdDownloader, "_MetaAdDownloader__download_ad_elements_from_public", download_ad_elements)
+
+    return state
+
+
+def new_batch():
+    return [dict(ad) for ad in ADS]
+
+
+def test_ads_are_handed_over_in_the_input_order(scraped):
+    with MetaAdDownloader(pages_per_context=3, contexts_per_browser=2) as downloader:
+        batch = downloader.download_batch(new_batch())
+
+    assert [ad["id"] for ad in batch] == [ad["id"] for ad in ADS]
+    assert [ad["ad_elements"]["body"] for ad in batch] == [f"body-{ad['id']}" for ad in ADS]
+    # 2 contexts of 3 pages at most
+    assert 3 < scraped["max_running"] <= 6
+
+
+def test_failed_ad_does_not_affect_the_others(scraped, capsys):
+    scraped["failing"].update({"1", "5"})
+
+    with MetaAdDownloader(pages_per_context=3) as downloader:
+        batch = downloader.download_batch(new_batch())
+
+    assert [ad["id"] for ad in batch] == [ad["id"] for ad in ADS]
+    assert [ad["ad_elements"]["body"] for ad in batch] == [
+        None if ad["id"] in {"1", "5"} else f"body-{ad['id']}" for ad in ADS
+    ]
+    assert batch[1]["ad_elements"] == {"body": None, "type": None, "carousel": [], "spotted": False}
+    assert "Page of ad 5 crashed" in capsys.readouterr().out
+
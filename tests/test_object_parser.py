@@ -0,0 +1,101 @@
+import json
+import pickle
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.utils import CompactObjectParser, LazyObjectParser
+
+"""
+Records built by the object parsers (compact records sharing their values).
+"""
+
+FIELDS = ["id", "page_name", "spend", "publisher_platforms"]
+
+
+def test_compact_records_cannot_modify_shared_values():
+    parser = CompactObjectParser.for_fields(FIELDS)
+    row = {"id": "1", "page_name": "nanga", "spend": {"lower_bound": "0"}, "publisher_platforms": ["facebook"]}
+    first, second = parser(**row), parser(**dict(row, id="2"))
+
+    row["publisher_platforms"].append("instagram")
+    with pytest.raises(TypeError):
+        first.publisher_platforms.append("instagram")
+    with pytest.raises(TypeError):
+        first["spend"]["lower_bound"] = "100"
+    first.update({"publisher_platforms": ["messenger"]})
+
+    assert second.publisher_platforms == ["facebook"] and second.spend == {"lower_bound": "0"}
+    assert first.publisher_platforms == ["messenger"]
+    assert json.loads(repr(second)) == dict(row, id="2", publisher_platforms=["facebook"])
+
+
+def test_compact_records_can_be_pickled():
+    record = CompactObjectParser.for_fields(FIELDS)(id="1", spend={"lower_bound": "0"}, publisher_platforms=["a"])
+
+    copy = pickle.loads(pickle.dumps(record))
+
+    assert dict(copy.items()) == dict(record.items())
+
+
+def test_compact_records_with_lazy_heavy_fields_warn(graph_api, payload):
+    payload["fields"] = payload["fields"] + ["demographic_distribution"]
+    library = NangaAdLibrary.init(
+        "meta", access_token="token", payload=payload, lazy_heavy_fields=True, compact_records=True
+    )
+
+    with pytest.warns(UserWarning):
+        records = list(library.get_results())
+
+    assert isinstance(records[0], LazyObjectParser)
+
+
+def test_lazy_records_of_a_page_are_loaded_together(graph_api, payload):
+    payload["fields"] = payload["fields"] + ["demographic_distribution"]
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, lazy_heavy_fields=True)
+
+    records = list(library.get_results())
+    first_page_values = [record.demographic_distribution for record in records[:5]]
+    records[7].get("demographic_distribution")
+
+    assert first_page_values == [f"demographic_distribution-shoes-{k}" for k in range(5)]
+    assert [params["ids"] for params in graph_api.get_calls("ids")] == [
+        ",".join(f"shoes-{k}" for k in range(5)), ",".join(f"shoes-{k}" for k in range(5, 10))
+    ]
+
+
+def test_lazy_field_that_cannot_be_loaded_gets_the_default_value(graph_api, payload):
+    payload["fields"] = payload["fields"] + ["demographic_distribution"]
+    library = NangaAdLibrary.init(
+        "meta", access_token="token", payload=payload, lazy_heavy_fields=True, max_error_retries=0
+    )
+    record = next(iter(library.get_results()))
+    graph_api.errors = [(500, {"error": {"message": "Service unavailable", "code": 1}})]
+
+    with pytest.warns(UserWarning):
+        assert record.get("demographic_distribution", "n/a") == "n/a"
+
+    assert record.get("demographic_distribution") == "demographic_distribution-shoes-0"
+
+
+def test_intern_table_keeps_the_most_recently_used_values(monkeypatch):
+    monkeypatch.setattr(CompactObjectParser, "MAX_INTERNED", 2)
+    CompactObjectParser.clear()
+    parser = CompactObjectParser.for_fields(FIELDS)
+    records = [parser(id=str(k), page_name="".join(["page-", name])) for k, name in enumerate("abac")]
+
+    assert CompactObjectParser.get_num_interned() == 2
+    # "b" was dropped from the table, "a" was kept (used again after "b")
+    assert parser(id="4", page_name="".join(["page-", "a"])).page_name is records[0].page_name
+    assert parser(id="5", page_name="".join(["page-", "b"])).page_name is not records[1].page_name
+
+
+def test_cleared_intern_table_leaves_the_records_unchanged():
+    parser = CompactObjectParser.for_fields(FIELDS)
+    record = parser(id="1", page_name="nanga", spend={"lower_bound": "0"})
+
+    CompactObjectParser.clear()
+
+    assert CompactObjectParser.get_num_interned() == 0
+    assert record.page_name == "nanga" and record.spend == {"lower_bound": "0"}
+    assert parser(id="2", spend={"lower_bound": "0"}).spend is not record.spend
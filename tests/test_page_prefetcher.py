@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError
+from nanga_ad_library.utils import PagePrefetcher
+
+"""
+Next pages fetched in a background thread (cf PagePrefetcher).
+"""
+
+NUM_PAGES = 6
+
+
+class FakePages:
+    """Serves NUM_PAGES pages (the 'after' token of a page is its number), failing at the page given in fail_at."""
+
+    def __init__(self, fail_at=None, delay=0):
+        self.fail_at = fail_at
+        self.delay = delay
+        self.fetched = []
+
+    def fetch(self, after_token):
+        number = int(after_token)
+        self.fetched.append(number)
+        # The first pages are the slowest: they are still handed over first
+        time.sleep(self.delay * (NUM_PAGES - number))
+        if number == self.fail_at:
+            raise ValueError(f"Page {number} failed")
+        page = {"data": [{"id": f"{number}-{k}"} for k in range(2)]}
+        if number < NUM_PAGES:
+            page["paging"] = {"cursors": {"after": str(number + 1)}, "next": "next-page-url"}
+
+        return page
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    return condition()
+
+
+def test_pages_are_handed_over_in_order():
+    pages = FakePages(delay=0.002)
+    prefetcher = PagePrefetcher(pages.fetch, "1", depth=3)
+
+    responses = [prefetcher.next_response() for _ in range(NUM_PAGES)]
+
+    assert [response["data"][0]["id"] for response in responses] == [f"{k}-0" for k in range(1, NUM_PAGES + 1)]
+    assert wait_for(lambda: not prefetcher.is_alive())
+
+
+def test_pages_fetched_in_advance_are_bounded_by_the_depth():
+    pages = FakePages()
+    prefetcher = PagePrefetcher(pages.fetch, "1", depth=2)
+
+    # 2 pages in the queue and 1 waiting for some room
+    assert wait_for(lambda: len(pages.fetched) == 3)
+    time.sleep(0.05)
+    assert pages.fetched == [1, 2, 3]
+    prefetcher.next_response()
+    assert wait_for(lambda: len(pages.fetched) == 4)
+    prefetcher.stop()
+
+
+def test_error_is_raised_when_its_page_is_read():
+    pages = FakePages(fail_at=3)
+    prefetcher = PagePrefetcher(pages.fetch, "1", depth=4)
+
+    assert prefetcher.next_response()["data"][0]["id"] == "1-0"
+    assert prefetcher.next_response()["data"][0]["id"] == "2-0"
+    with pytest.raises(ValueError, match="Page 3 failed"):
+        prefetcher.next_response()
+    assert pages.fetched == [1, 2, 3] and not prefetcher.is_alive()
+
+
+def test_stopped_prefetcher_stops_fetching():
+    pages = FakePages()
+    prefetcher = PagePrefetcher(pages.fetch, "1", depth=1)
+    assert wait_for(lambda: len(pages.fetched) == 2)
+
+    prefetcher.stop()
+
+    assert not prefetcher.is_alive()
+    time.sleep(3 * PagePrefetcher.POLL_INTERVAL)
+    assert pages.fetched == [1, 2]
+
+
+def test_prefetching_cursor_hands_over_the_same_records(graph_api, payload):
+    records = list(NangaAdLibrary.init("meta", access_token="token", payload=payload).get_results())
+    prefetched_records = list(
+        NangaAdLibrary.init("meta", access_token="token", payload=payload, prefetch_pages=2).get_results()
+    )
+
+    assert [record.get("id") for record in prefetched_records] == [record.get("id") for record in records]
+
+
+def test_prefetching_cursor_raises_the_error_of_a_page(graph_api, payload):
+    cursor = NangaAdLibrary.init(
+        "meta", access_token="token", payload=payload, prefetch_pages=2, max_error_retries=0
+    ).get_results()
+    graph_api.errors = [(500, {"error": {"message": "Service unavailable", "code": 1}})]
+    ids = []
+
+    with pytest.raises(PlatformRequestError):
+        for record in cursor:
+            ids.append(record.get("id"))
+
+    assert ids == [f"shoes-{k}" for k in range(5)]
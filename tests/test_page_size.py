@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError
+from nanga_ad_library.utils import AdaptivePageSize, PlatformResponse
+
+"""
+Number of records requested per page, adapted to the weight of the query (cf AdaptivePageSize).
+"""
+
+TOO_MUCH_DATA_ERROR = (500, {"error": {"message": "Please reduce the amount of data you're asking for", "code": 1}})
+
+
+def response(status=200, body=None):
+    return PlatformResponse(json.dumps(body or {"data": []}).encode(), status, call={"method": "GET"})
+
+
+def too_much_data_response():
+    return response(*TOO_MUCH_DATA_ERROR)
+
+
+def test_limit_is_halved_when_the_api_asks_for_less_data():
+    page_size = AdaptivePageSize(initial_limit=40)
+
+    assert page_size.update(too_much_data_response(), latency=1) is True
+    assert page_size.get_limit() == 20
+    assert page_size.get_history()[-1]["success"] is False
+
+
+def test_limit_shrinks_on_slow_pages_and_grows_on_fast_ones():
+    page_size = AdaptivePageSize(initial_limit=40, max_limit=100)
+
+    assert page_size.update(response(), latency=AdaptivePageSize.TARGET_LATENCY + 1) is False
+    assert page_size.get_limit() == 30
+    page_size.update(response(), latency=0.1)
+    page_size.update(response(), latency=0.1)
+    assert page_size.get_limit() == 100
+
+
+def test_limit_grows_back_halfway_to_the_rejected_limit():
+    page_size = AdaptivePageSize(initial_limit=40)
+    page_size.update(too_much_data_response(), latency=1)
+
+    limits = []
+    for _ in range(4):
+        page_size.update(response(), latency=0.1)
+        limits.append(page_size.get_limit())
+
+    assert limits == [30, 35, 37, 38]
+
+
+def test_error_is_raised_once_the_minimum_limit_is_rejected():
+    page_size = AdaptivePageSize(initial_limit=4, min_limit=2)
+    assert page_size.update(too_much_data_response(), latency=1) is True
+
+    with pytest.raises(PlatformRequestError):
+        page_size.update(too_much_data_response(), latency=1)
+    assert page_size.get_limit() == 2
+
+
+def test_page_is_requested_again_with_lower_limits_until_the_minimum(graph_api, payload):
+    payload["limit"] = 4
+    graph_api.errors = [TOO_MUCH_DATA_ERROR] * 10
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, adaptive_page_size=True)
+
+    with pytest.raises(PlatformRequestError):
+        library.get_results()
+
+    assert [int(params.get("limit")) for params in graph_api.get_calls("search_terms")] == [4, 2, 1]
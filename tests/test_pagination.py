@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError
+from nanga_ad_library.utils import checkpoint
+
+"""
+Pagination of the results (cursors following the 'after' tokens) and checkpoint/resume of a crawl.
+"""
+
+ALL_IDS = [f"shoes-{k}" for k in range(12)]
+
+
+def test_records_are_paginated(graph_api, payload):
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload)
+
+    records = list(library.get_results().iter_records())
+
+    assert [record.get("id") for record in records] == ALL_IDS
+    assert [params.get("after") for params in graph_api.get_calls("search_terms")] == [None, "5", "10"]
+
+
+def test_pages_keep_the_api_order(graph_api, payload):
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload)
+
+    pages = list(library.get_results().iter_pages())
+
+    assert [[record.get("id") for record in page] for page in pages] == [ALL_IDS[:5], ALL_IDS[5:10], ALL_IDS[10:]]
+
+
+def test_closed_cursor_resumes_where_it_stopped(graph_api, payload, tmp_path):
+    path = str(tmp_path / "crawl.json")
+    cursor = NangaAdLibrary.init("meta", access_token="token", payload=payload, checkpoint_path=path).get_results()
+    first_ids = [next(cursor).get("id") for _ in range(7)]
+    cursor.close()
+
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, checkpoint_path=path)
+    next_ids = [record.get("id") for record in library.get_results()]
+
+    assert first_ids + next_ids == ALL_IDS
+    assert not os.path.exists(path)
+
+
+def test_failed_page_keeps_the_checkpoint(graph_api, payload, tmp_path):
+    path = str(tmp_path / "crawl.json")
+    cursor = NangaAdLibrary.init("meta", access_token="token", payload=payload, checkpoint_path=path).get_results()
+    graph_api.errors = [(400, graph_api.INVALID_TOKEN_ERROR)]
+    first_ids = []
+
+    with pytest.raises(PlatformRequestError):
+        for record in cursor:
+            first_ids.append(record.get("id"))
+
+    assert first_ids == ALL_IDS[:5]
+    assert os.path.exists(path)
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, checkpoint_path=path)
+    assert first_ids + [record.get("id") for record in library.get_results()] == ALL_IDS
+    assert not os.path.exists(path)
+
+def test_checkpoint_is_saved_at_page_boundaries(graph_api, payload, tmp_path, monkeypatch):
+    path = str(tmp_path / "crawl.json")
+    saves = []
+    replace = os.replace
+    monkeypatch.setattr(checkpoint.os, "replace", lambda source, target: saves.append(target) or replace(source, target))
+    monkeypatch.setattr(checkpoint.CursorCheckpoint, "SAVE_INTERVAL", 3600)
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, checkpoint_path=path)
+
+    records = list(library.get_results())
+
+    assert len(records) == 12
+    # One save when each page is read and one when each page is over (not one per record)
+    assert len(saves) <= 6
+
+
+def test_run_many_ignores_the_checkpoint_path(graph_api, payload, tmp_path):
+    path = str(tmp_path / "crawl.json")
+    payloads = [dict(payload, search_terms=f"brand{k}") for k in range(3)]
+
+    libraries = NangaAdLibrary.prepare_many("meta", payloads, access_token="token", checkpoint_path=path)
+    pages = list(NangaAdLibrary.run_many("meta", payloads, access_token="token", checkpoint_path=path))
+
+    assert [library.get_checkpoint() for library in libraries] == [None] * 3
+    assert sum(len(page) for _, page in pages) == 36
@@ -0,0 +1,72 @@
+import pytest
+
+from nanga_ad_library.ad_libraries.meta_ad_library import MetaParam, MetaField
+
+"""
+Validation of the payload params and fields (the error messages are the ones of the checks made param by param before
+  the schema was compiled, cf META_PARAM_SCHEMA).
+"""
+
+DOC_URL = "https://developers.facebook.com/docs/graph-api/reference/ads_archive/"
+COUNTRIES = "\n\t- ".join(member.value for member in MetaParam.AD_COUNTRY.value.get("class"))
+
+
+def validation_error(param_name, param_value, political=False):
+    with pytest.raises(ValueError) as error:
+        MetaParam.ensure_validity(param_name, param_value, political)
+
+    return str(error.value)
+
+
+def test_valid_values_are_returned():
+    assert MetaParam.ensure_validity("ad_reached_countries", ["FR", "US"], False) == ["FR", "US"]
+    assert MetaParam.ensure_validity("ad_delivery_date_min", "2025-05-06", False) == "2025-05-06"
+    assert MetaParam.ensure_validity("ad_delivery_date_min", "May 6, 2025", False) == "2025-05-06"
+
+
+def test_bad_country_errors():
+    assert validation_error("ad_reached_countries", ["FR", "XX"]) == (
+        f"""['FR', 'XX'] is not a valid value for parameter ad_reached_countries.\n"""
+        f"""It should be a list of elements from the following:\n\t- {COUNTRIES}"""
+    )
+    assert validation_error("ad_reached_countries", [["FR"]]).startswith("[['FR']] is not a valid value")
+    assert validation_error("ad_reached_countries", "FR") == (
+        """'FR' is not a valid value for parameter ad_reached_countries.\nIt should be a list."""
+    )
+
+
+def test_bad_date_error():
+    assert validation_error("ad_delivery_date_min", "not a date") == (
+        """'not a date' is not a valid value for parameter ad_delivery_date_min.\n"""
+        """It should be a date string using standard format."""
+    )
+    assert "ad_delivery_date_max" in validation_error("ad_delivery_date_max", "2025-13-01")
+
+
+def test_bad_type_and_size_errors():
+    assert validation_error("unmask_removed_content", "yes") == (
+        f"""'yes' is not a valid value for parameter unmask_removed_content.\n"""
+        f"""It's type should be one of the following: {(bool,)}."""
+    )
+    assert validation_error("search_terms", "x" * 101) == (
+        f"""{"x" * 101} is not a valid value for search_terms parameter.\nIt's size is capped to 100. (cf {DOC_URL})"""
+    )
+
+
+def test_political_params_are_not_available_for_other_ads():
+    available_params = [member.value.get("name") for member in MetaParam if not member.value.get("only_political")]
+
+    assert validation_error("ad_type", "ALL") == (
+        f"""'ad_type' is not a valid parameter for Meta Ad Library API.\n"""
+        f"""Available parameters are: (cf {DOC_URL})\n\t- """ + "\n\t- ".join(available_params)
+    )
+    assert MetaParam.ensure_validity("ad_type", "ALL", True) == "ALL"
+
+
+def test_bad_fields_are_removed_with_a_warning():
+    mandatory_fields = [member.value.get("name") for member in MetaField if member.value.get("mandatory")]
+
+    with pytest.warns(UserWarning, match="page_title is not an available field for Meta Ad Library API."):
+        fields = MetaField.review_fields(["ad_creative_link_bodies", "page_name", "page_title"], verbose=True)
+
+    assert fields == mandatory_fields + ["ad_creative_link_bodies"]
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.ad_downloaders import MetaAdDownloader, PlaywrightRuntime
+
+"""
+Playwright runtime shared by the downloaders of the process (a fake Playwright driver is used: no browser is launched).
+"""
+
+ADS = [{"id": "1", "ad_delivery_start_time": "2025-01-01"}]
+
+
+def new_downloader(**kwargs):
+    # Ads delivered before the download start date are not scraped (no page is opened)
+    return MetaAdDownloader(start_date="2099-01-01", **kwargs)
+
+
+def test_downloaders_share_the_browser(launches):
+    first, second = new_downloader(), new_downloader()
+
+    first.download_batch(list(ADS))
+    second.download_batch(list(ADS))
+
+    assert len(launches) == 1
+    first.close()
+    second.close()
+
+
+def test_closing_a_downloader_keeps_the_runtime_of_the_others(launches):
+    runtime = PlaywrightRuntime.get_shared()
+    first, second = new_downloader(), new_downloader()
+    first.download_batch(list(ADS))
+
+    first.close()
+    first.close()
+    assert runtime.is_running()
+    second.download_batch(list(ADS))
+    assert len(launches) == 1
+
+    second.close()
+    assert not runtime.is_running()
+
+
+def test_provided_runtime_is_left_open(launches):
+    runtime = PlaywrightRuntime()
+    with new_downloader(runtime=runtime) as downloader:
+        downloader.download_batch(list(ADS))
+    assert runtime.is_running()
+    runtime.close()
+    assert not runtime.is_running()
+
+
+def test_libraries_created_from_a_library_do_not_close_its_downloader(graph_api, payload, launches):
+    runtime = PlaywrightRuntime.get_shared()
+    library = NangaAdLibrary.init("meta", access_token="token", payload=payload, download_ads=True)
+    other_library = NangaAdLibrary.init("meta", access_token="token", payload=payload, download_ads=True)
+    list(library.get_results())
+    num_users = runtime.get_num_users()
+
+    library.new_library(payload).close()
+    assert runtime.get_num_users() == num_users
+    library.close()
+    assert runtime.get_num_users() == num_users - 1 and runtime.is_running()
+    other_library.close()
+    assert runtime.get_num_users() == num_users - 2
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from nanga_ad_library.exceptions import PlatformRateLimitError
+from nanga_ad_library.utils import rate_limiter
+from nanga_ad_library.utils.rate_limiter import UsageRateLimiter
+
+"""
+Usage headers parsing and token bucket of the rate limiter (with a fake clock).
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake_clock.monotonic)
+
+    return fake_clock
+
+
+def usage_headers(header, value):
+    return {header: json.dumps(value)}
+
+
+def test_app_usage_header():
+    usage, regain_access = UsageRateLimiter.parse_usage_headers(
+        usage_headers("x-app-usage", {"call_count": 80, "total_cputime": 12, "total_time": 30})
+    )
+
+    assert usage == {"x-app-usage.call_count": 80, "x-app-usage.total_cputime": 12, "x-app-usage.total_time": 30}
+    assert regain_access == 0
+
+
+def test_business_use_case_usage_header():
+    usage, regain_access = UsageRateLimiter.parse_usage_headers(usage_headers("x-business-use-case-usage", {
+        "123": [{"type": "ads_archive", "call_count": 40, "estimated_time_to_regain_access": 0}],
+        "456": [{"type": "ads_archive", "call_count": 95, "estimated_time_to_regain_access": 2}],
+    }))
+
+    assert usage == {"x-business-use-case-usage.call_count": 95}
+    assert regain_access == 120
+
+
+def test_invalid_usage_headers_are_ignored():
+    usage, regain_access = UsageRateLimiter.parse_usage_headers({"x-app-usage": "{not json", "x-ad-account-usage": "1"})
+
+    assert usage == {} and regain_access == 0
+
+
+def test_requests_are_not_delayed_below_the_threshold(clock):
+    limiter = UsageRateLimiter()
+    limiter.update(usage_headers("x-app-usage", {"call_count": 50}))
+
+    assert [limiter.reserve() for _ in range(5)] == [0] * 5
+    assert limiter.get_rate() is None and limiter.get_headroom() == 50
+
+
+def test_requests_are_spaced_out_above_the_threshold(clock):
+    limiter = UsageRateLimiter(slowdown_threshold=80, max_rate=2)
+    limiter.update(usage_headers("x-app-usage", {"call_count": 90}))
+
+    # Half of the margin is left: 1 request per second
+    assert limiter.get_rate() == 1
+    assert [limiter.reserve() for _ in range(3)] == [0, 1, 2]
+    clock.now += 10
+    assert limiter.reserve() == 0
+
+
+def test_requests_wait_for_the_time_to_regain_access(clock):
+    limiter = UsageRateLimiter()
+    limiter.update(usage_headers("x-app-usage", {"call_count": 10, "estimated_time_to_regain_access": 1}))
+
+    assert limiter.reserve() == 60
+    clock.now += 45
+    assert limiter.reserve() == 15
+
+
+def test_requests_waiting_longer_than_max_wait_raise(clock):
+    limiter = UsageRateLimiter(max_wait=30)
+    limiter.update(usage_headers("x-app-usage", {"call_count": 10, "estimated_time_to_regain_access": 1}))
+
+    with pytest.raises(PlatformRateLimitError) as error:
+        limiter.reserve()
+    assert error.value.get_wait_time() == 60
+
+    clock.now += 40
+    assert limiter.reserve() == 20
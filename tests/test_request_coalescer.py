@@ -0,0 +1,92 @@
+import threading
+
+from nanga_ad_library.sessions import MetaGraphAPISession
+from nanga_ad_library.utils import RequestCoalescer
+
+"""
+Single-flight request coalescing: identical requests of the same user share a successful call.
+"""
+
+URL = "https://graph.facebook.com/v22.0/ads_archive"
+
+# Maximum time (in seconds) a test waits for its threads
+TIMEOUT = 10
+
+
+def run_concurrently(functions):
+    """Runs the functions in threads started together and returns their results (in the same order)."""
+    results = [None] * len(functions)
+    barrier = threading.Barrier(len(functions), timeout=TIMEOUT)
+
+    def run(rank):
+        barrier.wait()
+        results[rank] = functions[rank]()
+
+    threads = [threading.Thread(target=run, args=(rank,)) for rank in range(len(functions))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=TIMEOUT)
+
+    return results
+
+
+def new_session(access_token):
+    session = MetaGraphAPISession.init(access_token=access_token, coalesce_requests=True, rate_limit=False)
+    session.update_params({"search_terms": "shoes"})
+
+    return session
+
+
+def test_coalescing_is_disabled_by_default():
+    session = MetaGraphAPISession.init(access_token="token")
+    assert session.get_request_coalescer() is None
+
+
+def test_identical_requests_of_the_same_token_share_the_call(graph_api):
+    graph_api.delay = 0.2
+    sessions = [new_session("token") for _ in range(3)]
+
+    responses = run_concurrently([lambda session=session: session.execute("GET", URL) for session in sessions])
+
+    assert len(graph_api.calls) == 1
+    assert all(response is responses[0] for response in responses)
+
+
+def test_requests_of_other_tokens_are_not_shared(graph_api):
+    graph_api.delay = 0.2
+    graph_api.invalid_tokens = {"invalid-token"}
+    sessions = [new_session("invalid-token"), new_session("valid-token")]
+
+    invalid_response, valid_response = run_concurrently(
+        [lambda session=session: session.execute("GET", URL) for session in sessions]
+    )
+
+    assert len(graph_api.calls) == 2
+    assert invalid_response.status_code == 400
+    assert valid_response.status_code == 200
+
+
+def test_waiting_callers_make_their_own_call_when_the_call_fails():
+    coalescer = RequestCoalescer()
+    started, calls = threading.Event(), []
+
+    def leader_call():
+        started.set()
+        threading.Event().wait(0.2)
+        calls.append("leader")
+        return 500
+
+    def waiter_call():
+        calls.append("waiter")
+        return 200
+
+    def waiter():
+        started.wait(TIMEOUT)
+        return coalescer.run("key", waiter_call, lambda status: status == 200)
+
+    results = run_concurrently([lambda: coalescer.run("key", leader_call, lambda status: status == 200), waiter])
+
+    assert results == [500, 200]
+    assert calls == ["leader", "waiter"]
+    assert coalescer.get_num_coalesced() == 0
@@ -0,0 +1,74 @@
+from urllib.parse import urlencode
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.utils import CompiledQuery, extract_after_token, json_encode_top_level_param
+
+"""
+Encoding of the query params (cf CompiledQuery) and extraction of the 'after' tokens.
+"""
+
+PARAMS = {
+    "search_terms": "chaussures & bottes = 100% cuir / été ☀?",
+    "ad_reached_countries": ["FR", "BE"],
+    "fields": ["id", "page_name"],
+    "estimated_audience_size_min": {"value": 1000, "label": "<1k>"},
+    "unmask_removed_content": True,
+    "limit": 25,
+}
+
+
+def test_query_string_is_the_urlencoded_params():
+    query = CompiledQuery(PARAMS)
+
+    assert query.get_query_string() == urlencode(json_encode_top_level_param(PARAMS))
+    assert query.get_params()["ad_reached_countries"] == '["FR","BE"]'
+    assert query.get_params()["estimated_audience_size_min"] == '{"label":"<1k>","value":1000}'
+    assert query.get_params()["unmask_removed_content"] == "true"
+
+
+def test_encoded_params_cannot_be_modified():
+    params = dict(PARAMS)
+    query = CompiledQuery(params)
+    params["search_terms"] = "other"
+
+    with pytest.raises(TypeError):
+        query.get_params()["search_terms"] = "other"
+    assert query.get_params()["search_terms"] == PARAMS["search_terms"]
+
+
+def test_after_token_is_substituted_in_the_query_string():
+    query = CompiledQuery(PARAMS)
+    after_token = "QVFIU+/=&x"
+
+    query_string = query.get_query_string({"after": after_token})
+
+    assert query_string == urlencode(json_encode_top_level_param(dict(PARAMS, after=after_token)))
+    assert query.get_query_string({"after": "other"}).endswith("&after=other")
+    assert "after" not in query.get_params()
+
+
+def test_unchanged_params_return_the_same_query():
+    query = CompiledQuery(PARAMS)
+
+    assert query.with_params({"ad_reached_countries": ["FR", "BE"], "limit": 25}) is query
+    assert query.with_params({"limit": 50}).get_params()["limit"] == 50
+
+
+def test_after_token_is_extracted_only_when_there_is_a_next_page():
+    assert extract_after_token({"paging": {"cursors": {"after": "abc"}, "next": "https://next"}}) == "abc"
+    assert extract_after_token({"paging": {"cursors": {"before": "xyz", "after": "abc"}}}) is None
+    assert extract_after_token({"paging": {"next": "https://next"}}) is None
+    assert extract_after_token({"data": []}) is None
+    assert extract_after_token("error page") is None
+
+
+def test_pages_only_change_the_after_token(graph_api, payload):
+    payload["search_terms"] = PARAMS["search_terms"]
+    list(NangaAdLibrary.init("meta", access_token="token", payload=payload).get_results())
+
+    first_page, *next_pages = graph_api.get_calls("search_terms")
+    assert first_page["search_terms"] == PARAMS["search_terms"] and first_page["ad_reached_countries"] == '["FR"]'
+    assert [page.pop("after") for page in next_pages] == ["5", "10"]
+    assert all(page == first_page for page in next_pages)
@@ -0,0 +1,92 @@
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError
+from nanga_ad_library.utils import response_cache
+from nanga_ad_library.utils.response_cache import ResponseCache
+
+"""
+Responses of the API stored on disk (cf ResponseCache).
+"""
+
+URL = "https://graph.facebook.com/v22.0/ads_archive"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(response_cache.time, "time", fake_clock.time)
+
+    return fake_clock
+
+
+def put_page(cache, after):
+    key = cache.key("GET", URL, {"after": after, "access_token": "token"})
+    cache.put(key, 200, {"Content-Length": "2", "x-app-usage": "{}"}, b"{}")
+
+    return key
+
+
+def test_entries_are_keyed_without_the_access_token(tmp_path):
+    cache = ResponseCache(str(tmp_path / "responses.db"))
+    put_page(cache, "5")
+
+    entry = cache.get(cache.key("GET", URL, {"after": "5", "access_token": "other-token"}))
+
+    assert entry == (200, {"x-app-usage": "{}"}, b"{}")
+    assert cache.get(cache.key("GET", URL, {"after": "10"})) is None
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "responses.db"), ttl=60)
+    old_key = put_page(cache, "5")
+    clock.now += 50
+    new_key = put_page(cache, "10")
+
+    clock.now += 20
+    assert cache.get(old_key) is None and cache.get(new_key) is not None
+    # Expired entries are dropped by the next put
+    put_page(cache, "15")
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "responses.db"), max_entries=2)
+    first_key = put_page(cache, "5")
+    clock.now += 1
+    second_key = put_page(cache, "10")
+    clock.now += 1
+    cache.get(first_key)
+
+    clock.now += 1
+    third_key = put_page(cache, "15")
+
+    assert cache.get(second_key) is None
+    assert cache.get(first_key) is not None and cache.get(third_key) is not None
+
+
+def test_error_responses_are_not_cached(graph_api, payload, tmp_path):
+    cache_path = str(tmp_path / "responses.db")
+    graph_api.errors = [(500, {"error": {"message": "Service unavailable", "code": 1}})]
+
+    with pytest.raises(PlatformRequestError):
+        NangaAdLibrary.init(
+            "meta", access_token="token", payload=payload, cache_path=cache_path, max_error_retries=0
+        ).get_results()
+    library = NangaAdLibrary.init("meta", access_token="other-token", payload=payload, cache_path=cache_path)
+    first_ids = [record.get("id") for record in library.get_results()]
+    cached_library = NangaAdLibrary.init("meta", access_token="token", payload=payload, cache_path=cache_path)
+    cached_ids = [record.get("id") for record in cached_library.get_results()]
+
+    assert first_ids == cached_ids == [f"shoes-{k}" for k in range(12)]
+    assert len(graph_api.get_calls("search_terms")) == 4
+    assert cached_library.get_cache_stats() == {"hits": 3, "misses": 0, "entries": 3}
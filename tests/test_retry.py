@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.exceptions import PlatformRequestError, PlatformRateLimitError
+
+"""
+Calls failing with transient or rate limiting errors (cf RetryPolicy).
+"""
+
+TRANSIENT_ERROR = (500, {"error": {"message": "Unknown error.", "code": 2, "is_transient": True}})
+RATE_LIMIT_ERROR = (400, {"error": {"message": "Application request limit reached", "code": 4}})
+
+
+def init_library(payload, **kwargs):
+    return NangaAdLibrary.init(
+        "meta", access_token="token", payload=payload, retry_base_delay=0.001, retry_max_delay=0.01, **kwargs
+    )
+
+
+def test_transient_errors_request_the_same_page_again(graph_api, payload):
+    graph_api.errors = [TRANSIENT_ERROR, RATE_LIMIT_ERROR]
+    library = init_library(payload)
+
+    records = list(library.get_results())
+
+    assert [record.get("id") for record in records] == [f"shoes-{k}" for k in range(12)]
+    assert [params.get("after") for params in graph_api.get_calls("search_terms")] == [None, None, None, "5", "10"]
+
+
+def test_error_is_raised_once_retries_are_exhausted(graph_api, payload):
+    graph_api.errors = [TRANSIENT_ERROR] * 3
+    library = init_library(payload, max_error_retries=2)
+
+    with pytest.raises(PlatformRequestError):
+        library.get_results()
+
+    assert len(graph_api.calls) == 3
+
+
+def test_long_rate_limits_are_not_waited_for(graph_api, payload):
+    usage = {"call_count": 100, "estimated_time_to_regain_access": 60}
+    graph_api.errors = [RATE_LIMIT_ERROR + ({"x-app-usage": json.dumps(usage)},)]
+    library = init_library(payload)
+
+    with pytest.raises(PlatformRequestError):
+        library.get_results()
+    # The next requests of the library are not blocked until Meta gives access back
+    with pytest.raises(PlatformRateLimitError):
+        library.get_results()
+
+    assert len(graph_api.calls) == 1
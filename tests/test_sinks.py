@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from nanga_ad_library import NangaAdLibrary
+from nanga_ad_library.utils import FileSink, NdjsonSink, ParquetSink
+
+"""
+Sinks the cursors stream their pages into.
+"""
+
+
+def test_sink_missing_a_file_method_cannot_be_created(tmp_path):
+    class PartialSink(FileSink):
+        def open_file(self, path):
+            pass
+
+        def write_records(self, records):
+            pass
+
+    with pytest.raises(TypeError):
+        PartialSink(str(tmp_path / "ads.txt"))
+
+
+def test_pages_are_written_in_rotated_files(graph_api, payload, tmp_path):
+    cursor = NangaAdLibrary.init("meta", access_token="token", payload=payload).get_results()
+
+    with NdjsonSink(str(tmp_path / "ads-{part}.ndjson"), compress=False, max_records=5) as sink:
+        num_records = cursor.write_to(sink)
+
+    lines = []
+    for path in sink.get_paths():
+        with open(path, encoding="utf-8") as file:
+            lines.extend(json.loads(line) for line in file)
+    assert num_records == 12 and len(sink.get_paths()) == 3
+    assert [line["id"] for line in lines] == [f"shoes-{k}" for k in range(12)]
+
+
+def test_parquet_schema_grows_with_the_fields_of_the_next_pages(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    pages = [
+        [{"id": "1", "spend": None}, {"id": "2", "spend": None}],
+        [{"id": "3", "spend": {"lower_bound": "0"}, "ad_delivery_stop_time": "2025-01-02"}, {"id": "4"}],
+    ]
+
+    with ParquetSink(str(tmp_path / "ads.parquet"), row_group_size=2) as sink:
+        for page in pages:
+            sink.write_page(page)
+
+    table = parquet.read_table(sink.get_paths()[0])
+    assert table.column("id").to_pylist() == ["1", "2", "3", "4"]
+    assert table.column("spend").to_pylist() == [None, None, {"lower_bound": "0"}, None]
+    assert table.column("ad_delivery_stop_time").null_count == 3
+
+
+def test_failed_sink_keeps_the_pages_already_written(tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    schema = pyarrow.schema([("id", pyarrow.string())])
+    sink = ParquetSink(str(tmp_path / "ads.parquet"), row_group_size=2, schema=schema)
+    sink.write_page([{"id": "1"}, {"id": "2"}])
+    sink.write_page([{"id": "3", "page_name": "nanga"}, {"id": "4"}])
+
+    with pytest.raises(ValueError):
+        sink.close()
+
+    assert sink.get_paths() == []
+    assert pyarrow.parquet.read_table(sink.get_failed_path()).column("id").to_pylist() == ["1", "2"]